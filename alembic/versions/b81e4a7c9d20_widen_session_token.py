@@ -0,0 +1,34 @@
+"""widen session token
+
+Revision ID: b81e4a7c9d20
+Revises: a3f9c2d41b7e
+Create Date: 2026-10-17 10:02:18.774310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81e4a7c9d20'
+down_revision: Union[str, None] = 'a3f9c2d41b7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('sessions', 'session_token',
+               existing_type=sa.String(length=255),
+               type_=sa.String(length=512),
+               existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('sessions', 'session_token',
+               existing_type=sa.String(length=512),
+               type_=sa.String(length=255),
+               existing_nullable=False)
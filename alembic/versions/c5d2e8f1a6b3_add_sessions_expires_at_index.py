@@ -0,0 +1,31 @@
+"""add sessions expires_at index
+
+Revision ID: c5d2e8f1a6b3
+Revises: b81e4a7c9d20
+Create Date: 2026-10-17 10:41:53.190287
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d2e8f1a6b3'
+down_revision: Union[str, None] = 'b81e4a7c9d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps logins writing to sessions while the index builds, but can't run
+    # inside a transaction. If a build fails it leaves an INVALID index: drop it and run again.
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_sessions_expires_at'), 'sessions', ['expires_at'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_sessions_expires_at'), table_name='sessions', postgresql_concurrently=True)
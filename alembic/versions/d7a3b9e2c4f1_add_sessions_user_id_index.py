@@ -0,0 +1,31 @@
+"""add sessions user_id index
+
+Revision ID: d7a3b9e2c4f1
+Revises: c5d2e8f1a6b3
+Create Date: 2026-10-17 14:12:37.518402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3b9e2c4f1'
+down_revision: Union[str, None] = 'c5d2e8f1a6b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps logins writing to sessions while the index builds, but can't run
+    # inside a transaction. If a build fails it leaves an INVALID index: drop it and run again.
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_sessions_user_id'), 'sessions', ['user_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_sessions_user_id'), table_name='sessions', postgresql_concurrently=True)
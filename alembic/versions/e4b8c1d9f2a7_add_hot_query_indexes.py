@@ -0,0 +1,49 @@
+"""add indexes for hot foreign-key and sort columns
+
+Revision ID: e4b8c1d9f2a7
+Revises: d7a3b9e2c4f1
+Create Date: 2026-10-18 09:20:41.803115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8c1d9f2a7'
+down_revision: Union[str, None] = 'd7a3b9e2c4f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_posts_created_at', 'posts', ['created_at']),
+    ('ix_posts_category_created_at', 'posts', ['category', 'created_at']),
+    ('ix_posts_author_id', 'posts', ['author_id']),
+    ('ix_comments_post_id', 'comments', ['post_id']),
+    ('ix_upvotes_post_id', 'upvotes', ['post_id']),
+    ('ix_upvotes_comment_id', 'upvotes', ['comment_id']),
+    ('ix_resumes_status_uploaded_at', 'resumes', ['status', 'uploaded_at']),
+    ('ix_resumes_user_id', 'resumes', ['user_id']),
+    ('ix_user_events_event_id', 'user_events', ['event_id']),
+    ('ix_users_mentor_id', 'users', ['mentor_id']),
+    ('ix_users_is_active', 'users', ['is_active']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY doesn't block writes while the index builds, but can't run inside a
+    # transaction. If a build fails it leaves an INVALID index: drop it and run again.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
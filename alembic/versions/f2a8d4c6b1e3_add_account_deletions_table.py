@@ -0,0 +1,48 @@
+"""add account deletions table
+
+Revision ID: f2a8d4c6b1e3
+Revises: e4b8c1d9f2a7
+Create Date: 2026-10-18 11:04:52.318270
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8d4c6b1e3'
+down_revision: Union[str, None] = 'e4b8c1d9f2a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('account_deletions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('pending', 'running', 'done', 'failed', name='accountdeletionstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('progress', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('s3_urls', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('requested_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_account_deletions_id'), 'account_deletions', ['id'], unique=False)
+    op.create_index(op.f('ix_account_deletions_status'), 'account_deletions', ['status'], unique=False)
+    op.create_index(op.f('ix_account_deletions_user_id'), 'account_deletions', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_account_deletions_user_id'), table_name='account_deletions')
+    op.drop_index(op.f('ix_account_deletions_status'), table_name='account_deletions')
+    op.drop_index(op.f('ix_account_deletions_id'), table_name='account_deletions')
+    op.drop_table('account_deletions')
+    sa.Enum(name='accountdeletionstatus').drop(op.get_bind(), checkfirst=True)
@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 import boto3
 from botocore.exceptions import ClientError
 from core.logging_config import LOGGER
@@ -36,5 +38,31 @@ class S3Client:
             LOGGER.error(f"Error deleting file from S3: {e}")
             raise ValueError("Error deleting file from S3 bucket")
 
+    def delete_files(self, object_keys: List[str]) -> None:
+        """Deletes the objects in requests of up to 1000 keys, S3's limit for one DeleteObjects call."""
+        failed = []
+        for start in range(0, len(object_keys), 1000):
+            chunk = object_keys[start:start + 1000]
+            try:
+                response = self.client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in chunk], "Quiet": True},
+                )
+            except ClientError as e:
+                LOGGER.error(f"Error deleting files from S3: {e}")
+                raise ValueError("Error deleting files from S3 bucket")
+            failed.extend(error["Key"] for error in response.get("Errors", []))
+        if failed:
+            LOGGER.error(f"S3 refused to delete {len(failed)} files, e.g. '{failed[0]}'.")
+            raise ValueError("Error deleting files from S3 bucket")
+        LOGGER.info(f"{len(object_keys)} files deleted from S3 bucket '{self.bucket_name}'.")
+
+    def key_for_url(self, url: str) -> Optional[str]:
+        """The object key of a URL built by generate_file_url, None for anything stored elsewhere."""
+        prefix = self.generate_file_url("")
+        if not url or not url.startswith(prefix):
+            return None
+        return url[len(prefix):] or None
+
     def generate_file_url(self, object_key: str) -> str:
         return f"https://{self.bucket_name}.s3.us-east-1.amazonaws.com/{object_key}"
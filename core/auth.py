@@ -1,12 +1,16 @@
 import secrets
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from fastapi import Depends, HTTPException, status, Request
-from typing import Annotated
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Annotated, Optional
 from core.settings import settings
-from core.database import get_db
+from core.database import session_scope
+from core.session_cache import session_cache
+from core.token_denylist import token_denylist
+from jobs.session_renewer import session_renewer
 from repository.session_repository import SessionRepository
 from repository.user_repository import UserRepository
+from utils.func_utils import decode_session_jwt
 from datetime import datetime, timezone
 from models.user import UserRole, User
 
@@ -34,23 +38,58 @@ def get_current_username(
         )
     return credentials.username
 
-def get_current_user(request: Request, db: Session = Depends(get_db)) -> User: 
+def resolve_session_user(session_token: str) -> Optional[User]:
+    """Returns a detached snapshot of the session's user, or None for an unknown or expired token."""
+    if settings.SESSION_VERIFICATION == "jwt":
+        claims = decode_session_jwt(session_token)
+        if claims is None:
+            return None
+        # Tokens issued before local verification carry no uid/jti and still go to the sessions table.
+        if "uid" in claims and "jti" in claims:
+            return _resolve_jwt_session_user(session_token, claims)
+
+    cached_user = session_cache.get(session_token)
+    if cached_user:
+        return cached_user
+
+    with session_scope() as db:
+        session = SessionRepository().get_with_user_by_token(db, session_token)
+        if not session:
+            return None
+        # Decided on cache misses only: the cache TTL is far shorter than the renewal interval.
+        session_renewer.touch(session_token, session.expires_at)
+        return session_cache.put(session_token, session.user, session.expires_at)
+
+
+def _resolve_jwt_session_user(session_token: str, claims: dict) -> Optional[User]:
+    if token_denylist.is_revoked(claims["jti"]):
+        session_cache.invalidate_token(session_token)
+        return None
+
+    cached_user = session_cache.get(session_token)
+    if cached_user:
+        return cached_user
+
+    with session_scope() as db:
+        user = UserRepository().get_user_by_id(db, claims["uid"])
+        if not user:
+            return None
+        expires_at = datetime.fromtimestamp(claims["exp"], tz=timezone.utc)
+        return session_cache.put(session_token, user, expires_at)
+
+
+async def get_current_user(request: Request) -> User:
     session_token = request.cookies.get("session_token")
     if not session_token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
-    session_repo = SessionRepository()
-    session = session_repo.get_by_token(db, session_token)
-    if not session:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid session")
-
-    if session.expires_at < datetime.now(timezone.utc):
-        session_repo.deactivate_session(db, session_token)
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Session expired")
-
-    user = UserRepository().get_user_by_id(db, session.user_id)
+    # SessionAuthMiddleware resolves the caller once per request; fall back when it did not run.
+    if hasattr(request.state, "user"):
+        user = request.state.user
+    else:
+        user = await run_in_threadpool(resolve_session_user, session_token)
     if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid session")
 
     return user
 
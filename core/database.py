@@ -1,35 +1,421 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from utils.retry import retry_on_db_error
+from contextlib import AsyncExitStack, contextmanager
+from typing import Any, AsyncGenerator, Callable, Iterator, List, Optional, TypeVar
+
+from fastapi import Request, Response, params
+from fastapi.routing import APIRoute
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from starlette.concurrency import run_in_threadpool
+from core.pool_metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool, pool_metrics
+from core.query_limits import apply_limits, limits_for, profile_for
+from core.replica_routing import ReplicaRouter, read_your_writes, wants_replica
+from core.settings import settings
+from utils.retry import Deadline, RetryPolicy, mark_not_retryable, retry_call, retry_call_async
+
+T = TypeVar("T")
 
 Base = declarative_base()
 engine = None
 SessionLocal = None
+replica_engines: List[Any] = []
+ReplicaSessionLocal = ReplicaRouter([])
+async_engine = None
+AsyncSessionLocal = None
+async_replica_engines: List[Any] = []
+AsyncReplicaSessionLocal = ReplicaRouter([])
+
+
+def _engine_options(poolclass) -> dict:
+    return {
+        "poolclass": poolclass,
+        "pool_pre_ping": True,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+
+
+def _instrument(engines: List[Any], prefix: str) -> None:
+    """Names the pools "<prefix>primary" and "<prefix>replica-<n>" in pool_metrics."""
+    for name in pool_metrics.names():
+        if name.startswith(f"{prefix}replica-"):
+            pool_metrics.remove(name)
+    for index, e in enumerate(engines):
+        pool_metrics.instrument(e, f"{prefix}primary" if index == 0 else f"{prefix}replica-{index - 1}")
+
+
+def init_db(
+    database_url: str,
+    replica_urls: Optional[List[str]] = None,
+    replica_policy: str = "round_robin",
+):
+    """
+    Builds the primary engine and, when replica_urls are given, one engine per read replica.
+    get_db hands out replica sessions for reads according to replica_policy. Pool sizing
+    comes from settings; every pool reports to pool_metrics.
+    """
+    global engine, SessionLocal, replica_engines, ReplicaSessionLocal
+    engine = create_engine(database_url, connect_args={}, **_engine_options(TimedQueuePool))
+    # Nothing reads an object after its request commits, so don't expire (and re-SELECT) it.
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+    replica_engines = [
+        create_engine(url, **_engine_options(TimedQueuePool)) for url in replica_urls or []
+    ]
+    ReplicaSessionLocal = ReplicaRouter(
+        [
+            sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=e)
+            for e in replica_engines
+        ],
+        replica_policy,
+    )
+    _instrument([engine, *replica_engines], "")
+
+
+def to_async_url(database_url: str) -> str:
+    """postgresql:// or postgresql+psycopg2:// URL -> the same database through asyncpg."""
+    return make_url(database_url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+def init_async_db(
+    database_url: str,
+    replica_urls: Optional[List[str]] = None,
+    replica_policy: str = "round_robin",
+) -> bool:
+    """
+    Builds the asyncpg engines used by async routes. Returns False, leaving async routes on
+    the thread-pool fallback, when asyncpg is not installed.
+    """
+    global async_engine, AsyncSessionLocal, async_replica_engines, AsyncReplicaSessionLocal
+    try:
+        import asyncpg  # noqa: F401
+    except ImportError:
+        async_engine = None
+        AsyncSessionLocal = None
+        async_replica_engines = []
+        AsyncReplicaSessionLocal = ReplicaRouter([])
+        return False
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(database_url, **_engine_options(TimedAsyncAdaptedQueuePool))
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    async_replica_engines = [
+        create_async_engine(url, **_engine_options(TimedAsyncAdaptedQueuePool))
+        for url in replica_urls or []
+    ]
+    AsyncReplicaSessionLocal = ReplicaRouter(
+        [async_sessionmaker(e, autoflush=False, expire_on_commit=False) for e in async_replica_engines],
+        replica_policy,
+    )
+    _instrument([async_engine, *async_replica_engines], "async-")
+    return True
+
+
+async def close_async_db() -> None:
+    global async_engine, AsyncSessionLocal, async_replica_engines, AsyncReplicaSessionLocal
+    for e in [async_engine, *async_replica_engines]:
+        if e is not None:
+            await e.dispose()
+    async_engine = None
+    AsyncSessionLocal = None
+    async_replica_engines = []
+    AsyncReplicaSessionLocal = ReplicaRouter([])
+    for name in pool_metrics.names():
+        if name.startswith("async-"):
+            pool_metrics.remove(name)
+
+
+def after_commit(db: Session, callback: Callable[[], None]) -> None:
+    """
+    Runs callback once db's transaction commits, e.g. to drop a cache entry for a row the
+    transaction changed. Dropped if the transaction rolls back instead.
+    """
+    db.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_flush")
+def _on_flush(session: Session, flush_context: Any) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_execute(orm_execute_state: Any) -> None:
+    # Bulk INSERT/UPDATE/DELETE statements write without a flush.
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
 
 
-@retry_on_db_error()
-def init_db(database_url: str):
-    global engine, SessionLocal
-    engine = create_engine(
-        database_url,
-        pool_pre_ping=True,
-        pool_recycle=900,  # 15 minutes
-        pool_timeout=30,
-        pool_size=10,
-        max_overflow=20,
-        connect_args={},
+@event.listens_for(Session, "after_commit")
+def _on_commit(session: Session) -> None:
+    # Only primary sessions handed to a request carry the caller; see get_db. get_db commits
+    # read-only requests too, and those must not extend the caller's pin to the primary.
+    if session.info.pop("wrote", False) and "user_id" in session.info:
+        read_your_writes.record_write(session.info["user_id"])
+    for callback in session.info.pop("after_commit", ()):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _on_rollback(session: Session) -> None:
+    session.info.pop("wrote", None)
+    session.info.pop("after_commit", None)
+
+
+def _commit(db: Session) -> None:
+    try:
+        db.commit()
+    except Exception as exc:
+        mark_not_retryable(exc)
+        raise
+
+
+def retry_policy() -> RetryPolicy:
+    return RetryPolicy(
+        attempts=settings.DB_RETRY_ATTEMPTS,
+        base_delay=settings.DB_RETRY_BACKOFF_SECONDS,
+        max_delay=settings.DB_RETRY_MAX_BACKOFF_SECONDS,
+        deadline_seconds=settings.DB_RETRY_DEADLINE_SECONDS,
     )
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-def get_db():
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    One unit of work outside a request (jobs, middleware): commits when the block exits
+    cleanly, rolls back if it raises. Repositories only flush.
+    """
+    from core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        yield db
+        _commit(db)
+    except:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def run_in_transaction(work: Callable[[Session], T], deadline: Optional[Deadline] = None) -> T:
+    """
+    Runs work(db) in its own session_scope, starting over in a fresh session if the
+    connection is lost before the commit, within retry_policy()'s attempts and deadline.
+    """
+
+    def attempt() -> T:
+        with session_scope() as db:
+            return work(db)
+
+    return retry_call(attempt, retry_policy(), deadline)
+
+
+class ThreadedSession:
+    """
+    Stand-in for AsyncSession over a sync Session when asyncpg is unavailable. Each
+    statement runs on the thread pool and comes back fully buffered.
+    """
+
+    def __init__(self, session: Session):
+        self._session = session
+
+    async def execute(self, statement: Any, params: Optional[dict] = None):
+        frozen = await run_in_threadpool(lambda: self._session.execute(statement, params).freeze())
+        return frozen()
+
+    async def close(self) -> None:
+        await run_in_threadpool(self._session.close)
+
+
+def _primary_session(request: Optional[Request]) -> Session:
     from core.database import SessionLocal  # ensure it's set
 
     db = SessionLocal()
+    if request is not None:
+        # Commits on this session pin the caller's reads to the primary for a while.
+        db.info["user_id"] = getattr(request.state, "user_id", None)
+    return db
+
+
+def _session_for(request: Optional[Request], read_only: bool) -> Session:
+    from core.database import ReplicaSessionLocal
+
+    if ReplicaSessionLocal and read_only:
+        db = ReplicaSessionLocal.choose()()
+    else:
+        db = _primary_session(request)
+    _limit(db, request)
+    return db
+
+
+def _limit(db: Session, request: Optional[Request]) -> None:
+    # The route's query profile is read when the session is built, after every dependency
+    # (including query_profile) has run.
+    if request is not None:
+        apply_limits(db, limits_for(profile_for(request)))
+
+
+class LazySession:
+    """
+    Stands in for a Session that is only built, and only takes a connection from the pool,
+    when the route first uses it. Requests rejected by validation or auth, or answered from
+    a cache, never touch the pool.
+    """
+
+    def __init__(self, factory: Callable[[], Session]):
+        self._factory = factory
+        self._session: Optional[Session] = None
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes LazySession does not define itself.
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+
+    def commit(self) -> None:
+        if self._session is not None:
+            self._session.commit()
+
+    def rollback(self) -> None:
+        if self._session is not None:
+            self._session.rollback()
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+
+def get_db(request: Request = None):
+    """
+    Yields a session for the request. Reads (GET, HEAD, OPTIONS) go to a replica when
+    replicas are configured and the caller has not written recently; everything else,
+    and callers without a request, get the primary. The route's query profile (see
+    core.query_limits) sets the session's statement_timeout and query budget.
+
+    The request is the unit of work: repositories only flush, and everything the route
+    wrote commits here in one transaction, or rolls back if the route raises. Routes declare
+    it with scope="function" so the commit, and returning the connection to the pool, happen
+    once the response is built rather than after it is sent.
+    """
+    read_only = wants_replica(request)
+    db = LazySession(lambda: _session_for(request, read_only))
+    try:
+        yield db
+        _commit(db)
+    except:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request = None):
+    """
+    Like get_db, but for explicitly read-only work: a replica whatever the HTTP method,
+    unless the caller wrote recently.
+    """
+    user_id = getattr(request.state, "user_id", None) if request is not None else None
+    read_only = not read_your_writes.is_pinned(user_id)
+    db = LazySession(lambda: _session_for(request, read_only))
     try:
         yield db
+        _commit(db)
     except:
         db.rollback()
         raise
     finally:
         db.close()
+
+
+async def get_async_db(request: Request = None) -> AsyncGenerator[Any, None]:
+    """
+    Yields an AsyncSession, or a ThreadedSession when no async engine was initialized.
+    Reads follow the same replica routing as get_db.
+    """
+    from core.database import AsyncReplicaSessionLocal, AsyncSessionLocal
+
+    read_only = wants_replica(request)
+    if AsyncSessionLocal is not None:
+        factory = AsyncReplicaSessionLocal.choose() if AsyncReplicaSessionLocal and read_only else None
+        async with (factory or AsyncSessionLocal)() as db:
+            _limit(db.sync_session, request)
+            yield db
+        return
+
+    db = ThreadedSession(LazySession(lambda: _session_for(request, read_only)))
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+# Where FastAPI keeps request- and function-scoped dependency teardown; see RetryingRoute.
+_EXIT_STACK_KEYS = {"fastapi_inner_astack", "fastapi_function_astack"}
+
+
+def not_retried(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Keeps RetryingRoute from replaying an endpoint with side effects outside the database,
+    such as uploading an attachment to S3. Goes below the route decorator.
+    """
+    endpoint.retry_safe = False
+    return endpoint
+
+
+class RetryingRoute(APIRoute):
+    """
+    Replays the whole route, and with it the request's unit of work, when the database
+    connection is lost before get_db commits. Each attempt resolves its dependencies again
+    so it gets a fresh session; a failed attempt's get_db has already rolled back. Retries
+    stop at retry_policy()'s attempts or the request's deadline, whichever comes first.
+
+    Routes taking form data or files are not replayed: their uploads are closed once the
+    first attempt ends. Neither are endpoints marked with not_retried, whose side effects
+    outside the database would happen again.
+
+    Attempts swap FastAPI's dependency exit stacks on the scope, which are not public API;
+    requirements.txt pins FastAPI to the versions this was tested with, and a request whose
+    scope lacks them runs once, unretried.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+        if self.body_field is not None and isinstance(self.body_field.field_info, params.Form):
+            return handler
+        if not getattr(self.endpoint, "retry_safe", True):
+            return handler
+
+        async def attempt(request: Request) -> Response:
+            # FastAPI keeps dependency teardown in two exit stacks on the scope: function-scoped
+            # ones (get_db) close when the handler returns, request-scoped ones after the
+            # response is sent. Give each attempt its own so a failed attempt's dependencies are
+            # torn down with its exception and a successful one's still close at those points.
+            scope = request.scope
+            request_stack, function_stack = scope["fastapi_inner_astack"], scope["fastapi_function_astack"]
+            attempt_stack = AsyncExitStack()
+            scope["fastapi_inner_astack"] = attempt_stack
+            try:
+                async with AsyncExitStack() as attempt_function_stack:
+                    scope["fastapi_function_astack"] = attempt_function_stack
+                    response = await handler(request)
+            except BaseException as exc:
+                await attempt_stack.__aexit__(type(exc), exc, exc.__traceback__)
+                raise
+            finally:
+                scope["fastapi_inner_astack"], scope["fastapi_function_astack"] = request_stack, function_stack
+            request_stack.push_async_exit(attempt_stack)
+            return response
+
+        async def retrying_handler(request: Request) -> Response:
+            if not _EXIT_STACK_KEYS.issubset(request.scope):
+                return await handler(request)
+            policy = retry_policy()
+            request.state.deadline = Deadline(policy.deadline_seconds)
+            return await retry_call_async(lambda: attempt(request), policy, request.state.deadline)
+
+        return retrying_handler
@@ -0,0 +1,167 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from core.settings import settings
+
+
+class LoginThrottledError(Exception):
+    """Raised when a login attempt exceeds the per-email or per-IP rate."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by an arbitrary string. Each bucket is a (tokens, last_seen) tuple;
+    a bucket idle long enough to have refilled is indistinguishable from a missing one,
+    so sweep() drops it. A rate of zero disables the limiter.
+
+    Buckets are kept in last-seen order and capped at max_keys: past that, consume() evicts
+    the least recently seen one, in O(1). A flood of new keys can therefore reset an idle
+    key's bucket early, but never makes a lookup slower.
+    """
+
+    def __init__(self, capacity: int, refill_per_minute: float, max_keys: int = 100_000):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_minute / 60
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self.rejected = 0
+        self.evicted = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0 and self.refill_per_second > 0
+
+    def peek(self, key: str, now: float) -> float:
+        """Tokens currently available for key, without consuming any."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return float(self.capacity)
+        tokens, last_seen = bucket
+        return min(self.capacity, tokens + (now - last_seen) * self.refill_per_second)
+
+    def consume(self, key: str, now: float) -> None:
+        self._buckets[key] = (self.peek(key, now) - 1, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+            self.evicted += 1
+
+    def retry_after(self, key: str, now: float) -> float:
+        return (1 - self.peek(key, now)) / self.refill_per_second
+
+    def sweep(self, now: float) -> int:
+        """Drops refilled buckets; oldest first, so it stops at the first one still in use."""
+        full_after = self.capacity / self.refill_per_second
+        removed = 0
+        while self._buckets:
+            key, (_, last_seen) = next(iter(self._buckets.items()))
+            if now - last_seen < full_after:
+                break
+            del self._buckets[key]
+            removed += 1
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class LoginThrottle:
+    """
+    Rejects login attempts before any user lookup or bcrypt work once either the
+    normalized email or the client IP has run out of attempts. An attempt only
+    consumes from both buckets when both have a token left.
+    """
+
+    def __init__(
+        self,
+        email_burst: int,
+        email_per_minute: float,
+        ip_burst: int,
+        ip_per_minute: float,
+    ):
+        self.by_email = TokenBucketLimiter(email_burst, email_per_minute)
+        self.by_ip = TokenBucketLimiter(ip_burst, ip_per_minute)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        return email.strip().lower()
+
+    def check(self, email: str, client_ip: Optional[str]) -> None:
+        now = time.monotonic()
+        email_key = self.normalize_email(email)
+        with self._lock:
+            limiters = [(self.by_email, email_key, "email")]
+            if client_ip:
+                limiters.append((self.by_ip, client_ip, "address"))
+            for limiter, key, label in limiters:
+                if limiter.enabled and limiter.peek(key, now) < 1:
+                    limiter.rejected += 1
+                    raise LoginThrottledError(
+                        f"Too many login attempts for this {label}, retry later.",
+                        retry_after=limiter.retry_after(key, now),
+                    )
+            for limiter, key, _ in limiters:
+                if limiter.enabled:
+                    limiter.consume(key, now)
+
+    def sweep(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            removed = 0
+            for limiter in (self.by_email, self.by_ip):
+                if limiter.enabled:
+                    removed += limiter.sweep(now)
+            return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            for limiter in (self.by_email, self.by_ip):
+                limiter._buckets.clear()
+                limiter.rejected = 0
+                limiter.evicted = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rejected_by_email": self.by_email.rejected,
+                "rejected_by_ip": self.by_ip.rejected,
+                "tracked_emails": len(self.by_email),
+                "tracked_ips": len(self.by_ip),
+                "evicted_emails": self.by_email.evicted,
+                "evicted_ips": self.by_ip.evicted,
+            }
+
+
+def client_address(forwarded_for: Optional[str], peer: Optional[str], trusted_hops: int) -> Optional[str]:
+    """
+    The address the per-IP limit is keyed on. uvicorn runs with --forwarded-allow-ips "*",
+    so peer (request.client.host) is the left-most X-Forwarded-For entry, which any client can
+    set. Each of the trusted_hops proxies in front of the app appends the address it received
+    the request from, so the entry trusted_hops from the right is the one the outermost of
+    them saw. Without that many entries, or with trusted_hops 0, peer is used.
+    """
+    if trusted_hops > 0 and forwarded_for:
+        hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+        if len(hops) >= trusted_hops:
+            return hops[-trusted_hops]
+    return peer
+
+
+def retry_after_header(retry_after: float) -> str:
+    return str(max(1, math.ceil(retry_after)))
+
+
+login_throttle = LoginThrottle(
+    email_burst=settings.LOGIN_EMAIL_BURST,
+    email_per_minute=settings.LOGIN_EMAIL_PER_MINUTE,
+    ip_burst=settings.LOGIN_IP_BURST,
+    ip_per_minute=settings.LOGIN_IP_PER_MINUTE,
+)
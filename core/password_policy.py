@@ -0,0 +1,73 @@
+import threading
+import time
+from typing import Optional
+
+from core.logging_config import LOGGER
+from core.settings import settings
+from utils.password_hashing import HASHERS, PasswordHasher
+
+
+class PasswordPolicy:
+    """
+    Decides which hasher and cost new password hashes use. With no pinned cost the
+    policy calibrates once at startup, picking the highest cost whose hash time stays
+    under the target on this hardware. Hashes made under any other scheme or cost still
+    verify, and are reported by needs_rehash so login can upgrade them.
+    """
+
+    def __init__(self, scheme: str, cost: int, target_ms: float):
+        if scheme not in HASHERS:
+            raise ValueError(f"Unknown password hasher {scheme!r}, expected one of {sorted(HASHERS)}")
+        hasher_cls = HASHERS[scheme]
+        self.target_ms = target_ms
+        self.pinned = cost > 0
+        self.current: PasswordHasher = hasher_cls(cost if self.pinned else hasher_cls.default_cost)
+        self._calibrated = self.pinned
+        self._lock = threading.Lock()
+
+    def calibrate(self) -> PasswordHasher:
+        with self._lock:
+            if self._calibrated:
+                return self.current
+            hasher = self.current.with_cost(self.current.min_cost)
+            elapsed_ms = self._time_hash(hasher)
+            while hasher.cost < hasher.max_cost:
+                candidate = hasher.with_cost(hasher.cost + 1)
+                candidate_ms = self._time_hash(candidate)
+                if candidate_ms > self.target_ms:
+                    break
+                hasher, elapsed_ms = candidate, candidate_ms
+            self.current = hasher
+            self._calibrated = True
+        LOGGER.info(
+            f"Password hashing calibrated to {hasher.name} cost {hasher.cost} "
+            f"({elapsed_ms:.0f}ms, target {self.target_ms:.0f}ms)"
+        )
+        return hasher
+
+    def hasher_for(self, hashed: str) -> PasswordHasher:
+        if self.current.identifies(hashed):
+            return self.current
+        for hasher_cls in HASHERS.values():
+            hasher = hasher_cls(hasher_cls.default_cost)
+            if hasher.identifies(hashed):
+                return hasher
+        return self.current
+
+    def needs_rehash(self, hashed: Optional[str]) -> bool:
+        if not hashed or not self.current.identifies(hashed):
+            return True
+        return self.current.needs_rehash(hashed)
+
+    @staticmethod
+    def _time_hash(hasher: PasswordHasher) -> float:
+        started = time.perf_counter()
+        hasher.hash("calibration-password")
+        return (time.perf_counter() - started) * 1000
+
+
+password_policy = PasswordPolicy(
+    scheme=settings.PASSWORD_HASHER,
+    cost=settings.PASSWORD_HASH_COST,
+    target_ms=settings.PASSWORD_HASH_TARGET_MS,
+)
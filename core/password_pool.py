@@ -0,0 +1,58 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from core.settings import settings
+
+
+class PasswordPoolSaturatedError(Exception):
+    """Raised when every password hashing worker is busy and the wait queue is full."""
+
+
+class PasswordHashPool:
+    """
+    Runs bcrypt in a dedicated, size-limited process pool so a burst of logins cannot
+    starve the thread pool shared by every other route. At most max_workers + max_queue
+    calls are admitted at once; anything beyond that fails fast.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self.rejected = 0
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.max_workers <= 0:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise PasswordPoolSaturatedError("Password hashing capacity exhausted, retry shortly.")
+        try:
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn, not fork: the API process is multi-threaded by the time the pool starts.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+
+password_pool = PasswordHashPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
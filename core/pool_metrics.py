@@ -0,0 +1,175 @@
+import bisect
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds, in milliseconds, of the checkout wait histogram buckets; the last is open-ended.
+CHECKOUT_WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class PoolMetrics:
+    """Counters and a checkout wait histogram for one connection pool."""
+
+    def __init__(self, name: str, buckets_ms=CHECKOUT_WAIT_BUCKETS_MS):
+        self.name = name
+        self.buckets_ms = tuple(buckets_ms)
+        self.pool = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.connects = 0
+            self.disconnects = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.wait_counts = [0] * (len(self.buckets_ms) + 1)
+            self.wait_sum_ms = 0.0
+            self.wait_max_ms = 0.0
+
+    def record_wait(self, wait_ms: float) -> None:
+        with self._lock:
+            self.wait_counts[bisect.bisect_left(self.buckets_ms, wait_ms)] += 1
+            self.wait_sum_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def attach(self, pool) -> None:
+        """Listens to pool's events; the pool keeps them across dispose()."""
+        self.pool = pool
+        pool.metrics = self
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "close", self._on_close)
+        event.listen(pool, "invalidate", self._on_invalidate)
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        with self._lock:
+            waits = sum(self.wait_counts)
+            histogram = {
+                **{f"le_{bound}": count for bound, count in zip(self.buckets_ms, self.wait_counts)},
+                "le_inf": self.wait_counts[-1],
+            }
+            return {
+                "pool_size": pool.size() if pool else 0,
+                "checked_out": pool.checkedout() if pool else 0,
+                "idle": pool.checkedin() if pool else 0,
+                # QueuePool counts overflow from -pool_size; only connections beyond the pool matter.
+                "overflow": max(0, pool.overflow()) if pool else 0,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "disconnects": self.disconnects,
+                "invalidations": self.invalidations,
+                "checkout_timeouts": self.timeouts,
+                "checkout_wait_ms": {
+                    "count": waits,
+                    "sum": round(self.wait_sum_ms, 3),
+                    "max": round(self.wait_max_ms, 3),
+                    "histogram": histogram,
+                },
+            }
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_close(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.disconnects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+
+class _TimedCheckout:
+    """
+    Times Pool.connect(), which covers waiting for a free connection. SQLAlchemy has no
+    event for the start of a checkout, so the wait and timeouts are measured here.
+    """
+
+    metrics: Optional[PoolMetrics] = None
+
+    def connect(self):
+        metrics = self.metrics
+        if metrics is None:
+            return super().connect()
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            metrics.record_timeout()
+            raise
+        metrics.record_wait((time.perf_counter() - started) * 1000)
+        return connection
+
+    def recreate(self):
+        # dispose() swaps in a fresh pool; it keeps the event listeners but not attributes.
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+class PoolMetricsRegistry:
+    """Metrics for every pool the app creates, keyed by a name such as "primary"."""
+
+    def __init__(self):
+        self._metrics: Dict[str, PoolMetrics] = {}
+        self._lock = threading.Lock()
+
+    def instrument(self, engine, name: str) -> PoolMetrics:
+        """Starts collecting for engine's pool, replacing an earlier pool of the same name."""
+        pool = getattr(engine, "sync_engine", engine).pool
+        metrics = PoolMetrics(name)
+        metrics.attach(pool)
+        with self._lock:
+            self._metrics[name] = metrics
+        return metrics
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._metrics)
+
+    def get(self, name: str) -> Optional[PoolMetrics]:
+        return self._metrics.get(name)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {m.name: m.snapshot() for m in metrics}
+
+
+pool_metrics = PoolMetricsRegistry()
@@ -0,0 +1,115 @@
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import Pool
+
+from core.logging_config import LOGGER
+from core.replica_routing import READ_METHODS
+from core.settings import settings
+
+# "read" and "write" are picked from the HTTP method; "export" is opted into per route.
+QUERY_PROFILES = ("read", "write", "export")
+QUERY_BUDGET_ACTIONS = ("log", "raise")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+class QueryLimits:
+    """
+    The statement_timeout and query budget for one request's session. A value of 0 disables
+    either. Past the budget, every further statement raises QueryBudgetExceeded with action
+    "raise"; with "log" the first one is logged and the request carries on.
+    """
+
+    def __init__(self, profile: str, statement_timeout_ms: int, query_budget: int, action: str = "log"):
+        if action not in QUERY_BUDGET_ACTIONS:
+            raise ValueError(f"Unknown query budget action {action!r}, expected log or raise")
+        self.profile = profile
+        self.statement_timeout_ms = statement_timeout_ms
+        self.query_budget = query_budget
+        self.action = action
+        self.queries = 0
+        self.reported = False
+
+    def count(self, statement: str) -> None:
+        self.queries += 1
+        if not self.query_budget or self.queries <= self.query_budget:
+            return
+        message = (
+            f"{self.profile} request ran {self.queries} queries, over its budget of "
+            f"{self.query_budget}: {statement[:200]}"
+        )
+        if self.action == "raise":
+            raise QueryBudgetExceeded(message)
+        if not self.reported:
+            self.reported = True
+            LOGGER.warning(message)
+
+
+def limits_for(profile: str) -> QueryLimits:
+    timeouts = {
+        "read": settings.DB_STATEMENT_TIMEOUT_READ_MS,
+        "write": settings.DB_STATEMENT_TIMEOUT_WRITE_MS,
+        "export": settings.DB_STATEMENT_TIMEOUT_EXPORT_MS,
+    }
+    budgets = {
+        "read": settings.DB_QUERY_BUDGET_READ,
+        "write": settings.DB_QUERY_BUDGET_WRITE,
+        "export": settings.DB_QUERY_BUDGET_EXPORT,
+    }
+    return QueryLimits(profile, timeouts[profile], budgets[profile], settings.DB_QUERY_BUDGET_ACTION)
+
+
+def query_profile(profile: str):
+    """
+    Route dependency that overrides the profile picked from the HTTP method, e.g.
+    dependencies=[Depends(query_profile("export"))] for a route that reads whole tables.
+    """
+    if profile not in QUERY_PROFILES:
+        raise ValueError(f"Unknown query profile {profile!r}, expected one of {', '.join(QUERY_PROFILES)}")
+
+    def set_query_profile(request: Request) -> None:
+        request.state.query_profile = profile
+
+    return set_query_profile
+
+
+def profile_for(request: Request) -> str:
+    profile = getattr(request.state, "query_profile", None)
+    if profile:
+        return profile
+    return "read" if request.method in READ_METHODS else "write"
+
+
+def apply_limits(session: Session, limits: Optional[QueryLimits]) -> None:
+    """Applies limits to every transaction session begins from now on."""
+    session.info["query_limits"] = limits
+
+
+@event.listens_for(Session, "after_begin")
+def _on_begin(session: Session, transaction, connection) -> None:
+    limits = session.info.get("query_limits")
+    if limits is None:
+        return
+    if limits.statement_timeout_ms:
+        # SET LOCAL ends with the transaction, so the connection goes back to the pool unchanged.
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(limits.statement_timeout_ms)}")
+    connection.info["query_limits"] = limits
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    limits = conn.info.get("query_limits")
+    if limits is not None:
+        limits.count(statement)
+
+
+@event.listens_for(Pool, "checkin")
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    # connection.info lives as long as the pooled connection; the next checkout is another request.
+    connection_record.info.pop("query_limits", None)
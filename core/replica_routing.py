@@ -0,0 +1,95 @@
+import itertools
+import random
+import threading
+import time
+from typing import Callable, Dict, Generic, List, Optional, TypeVar
+
+READ_YOUR_WRITES_SECONDS = 5
+READ_YOUR_WRITES_MAX_ENTRIES = 100_000
+REPLICA_POLICIES = ("round_robin", "random")
+# Requests with these methods may be served by a replica; everything else stays on the primary.
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+T = TypeVar("T")
+
+
+class ReplicaRouter(Generic[T]):
+    """Picks one of the replica session factories for each read session."""
+
+    def __init__(self, replicas: List[T], policy: str = "round_robin"):
+        if policy not in REPLICA_POLICIES:
+            raise ValueError(f"Unknown replica policy {policy!r}, expected round_robin or random")
+        self.replicas = list(replicas)
+        self.policy = policy
+        self._cycle = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Optional[T]:
+        if not self.replicas:
+            return None
+        if self.policy == "random":
+            return random.choice(self.replicas)
+        with self._lock:
+            return self.replicas[next(self._cycle)]
+
+
+class ReadYourWrites:
+    """
+    Remembers which users committed a write recently. Their reads stay on the primary for
+    window_seconds so they never see a replica that has not caught up with their own write.
+    Process-local: a user whose next request lands on another worker may still read stale data.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = READ_YOUR_WRITES_SECONDS,
+        max_entries: int = READ_YOUR_WRITES_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._pinned_until: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def record_write(self, user_id: Optional[int]) -> None:
+        if user_id is None or self.window_seconds <= 0:
+            return
+        now = self._clock()
+        with self._lock:
+            self._pinned_until[user_id] = now + self.window_seconds
+            if len(self._pinned_until) > self.max_entries:
+                self._sweep(now)
+
+    def is_pinned(self, user_id: Optional[int]) -> bool:
+        if user_id is None:
+            return False
+        pinned_until = self._pinned_until.get(user_id)
+        return pinned_until is not None and pinned_until > self._clock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pinned_until.clear()
+
+    def _sweep(self, now: float) -> None:
+        expired = [user_id for user_id, until in self._pinned_until.items() if until <= now]
+        for user_id in expired:
+            del self._pinned_until[user_id]
+        # Still over the limit: drop the entries closest to expiring.
+        overflow = len(self._pinned_until) - self.max_entries
+        if overflow > 0:
+            for user_id in sorted(self._pinned_until, key=self._pinned_until.get)[:overflow]:
+                del self._pinned_until[user_id]
+
+
+read_your_writes = ReadYourWrites()
+
+
+def wants_replica(request) -> bool:
+    """True when request is a read whose caller has no recent write to see."""
+    if request is None or request.method not in READ_METHODS:
+        return False
+    return not read_your_writes.is_pinned(getattr(request.state, "user_id", None))
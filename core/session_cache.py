@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from core.settings import settings
+from models.user import User
+
+
+class SessionCache:
+    """
+    Bounded LRU + TTL cache mapping a session token to a detached user snapshot.
+    Entries never outlive the session they were resolved from.
+
+    The cache is per process. Logouts and revocations invalidate it in the worker that
+    handles them (after commit); other workers keep serving their copy for up to
+    ttl_seconds. With SESSION_VERIFICATION=jwt the revoked token's jti also reaches every
+    worker's denylist within REVOCATION_SYNC_SECONDS and is checked before the cache.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[User]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                self._remove(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return user
+
+    def put(self, token: str, user: User, session_expires_at: datetime) -> User:
+        snapshot = self._snapshot(user)
+        remaining = (session_expires_at - datetime.now(timezone.utc)).total_seconds()
+        ttl = min(self.ttl_seconds, remaining)
+        if ttl <= 0:
+            return snapshot
+        with self._lock:
+            self._remove(token)
+            self._entries[token] = (time.monotonic() + ttl, snapshot)
+            self._tokens_by_user.setdefault(snapshot.id, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                oldest_token = next(iter(self._entries))
+                self._remove(oldest_token)
+        return snapshot
+
+    def invalidate_token(self, token: str) -> None:
+        with self._lock:
+            self._remove(token)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(token)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+    def _remove(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        user_id = entry[1].id
+        tokens = self._tokens_by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user_id]
+
+    @staticmethod
+    def _snapshot(user: User) -> User:
+        """Copy the user's column values into a detached instance owned by no session."""
+        snapshot = User(
+            **{column.key: getattr(user, column.key) for column in User.__table__.columns}
+        )
+        make_transient_to_detached(snapshot)
+        return snapshot
+
+
+session_cache = SessionCache(
+    ttl_seconds=settings.SESSION_CACHE_TTL_SECONDS,
+    max_entries=settings.SESSION_CACHE_MAX_ENTRIES,
+)
@@ -34,6 +34,54 @@ class Settings:
             "DOCS_AUTH_USERNAME": os.getenv("DOCS_AUTH_USERNAME"),
             "DOCS_AUTH_PASSWORD": os.getenv("DOCS_AUTH_PASSWORD"),
             "DATABASE_URL": os.getenv("DATABASE_URL"),
+            "DB_POOL_SIZE": os.getenv("DB_POOL_SIZE", "10"),
+            "DB_MAX_OVERFLOW": os.getenv("DB_MAX_OVERFLOW", "20"),
+            "DB_POOL_TIMEOUT_SECONDS": os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"),
+            "DB_POOL_RECYCLE_SECONDS": os.getenv("DB_POOL_RECYCLE_SECONDS", "900"),
+            "DATABASE_REPLICA_URLS": os.getenv("DATABASE_REPLICA_URLS", ""),
+            "DATABASE_REPLICA_POLICY": os.getenv("DATABASE_REPLICA_POLICY", "round_robin"),
+            "READ_YOUR_WRITES_SECONDS": os.getenv("READ_YOUR_WRITES_SECONDS", "5"),
+            "DB_RETRY_ATTEMPTS": os.getenv("DB_RETRY_ATTEMPTS", "3"),
+            "DB_RETRY_BACKOFF_SECONDS": os.getenv("DB_RETRY_BACKOFF_SECONDS", "0.05"),
+            "DB_RETRY_MAX_BACKOFF_SECONDS": os.getenv("DB_RETRY_MAX_BACKOFF_SECONDS", "0.5"),
+            "DB_RETRY_DEADLINE_SECONDS": os.getenv("DB_RETRY_DEADLINE_SECONDS", "2"),
+            "DB_STATEMENT_TIMEOUT_READ_MS": os.getenv("DB_STATEMENT_TIMEOUT_READ_MS", "5000"),
+            "DB_STATEMENT_TIMEOUT_WRITE_MS": os.getenv("DB_STATEMENT_TIMEOUT_WRITE_MS", "10000"),
+            "DB_STATEMENT_TIMEOUT_EXPORT_MS": os.getenv("DB_STATEMENT_TIMEOUT_EXPORT_MS", "120000"),
+            "DB_QUERY_BUDGET_READ": os.getenv("DB_QUERY_BUDGET_READ", "100"),
+            "DB_QUERY_BUDGET_WRITE": os.getenv("DB_QUERY_BUDGET_WRITE", "50"),
+            "DB_QUERY_BUDGET_EXPORT": os.getenv("DB_QUERY_BUDGET_EXPORT", "0"),
+            "DB_QUERY_BUDGET_ACTION": os.getenv("DB_QUERY_BUDGET_ACTION", "log"),
+            "SESSION_CACHE_TTL_SECONDS": os.getenv("SESSION_CACHE_TTL_SECONDS", "60"),
+            "SESSION_CACHE_MAX_ENTRIES": os.getenv("SESSION_CACHE_MAX_ENTRIES", "10000"),
+            "SESSION_VERIFICATION": os.getenv("SESSION_VERIFICATION", "database"),
+            "REVOCATION_SYNC_SECONDS": os.getenv("REVOCATION_SYNC_SECONDS", "30"),
+            "SESSION_REAPER_INTERVAL_SECONDS": os.getenv("SESSION_REAPER_INTERVAL_SECONDS", "3600"),
+            "SESSION_REAPER_BATCH_SIZE": os.getenv("SESSION_REAPER_BATCH_SIZE", "1000"),
+            "JOURNEY_FLUSH_SECONDS": os.getenv("JOURNEY_FLUSH_SECONDS", "5"),
+            "JOURNEY_BATCH_SIZE": os.getenv("JOURNEY_BATCH_SIZE", "500"),
+            "JOURNEY_MAX_PENDING": os.getenv("JOURNEY_MAX_PENDING", "10000"),
+            "ACCOUNT_DELETION_INTERVAL_SECONDS": os.getenv("ACCOUNT_DELETION_INTERVAL_SECONDS", "60"),
+            "ACCOUNT_DELETION_BATCH_SIZE": os.getenv("ACCOUNT_DELETION_BATCH_SIZE", "500"),
+            "ACCOUNT_DELETION_STALE_SECONDS": os.getenv("ACCOUNT_DELETION_STALE_SECONDS", "600"),
+            "ACCOUNT_DELETION_MAX_ATTEMPTS": os.getenv("ACCOUNT_DELETION_MAX_ATTEMPTS", "5"),
+            "ASYNC_DATABASE_ENABLED": os.getenv("ASYNC_DATABASE_ENABLED", "true"),
+            "ASYNC_DATABASE_URL": os.getenv("ASYNC_DATABASE_URL"),
+            "SESSION_STORE": os.getenv("SESSION_STORE", "database"),
+            "SESSION_STORE_URL": os.getenv("SESSION_STORE_URL"),
+            "SESSION_RENEWAL_INTERVAL_SECONDS": os.getenv("SESSION_RENEWAL_INTERVAL_SECONDS", "3600"),
+            "SESSION_RENEWAL_FLUSH_SECONDS": os.getenv("SESSION_RENEWAL_FLUSH_SECONDS", "30"),
+            "SESSION_RENEWAL_BATCH_SIZE": os.getenv("SESSION_RENEWAL_BATCH_SIZE", "500"),
+            "PASSWORD_HASH_WORKERS": os.getenv("PASSWORD_HASH_WORKERS", "2"),
+            "PASSWORD_HASH_QUEUE_SIZE": os.getenv("PASSWORD_HASH_QUEUE_SIZE", "16"),
+            "PASSWORD_HASHER": os.getenv("PASSWORD_HASHER", "bcrypt"),
+            "PASSWORD_HASH_COST": os.getenv("PASSWORD_HASH_COST", "0"),
+            "PASSWORD_HASH_TARGET_MS": os.getenv("PASSWORD_HASH_TARGET_MS", "250"),
+            "LOGIN_EMAIL_BURST": os.getenv("LOGIN_EMAIL_BURST", "10"),
+            "LOGIN_EMAIL_PER_MINUTE": os.getenv("LOGIN_EMAIL_PER_MINUTE", "5"),
+            "LOGIN_IP_BURST": os.getenv("LOGIN_IP_BURST", "50"),
+            "LOGIN_IP_PER_MINUTE": os.getenv("LOGIN_IP_PER_MINUTE", "30"),
+            "LOGIN_TRUSTED_PROXY_HOPS": os.getenv("LOGIN_TRUSTED_PROXY_HOPS", "1"),
         }
 
     def _set_common_attributes(self, secrets: dict):
@@ -44,8 +92,85 @@ class Settings:
         self.SENDGRID_API_KEY = secrets.get("SENDGRID_API_KEY")
         self.BASE_URL = secrets.get("BASE_URL")
         self.DATABASE_URL = secrets.get("DATABASE_URL")
+        # per engine and per worker process: each worker may open up to DB_POOL_SIZE + DB_MAX_OVERFLOW
+        # connections to the primary and as many to each replica
+        self.DB_POOL_SIZE = int(secrets.get("DB_POOL_SIZE", 10))
+        self.DB_MAX_OVERFLOW = int(secrets.get("DB_MAX_OVERFLOW", 20))
+        self.DB_POOL_TIMEOUT_SECONDS = float(secrets.get("DB_POOL_TIMEOUT_SECONDS", 30))
+        self.DB_POOL_RECYCLE_SECONDS = int(secrets.get("DB_POOL_RECYCLE_SECONDS", 900))
+        # comma-separated read replicas picked "round_robin" or "random" for reads; after a write
+        # the caller reads from the primary for READ_YOUR_WRITES_SECONDS
+        self.DATABASE_REPLICA_URLS = [
+            url.strip() for url in (secrets.get("DATABASE_REPLICA_URLS") or "").split(",") if url.strip()
+        ]
+        self.DATABASE_REPLICA_POLICY = secrets.get("DATABASE_REPLICA_POLICY", "round_robin")
+        self.READ_YOUR_WRITES_SECONDS = float(secrets.get("READ_YOUR_WRITES_SECONDS", 5))
+        # a unit of work that loses its connection before committing is replayed up to DB_RETRY_ATTEMPTS
+        # times in all, after a jittered backoff, unless that would run past DB_RETRY_DEADLINE_SECONDS
+        self.DB_RETRY_ATTEMPTS = int(secrets.get("DB_RETRY_ATTEMPTS", 3))
+        self.DB_RETRY_BACKOFF_SECONDS = float(secrets.get("DB_RETRY_BACKOFF_SECONDS", 0.05))
+        self.DB_RETRY_MAX_BACKOFF_SECONDS = float(secrets.get("DB_RETRY_MAX_BACKOFF_SECONDS", 0.5))
+        self.DB_RETRY_DEADLINE_SECONDS = float(secrets.get("DB_RETRY_DEADLINE_SECONDS", 2))
+        # per query profile ("read", "write" or "export", see core.query_limits): the Postgres
+        # statement_timeout and the statements a request may run before it is logged ("log") or
+        # failed ("raise"); 0 disables either
+        self.DB_STATEMENT_TIMEOUT_READ_MS = int(secrets.get("DB_STATEMENT_TIMEOUT_READ_MS", 5000))
+        self.DB_STATEMENT_TIMEOUT_WRITE_MS = int(secrets.get("DB_STATEMENT_TIMEOUT_WRITE_MS", 10000))
+        self.DB_STATEMENT_TIMEOUT_EXPORT_MS = int(secrets.get("DB_STATEMENT_TIMEOUT_EXPORT_MS", 120000))
+        self.DB_QUERY_BUDGET_READ = int(secrets.get("DB_QUERY_BUDGET_READ", 100))
+        self.DB_QUERY_BUDGET_WRITE = int(secrets.get("DB_QUERY_BUDGET_WRITE", 50))
+        self.DB_QUERY_BUDGET_EXPORT = int(secrets.get("DB_QUERY_BUDGET_EXPORT", 0))
+        self.DB_QUERY_BUDGET_ACTION = secrets.get("DB_QUERY_BUDGET_ACTION", "log")
         self.DOCS_AUTH_USERNAME = secrets.get("DOCS_AUTH_USERNAME")
         self.DOCS_AUTH_PASSWORD = secrets.get("DOCS_AUTH_PASSWORD")
+        # each worker caches resolved sessions for up to SESSION_CACHE_TTL_SECONDS (0 disables the
+        # cache); a logout or revocation clears the worker that handled it, others serve the cached
+        # user until the entry expires
+        self.SESSION_CACHE_TTL_SECONDS = float(secrets.get("SESSION_CACHE_TTL_SECONDS", 60))
+        self.SESSION_CACHE_MAX_ENTRIES = int(secrets.get("SESSION_CACHE_MAX_ENTRIES", 10000))
+        # "database" checks every session against the sessions table, "jwt" verifies tokens locally
+        self.SESSION_VERIFICATION = secrets.get("SESSION_VERIFICATION", "database")
+        self.REVOCATION_SYNC_SECONDS = int(secrets.get("REVOCATION_SYNC_SECONDS", 30))
+        self.SESSION_REAPER_INTERVAL_SECONDS = int(secrets.get("SESSION_REAPER_INTERVAL_SECONDS", 3600))
+        self.SESSION_REAPER_BATCH_SIZE = int(secrets.get("SESSION_REAPER_BATCH_SIZE", 1000))
+        # journey rows are written together every JOURNEY_FLUSH_SECONDS or once JOURNEY_BATCH_SIZE
+        # are waiting (0 seconds writes each one right away); past JOURNEY_MAX_PENDING they are dropped
+        self.JOURNEY_FLUSH_SECONDS = float(secrets.get("JOURNEY_FLUSH_SECONDS", 5))
+        self.JOURNEY_BATCH_SIZE = int(secrets.get("JOURNEY_BATCH_SIZE", 500))
+        self.JOURNEY_MAX_PENDING = int(secrets.get("JOURNEY_MAX_PENDING", 10000))
+        # account deletions are picked up every interval (0 only runs them right after the request),
+        # deleted batch_size rows at a time, and run again after a failure or once their worker
+        # has reported no progress for stale_seconds, up to max_attempts times
+        self.ACCOUNT_DELETION_INTERVAL_SECONDS = int(secrets.get("ACCOUNT_DELETION_INTERVAL_SECONDS", 60))
+        self.ACCOUNT_DELETION_BATCH_SIZE = int(secrets.get("ACCOUNT_DELETION_BATCH_SIZE", 500))
+        self.ACCOUNT_DELETION_STALE_SECONDS = int(secrets.get("ACCOUNT_DELETION_STALE_SECONDS", 600))
+        self.ACCOUNT_DELETION_MAX_ATTEMPTS = int(secrets.get("ACCOUNT_DELETION_MAX_ATTEMPTS", 5))
+        # async routes use asyncpg when installed and enabled, else the sync engine on the thread pool;
+        # ASYNC_DATABASE_URL defaults to DATABASE_URL with the asyncpg driver
+        self.ASYNC_DATABASE_ENABLED = str(secrets.get("ASYNC_DATABASE_ENABLED", "true")).lower() == "true"
+        self.ASYNC_DATABASE_URL = secrets.get("ASYNC_DATABASE_URL")
+        # where session tokens live: "database", "memory" (single node) or "redis" at SESSION_STORE_URL
+        self.SESSION_STORE = secrets.get("SESSION_STORE", "database")
+        self.SESSION_STORE_URL = secrets.get("SESSION_STORE_URL")
+        # sessions slide forward at most once per interval; 0 keeps a fixed expiry from login
+        self.SESSION_RENEWAL_INTERVAL_SECONDS = int(secrets.get("SESSION_RENEWAL_INTERVAL_SECONDS", 3600))
+        self.SESSION_RENEWAL_FLUSH_SECONDS = int(secrets.get("SESSION_RENEWAL_FLUSH_SECONDS", 30))
+        self.SESSION_RENEWAL_BATCH_SIZE = int(secrets.get("SESSION_RENEWAL_BATCH_SIZE", 500))
+        # 0 workers hashes inline on the calling thread
+        self.PASSWORD_HASH_WORKERS = int(secrets.get("PASSWORD_HASH_WORKERS", 2))
+        self.PASSWORD_HASH_QUEUE_SIZE = int(secrets.get("PASSWORD_HASH_QUEUE_SIZE", 16))
+        # "bcrypt" or "argon2id"; a cost of 0 calibrates at startup to PASSWORD_HASH_TARGET_MS
+        self.PASSWORD_HASHER = secrets.get("PASSWORD_HASHER", "bcrypt")
+        self.PASSWORD_HASH_COST = int(secrets.get("PASSWORD_HASH_COST", 0))
+        self.PASSWORD_HASH_TARGET_MS = float(secrets.get("PASSWORD_HASH_TARGET_MS", 250))
+        # login attempts allowed in a burst and refilled per minute; 0 disables that limit
+        self.LOGIN_EMAIL_BURST = int(secrets.get("LOGIN_EMAIL_BURST", 10))
+        self.LOGIN_EMAIL_PER_MINUTE = float(secrets.get("LOGIN_EMAIL_PER_MINUTE", 5))
+        self.LOGIN_IP_BURST = int(secrets.get("LOGIN_IP_BURST", 50))
+        self.LOGIN_IP_PER_MINUTE = float(secrets.get("LOGIN_IP_PER_MINUTE", 30))
+        # reverse proxies in front of the app that append to X-Forwarded-For (the load balancer);
+        # the per-IP limit keys on the address the outermost of them saw, see core.login_throttle
+        self.LOGIN_TRUSTED_PROXY_HOPS = int(secrets.get("LOGIN_TRUSTED_PROXY_HOPS", 1))
 
 
     @property
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Dict
+
+from starlette.concurrency import run_in_threadpool
+
+from core.database import session_scope
+from core.logging_config import LOGGER
+from repository.revoked_token_repository import RevokedTokenRepository
+
+
+class TokenDenylist:
+    """
+    In-memory set of revoked session JWT ids, used when sessions are verified locally.
+    Filled immediately by logouts in this process and periodically from the revoked_tokens table,
+    so revocations made by other workers are picked up within one sync interval.
+    """
+
+    def __init__(self):
+        self._revoked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        with self._lock:
+            self._revoked[jti] = expires_at.timestamp()
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self._revoked
+
+    def clear(self) -> None:
+        with self._lock:
+            self._revoked.clear()
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def sync_from_db(self) -> int:
+        with session_scope() as db:
+            revocations = RevokedTokenRepository().get_active_revocations(db)
+        now = time.time()
+        with self._lock:
+            for revocation in revocations:
+                self._revoked[revocation.jti] = revocation.expires_at.timestamp()
+            # Tokens past their exp claim are rejected by signature verification anyway.
+            for jti in [jti for jti, expires in self._revoked.items() if expires <= now]:
+                del self._revoked[jti]
+        return len(revocations)
+
+    async def run_sync_loop(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await run_in_threadpool(self.sync_from_db)
+            except Exception as e:
+                LOGGER.error(f"Error syncing token denylist: {e}")
+            await asyncio.sleep(interval_seconds)
+
+
+token_denylist = TokenDenylist()
@@ -27,6 +27,7 @@ from core.settings import settings
 from models.user import User, UserRole
 from models.event import Event
 from models.announcement import Announcement
+from repository.bulk import upsert
 from utils.func_utils import get_password_hash
 from core.logging_config import LOGGER
 
@@ -178,13 +179,16 @@ def create_sample_users(
     users = []
     _create_admin_user(session, users)
 
+    # Every sample user shares one password, so it is hashed once.
+    password = get_password_hash("password123")
+    rows = []
     for _ in range(count - 1):
         first_name = fake.first_name()
         last_name = fake.last_name()
         email = f"{first_name.lower()}.{last_name.lower()}{random.randint(1, 999)}@pkfalumni.com"
 
         # Generate a degree entry
-        degree_name = random.choice([d["degree"] for d in DEGREES])
+        degree_name = random.choice(DEGREES)
         major_name = random.choice(MAJORS)
         graduation_year = random.randint(2010, 2023)
         university = random.choice(UNIVERSITIES)  # You can define a list of universities
@@ -199,11 +203,11 @@ def create_sample_users(
             }
         ]
 
-        user = User(
+        rows.append(dict(
             email=email,
             first_name=first_name,
             last_name=last_name,
-            password=get_password_hash("password123"),
+            password=password,
             address=fake.address().replace("\n", ", "),
             phone=fake.phone_number(),
             image=random.choice(PROFILE_IMAGES),
@@ -217,17 +221,15 @@ def create_sample_users(
             else None,
             role=UserRole.user,
             is_active=True,
-        )
-
-        session.add(user)
-        try:
-            session.commit()
-            session.refresh(user)
-            users.append(user)
-            LOGGER.info(f"Created user: {email}")
-        except IntegrityError:
-            session.rollback()
-            LOGGER.error(f"User with email {email} already exists")
+        ))
+
+    # One INSERT for the whole batch; emails that already exist are skipped.
+    created = upsert(session, User, rows, index_elements=["email"])
+    session.commit()
+    if created < len(rows):
+        LOGGER.error(f"{len(rows) - created} generated emails already existed")
+    emails = [row["email"] for row in rows]
+    users.extend(session.query(User).filter(User.email.in_(emails)).all())
 
     LOGGER.info(f"Created {len(users)} users total")
     return users
@@ -0,0 +1,108 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from core.database import session_scope
+from core.logging_config import LOGGER
+from core.settings import settings
+from models.account_deletion import AccountDeletionStatus
+from repository.account_deletion_repository import PURGE_STEPS, AccountDeletionRepository
+from utils.func_utils import delete_files_from_s3
+
+
+class AccountDeleter:
+    """
+    Carries out account deletions requested through DELETE /users/{user_id}. Each job deletes
+    the user's rows step by step in batches of batch_size, committing every batch together
+    with the job's progress, then deletes the user and finally the S3 objects their rows
+    referenced. Every step is idempotent, so a job interrupted at any point is simply run
+    again: by another worker once it has made no progress for stale_seconds, or after a
+    failure, up to max_attempts times.
+    """
+
+    def __init__(self, batch_size: int, stale_seconds: float, max_attempts: int):
+        self.batch_size = batch_size
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max_attempts
+        self.repository = AccountDeletionRepository()
+        self.last_run_at: Optional[datetime] = None
+        self.total_completed = 0
+        self.total_failed = 0
+
+    def run_once(self) -> int:
+        """Runs claimable jobs until none are left and returns how many completed."""
+        completed = 0
+        # Fixed for the whole run, so a job failing now waits for a later run to be retried.
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=self.stale_seconds)
+        while True:
+            with session_scope() as db:
+                job = self.repository.claim_next_job(db, stale_before, self.max_attempts)
+                if job is None:
+                    break
+                job_id, user_id = job.id, job.user_id
+            try:
+                self.delete_account(job_id, user_id)
+                completed += 1
+                self.total_completed += 1
+            except Exception as e:
+                self.total_failed += 1
+                LOGGER.error(f"Account deletion {job_id} for user {user_id} failed: {e}")
+                with session_scope() as db:
+                    self.repository.finish_job(
+                        db, self.repository.get_job(db, job_id), AccountDeletionStatus.failed, str(e)
+                    )
+        self.last_run_at = datetime.now(timezone.utc)
+        return completed
+
+    def delete_account(self, job_id: int, user_id: int) -> None:
+        with session_scope() as db:
+            job = self.repository.get_job(db, job_id)
+            for step in PURGE_STEPS:
+                while True:
+                    deleted, s3_urls = self.repository.purge_batch(db, step, user_id, self.batch_size)
+                    self.repository.record_progress(db, job, step.name, deleted, s3_urls)
+                    db.commit()
+                    if deleted < self.batch_size:
+                        break
+                LOGGER.info(f"Account deletion {job_id}: {job.progress[step.name]} {step.name} removed.")
+            while True:
+                detached = self.repository.detach_mentees(db, user_id, self.batch_size)
+                self.repository.record_progress(db, job, "mentees", detached, [])
+                db.commit()
+                if detached < self.batch_size:
+                    break
+
+            deleted, s3_urls = self.repository.delete_user_row(db, user_id)
+            self.repository.record_progress(db, job, "users", deleted, s3_urls)
+            db.commit()
+
+            # Last, so a failure here leaves the URLs on the job for the next attempt.
+            if job.s3_urls:
+                removed = delete_files_from_s3(job.s3_urls)
+                self.repository.record_progress(db, job, "s3_objects", removed, [])
+            self.repository.finish_job(db, job, AccountDeletionStatus.done)
+        LOGGER.info(f"Account deletion {job_id} for user {user_id} done.")
+
+    def stats(self) -> dict:
+        return {
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "total_completed": self.total_completed,
+            "total_failed": self.total_failed,
+        }
+
+    async def run_loop(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await run_in_threadpool(self.run_once)
+            except Exception as e:
+                LOGGER.error(f"Error running account deletions: {e}")
+
+
+account_deleter = AccountDeleter(
+    batch_size=settings.ACCOUNT_DELETION_BATCH_SIZE,
+    stale_seconds=settings.ACCOUNT_DELETION_STALE_SECONDS,
+    max_attempts=settings.ACCOUNT_DELETION_MAX_ATTEMPTS,
+)
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+from core.database import run_in_transaction
+from core.logging_config import LOGGER
+from core.settings import settings
+from repository.user_journey_repository import UserJourneyRepository
+
+
+class JourneyRecorder:
+    """
+    Buffers the journey rows JourneyTrackingMiddleware records and writes them with one
+    multi-row INSERT per flush instead of a transaction per request. A flush happens every
+    flush_seconds and as soon as batch_size rows are waiting; with flush_seconds 0 every row
+    is written on its own. Past max_pending waiting rows new ones are dropped, and rows
+    still buffered when the process dies are lost.
+    """
+
+    def __init__(self, flush_seconds: float, batch_size: int, max_pending: int):
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.last_flush_at: Optional[datetime] = None
+        self.last_flush_written = 0
+        self.total_written = 0
+        self.total_dropped = 0
+
+    def record(self, **row: Any) -> bool:
+        """Queues one journey row; True when the caller should flush now."""
+        row.setdefault("timestamp", datetime.now(timezone.utc))
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self.total_dropped += 1
+                return False
+            self._pending.append(row)
+            return self.flush_seconds <= 0 or len(self._pending) >= self.batch_size
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending = []
+
+    def flush(self) -> int:
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return 0
+
+        journey_repo = UserJourneyRepository()
+        try:
+            written = run_in_transaction(lambda db: journey_repo.create_logs(db, rows))
+        except IntegrityError:
+            # Someone deleted their account since: keep everyone else's rows.
+            written = run_in_transaction(lambda db: journey_repo.create_logs(db, rows, skip_missing_users=True))
+            self.total_dropped += len(rows) - written
+
+        self.last_flush_at = datetime.now(timezone.utc)
+        self.last_flush_written = written
+        self.total_written += written
+        return written
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending(),
+            "last_flush_at": self.last_flush_at.isoformat() if self.last_flush_at else None,
+            "last_flush_written": self.last_flush_written,
+            "total_written": self.total_written,
+            "total_dropped": self.total_dropped,
+        }
+
+    async def run_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await run_in_threadpool(self.flush)
+            except Exception as e:
+                LOGGER.error(f"Error writing user journeys: {e}")
+
+
+journey_recorder = JourneyRecorder(
+    flush_seconds=settings.JOURNEY_FLUSH_SECONDS,
+    batch_size=settings.JOURNEY_BATCH_SIZE,
+    max_pending=settings.JOURNEY_MAX_PENDING,
+)
@@ -0,0 +1,62 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from core.database import session_scope
+from core.logging_config import LOGGER
+from core.settings import settings
+from repository.revoked_token_repository import RevokedTokenRepository
+from repository.session_repository import SessionRepository
+
+
+class SessionReaper:
+    """
+    Deletes expired sessions (and revocations of already expired tokens) in bounded batches,
+    committing after each batch so a large backlog never holds long row locks.
+    """
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+        self.last_run_at: Optional[datetime] = None
+        self.last_run_deleted = 0
+        self.total_deleted = 0
+
+    def run_once(self) -> int:
+        session_repo = SessionRepository()
+        revoked_token_repo = RevokedTokenRepository()
+        deleted = 0
+        with session_scope() as db:
+            while True:
+                batch = session_repo.delete_expired_sessions(db, batch_size=self.batch_size)
+                db.commit()
+                deleted += batch
+                if batch < self.batch_size:
+                    break
+            while revoked_token_repo.delete_expired_revocations(db, batch_size=self.batch_size) >= self.batch_size:
+                db.commit()
+
+        self.last_run_at = datetime.now(timezone.utc)
+        self.last_run_deleted = deleted
+        self.total_deleted += deleted
+        LOGGER.info(f"Session reaper removed {deleted} expired sessions.")
+        return deleted
+
+    def stats(self) -> dict:
+        return {
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_run_deleted": self.last_run_deleted,
+            "total_deleted": self.total_deleted,
+        }
+
+    async def run_loop(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await run_in_threadpool(self.run_once)
+            except Exception as e:
+                LOGGER.error(f"Error reaping expired sessions: {e}")
+
+
+session_reaper = SessionReaper(batch_size=settings.SESSION_REAPER_BATCH_SIZE)
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Set
+
+from starlette.concurrency import run_in_threadpool
+
+from core.database import session_scope
+from core.logging_config import LOGGER
+from core.settings import settings
+from repository.session_repository import SessionRepository, SESSION_DURATION_HOURS
+
+
+class SessionRenewer:
+    """
+    Sliding session expiry without a write per request. Requests only mark a session as
+    due once it was last extended more than interval_seconds ago; due sessions are pushed
+    to a full SESSION_DURATION_HOURS from flush time in batched UPDATEs.
+    """
+
+    def __init__(self, interval_seconds: float, batch_size: int):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self.last_flush_at: Optional[datetime] = None
+        self.last_flush_extended = 0
+        self.total_extended = 0
+
+    def touch(self, token: str, expires_at: datetime) -> None:
+        if self.interval_seconds <= 0:
+            return
+        duration = timedelta(hours=SESSION_DURATION_HOURS)
+        remaining = expires_at - datetime.now(timezone.utc)
+        if remaining > duration - timedelta(seconds=self.interval_seconds):
+            return
+        with self._lock:
+            self._pending.add(token)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        with self._lock:
+            tokens, self._pending = list(self._pending), set()
+        if not tokens:
+            return 0
+
+        session_repo = SessionRepository()
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=SESSION_DURATION_HOURS)
+        extended = 0
+        with session_scope() as db:
+            for start in range(0, len(tokens), self.batch_size):
+                extended += session_repo.extend_sessions(
+                    db, tokens[start:start + self.batch_size], expires_at
+                )
+                db.commit()
+
+        self.last_flush_at = datetime.now(timezone.utc)
+        self.last_flush_extended = extended
+        self.total_extended += extended
+        LOGGER.info(f"Session renewer extended {extended} of {len(tokens)} due sessions.")
+        return extended
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending(),
+            "last_flush_at": self.last_flush_at.isoformat() if self.last_flush_at else None,
+            "last_flush_extended": self.last_flush_extended,
+            "total_extended": self.total_extended,
+        }
+
+    async def run_loop(self, flush_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(flush_seconds)
+            try:
+                await run_in_threadpool(self.flush)
+            except Exception as e:
+                LOGGER.error(f"Error extending sessions: {e}")
+
+
+session_renewer = SessionRenewer(
+    interval_seconds=settings.SESSION_RENEWAL_INTERVAL_SECONDS,
+    batch_size=settings.SESSION_RENEWAL_BATCH_SIZE,
+)
@@ -1,3 +1,4 @@
+import asyncio
 import uvicorn
 from fastapi.responses import HTMLResponse
 from fastapi import Depends, FastAPI, HTTPException
@@ -15,15 +16,78 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from core.logging_config import LOGGER
 from core.settings import settings
+from core.password_policy import password_policy
+from core.pool_metrics import pool_metrics
+from core.replica_routing import read_your_writes
+from core.token_denylist import token_denylist
+from jobs.account_deleter import account_deleter
+from jobs.journey_recorder import journey_recorder
+from jobs.session_reaper import session_reaper
+from jobs.session_renewer import session_renewer
+from repository.session_store import get_session_store
 from datetime import datetime
 from middleware.logging_middleware import LoggingMiddleware
 from middleware.journey_middleware import JourneyTrackingMiddleware
+from middleware.auth_middleware import SessionAuthMiddleware
 
 # TODO: Init logging and use config/settings.py for env variables
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    database.init_db(settings.DATABASE_URL)
+    read_your_writes.window_seconds = settings.READ_YOUR_WRITES_SECONDS
+    database.init_db(
+        settings.DATABASE_URL, settings.DATABASE_REPLICA_URLS, settings.DATABASE_REPLICA_POLICY
+    )
+    if settings.ASYNC_DATABASE_ENABLED:
+        async_url = settings.ASYNC_DATABASE_URL or database.to_async_url(settings.DATABASE_URL)
+        async_replica_urls = [database.to_async_url(url) for url in settings.DATABASE_REPLICA_URLS]
+        if not database.init_async_db(async_url, async_replica_urls, settings.DATABASE_REPLICA_POLICY):
+            LOGGER.warning("asyncpg is not installed; async routes fall back to the thread pool.")
+    await asyncio.to_thread(password_policy.calibrate)
+    # Build the session store now so a bad SESSION_STORE fails startup, not the first login.
+    get_session_store()
+    denylist_sync = None
+    if settings.SESSION_VERIFICATION == "jwt":
+        denylist_sync = asyncio.create_task(
+            token_denylist.run_sync_loop(settings.REVOCATION_SYNC_SECONDS)
+        )
+    reaper = None
+    if settings.SESSION_REAPER_INTERVAL_SECONDS > 0:
+        reaper = asyncio.create_task(
+            session_reaper.run_loop(settings.SESSION_REAPER_INTERVAL_SECONDS)
+        )
+    journeys = None
+    if settings.JOURNEY_FLUSH_SECONDS > 0:
+        journeys = asyncio.create_task(journey_recorder.run_loop())
+    deleter = None
+    if settings.ACCOUNT_DELETION_INTERVAL_SECONDS > 0:
+        deleter = asyncio.create_task(
+            account_deleter.run_loop(settings.ACCOUNT_DELETION_INTERVAL_SECONDS)
+        )
+    renewer = None
+    if settings.SESSION_RENEWAL_INTERVAL_SECONDS > 0:
+        renewer = asyncio.create_task(
+            session_renewer.run_loop(settings.SESSION_RENEWAL_FLUSH_SECONDS)
+        )
     yield
+    if denylist_sync:
+        denylist_sync.cancel()
+    if reaper:
+        reaper.cancel()
+    if deleter:
+        deleter.cancel()
+    if journeys:
+        journeys.cancel()
+        try:
+            await asyncio.to_thread(journey_recorder.flush)
+        except Exception as e:
+            LOGGER.error(f"Error writing user journeys on shutdown: {e}")
+    if renewer:
+        renewer.cancel()
+        try:
+            await asyncio.to_thread(session_renewer.flush)
+        except Exception as e:
+            LOGGER.error(f"Error extending sessions on shutdown: {e}")
+    await database.close_async_db()
 
 
 app = FastAPI(title="PACI Community Backend", version="1.0.0", 
@@ -43,6 +107,9 @@ app.add_middleware(
     JourneyTrackingMiddleware,
 )
 
+# Added last so it runs first: every other layer reads the caller from request.state.
+app.add_middleware(SessionAuthMiddleware)
+
 app.include_router(user_router.router)
 app.include_router(announcement_router.router)
 app.include_router(event_router.router)
@@ -72,6 +139,12 @@ async def get_redoc(username: str = Depends(get_current_username)) -> HTMLRespon
     return get_redoc_html(openapi_url="/openapi.json", title="redoc")
 
 
+@app.get("/metrics/db-pool")
+async def get_db_pool_metrics(username: str = Depends(get_current_username)) -> dict:
+    """Connection pool gauges, counters and checkout wait histograms for this worker."""
+    return pool_metrics.snapshot()
+
+
 @app.get("/health")
 async def health_check():
     try:
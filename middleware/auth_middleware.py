@@ -0,0 +1,30 @@
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+from core.auth import resolve_session_user
+from core.logging_config import LOGGER
+
+
+class SessionAuthMiddleware(BaseHTTPMiddleware):
+    """
+    Resolves the session_token cookie once per request and stores the caller on request.state.
+    get_current_user, the journey tracker and the request logger all read from there.
+    """
+
+    EXCLUDED_PATHS = {"/docs", "/redoc", "/openapi.json", "/health", "/"}
+
+    async def dispatch(self, request: Request, call_next):
+        if request.url.path in self.EXCLUDED_PATHS:
+            return await call_next(request)
+
+        user = None
+        session_token = request.cookies.get("session_token")
+        if session_token:
+            try:
+                user = await run_in_threadpool(resolve_session_user, session_token)
+            except Exception as e:
+                LOGGER.error(f"Error resolving user session: {e}")
+
+        request.state.user = user
+        request.state.user_id = user.id if user else None
+        return await call_next(request)
@@ -1,13 +1,9 @@
 # core/journey_middleware.py
 from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi import Request
-from core.database import get_db
-from repository.user_journey_repository import UserJourneyRepository
-from repository.session_repository import SessionRepository
-from datetime import datetime, timezone
+from jobs.journey_recorder import journey_recorder
 import time
 from concurrent.futures import ThreadPoolExecutor
-from typing import Optional, Dict, Any
 from core.logging_config import LOGGER
 journey_executor = ThreadPoolExecutor(max_workers=5, thread_name_prefix="journey_")
 
@@ -15,7 +11,8 @@ journey_executor = ThreadPoolExecutor(max_workers=5, thread_name_prefix="journey
 class JourneyTrackingMiddleware(BaseHTTPMiddleware):
     """
     Middleware to track user journey through the application.
-    Logs all authenticated user actions asynchronously without blocking responses.
+    Logs all authenticated user actions asynchronously without blocking responses: rows are
+    buffered in journey_recorder and written in batches on the journey thread pool.
     """
     
     EXCLUDED_PATHS = {"/docs", "/redoc", "/openapi.json", "/health", "/"}
@@ -25,20 +22,7 @@ class JourneyTrackingMiddleware(BaseHTTPMiddleware):
             return await call_next(request)
         
         session_token = request.cookies.get("session_token")
-        user_id = None
-        
-        if session_token:
-            db = next(get_db())
-            try:
-                session_repo = SessionRepository()
-                session = session_repo.get_by_token(db, session_token)
-                
-                if session and session.expires_at > datetime.now(timezone.utc):
-                    user_id = session.user_id
-            except Exception as e:
-                LOGGER.error(f"Error getting user session: {e}")
-            finally:
-                db.close()
+        user_id = getattr(request.state, "user_id", None)
         
         start_time = time.time()
         response = await call_next(request)
@@ -58,8 +42,7 @@ class JourneyTrackingMiddleware(BaseHTTPMiddleware):
             
             user_agent = request.headers.get("user-agent")
             
-            journey_executor.submit(
-                self._log_journey_sync,
+            flush_now = journey_recorder.record(
                 user_id=user_id,
                 action=action,
                 session_token=session_token,
@@ -69,41 +52,15 @@ class JourneyTrackingMiddleware(BaseHTTPMiddleware):
                 ip_address=ip_address,
                 user_agent=user_agent,
             )
+            if flush_now:
+                journey_executor.submit(self._flush_journeys)
         
         return response
     
-    def _log_journey_sync(
-        self,
-        user_id: int,
-        action: str,
-        session_token: Optional[str] = None,
-        endpoint: Optional[str] = None,
-        method: Optional[str] = None,
-        extra_metadata: Optional[Dict[str, Any]] = None,
-        ip_address: Optional[str] = None,
-        user_agent: Optional[str] = None,
-    ) -> None:
-        """
-        Synchronous journey logging executed in thread pool.
-        This runs in a separate thread and doesn't block the main request.
-        """
+    def _flush_journeys(self) -> None:
+        """Runs on the journey thread pool so the write never blocks a request."""
         try:
-            db = next(get_db())
-            try:
-                journey_repo = UserJourneyRepository()
-                journey_repo.create_log(
-                    db=db,
-                    user_id=user_id,
-                    action=action,
-                    session_token=session_token,
-                    endpoint=endpoint,
-                    method=method,
-                    extra_metadata=extra_metadata,
-                    ip_address=ip_address,
-                    user_agent=user_agent,
-                )
-            finally:
-                db.close()
+            journey_recorder.flush()
         except Exception as e:
             LOGGER.error(f"Error logging user journey: {e}")
     
@@ -58,6 +58,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                     "endpoint": request.url.path,
                     "status_code": response.status_code,
                     "duration_ms": duration_ms,
+                    "user_id": getattr(request.state, "user_id", None),
                 }
             )
 
@@ -10,6 +10,8 @@ from .comment import Comment
 from .upvote import Upvote
 from .announcement import Announcement
 from .user_journey import UserJourney
+from .revoked_token import RevokedToken
+from .account_deletion import AccountDeletion
 from core.database import Base
 
 __all__ = [
@@ -24,5 +26,7 @@ __all__ = [
     "Comment",
     "Post",
     "Upvote",
-    "UserJourney"
+    "UserJourney",
+    "RevokedToken",
+    "AccountDeletion",
 ]
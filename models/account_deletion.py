@@ -0,0 +1,32 @@
+import enum
+from sqlalchemy import Column, Integer, Text, DateTime, Enum
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime, timezone
+from core.database import Base
+
+
+class AccountDeletionStatus(enum.Enum):
+    pending = "pending"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+class AccountDeletion(Base):
+    """A request to delete a user's account, carried out in batches by jobs.account_deleter."""
+
+    __tablename__ = "account_deletions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Not a foreign key: the job outlives the user row it deletes.
+    user_id = Column(Integer, nullable=False, index=True)
+    status = Column(Enum(AccountDeletionStatus), default=AccountDeletionStatus.pending, nullable=False, index=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    # rows deleted so far per step, e.g. {"posts": 1200, "comments": 40}
+    progress = Column(JSONB, nullable=False, default=dict)
+    # S3 URLs of the deleted rows' files, removed from the bucket once the rows are gone
+    s3_urls = Column(JSONB, nullable=False, default=list)
+    error = Column(Text, nullable=True)
+    requested_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -8,7 +8,7 @@ class Comment(Base):
     __tablename__ = "comments"
 
     id = Column(Integer, primary_key=True, index=True)
-    post_id = Column(Integer, ForeignKey('posts.id', ondelete="CASCADE"), nullable=False)
+    post_id = Column(Integer, ForeignKey('posts.id', ondelete="CASCADE"), nullable=False, index=True)
     author_id = Column(Integer, ForeignKey('users.id', ondelete="CASCADE"), nullable=False)
     content = Column(Text, nullable=False)
     attachment_url = Column(String(500), nullable=True)
@@ -18,4 +18,4 @@ class Comment(Base):
 
     post = relationship("Post", back_populates="comments")
     author = relationship("User", back_populates="comments")
-    upvotes = relationship("Upvote", back_populates="comment", cascade="all, delete-orphan")
\ No newline at end of file
+    upvotes = relationship("Upvote", back_populates="comment", cascade="all, delete-orphan", passive_deletes=True)
\ No newline at end of file
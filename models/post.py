@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from core.database import Base
@@ -8,15 +8,21 @@ class Post(Base):
     __tablename__ = "posts"
 
     id = Column(Integer, primary_key=True, index=True)
-    author_id = Column(Integer, ForeignKey('users.id', ondelete="CASCADE"), nullable=False)
+    author_id = Column(Integer, ForeignKey('users.id', ondelete="CASCADE"), nullable=False, index=True)
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
     attachment_url = Column(String(500), nullable=True)
     attachment_type = Column(Enum(AttachmentType), nullable=True)
     category = Column(String(100))
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True)
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
     author = relationship("User", back_populates="posts")
-    comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
-    upvotes = relationship("Upvote", back_populates="post", cascade="all, delete-orphan")
+    # passive_deletes: the comments.post_id and upvotes.post_id foreign keys cascade in the
+    # database, so deleting a post is one DELETE instead of loading and deleting every child.
+    comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan", passive_deletes=True)
+    upvotes = relationship("Upvote", back_populates="post", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        Index('ix_posts_category_created_at', 'category', 'created_at'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, Column, Boolean, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Integer, Column, Boolean, DateTime, ForeignKey, Text, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from core.database import Base
@@ -14,7 +14,7 @@ class Resume(Base):
     __tablename__ = "resumes"
 
     id = Column(Integer, primary_key= True )
-    user_id = Column(Integer, ForeignKey('users.id', ondelete= "CASCADE"), nullable= False)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete= "CASCADE"), nullable= False, index=True)
     file_name = Column(Text, nullable = False)
     file_path = Column(Text, nullable = False)
     status = Column(Enum(ResumeStatus), default = ResumeStatus.pending, nullable= False)
@@ -22,4 +22,8 @@ class Resume(Base):
     updated_at = Column(DateTime(timezone = True), default = lambda: datetime.now(timezone.utc), onupdate = lambda: datetime.now(timezone.utc), nullable = False)
 
     user = relationship("User", back_populates="resumes")
-    reviews = relationship("ResumeReview", back_populates="resume", cascade="all, delete-orphan")
\ No newline at end of file
+    reviews = relationship("ResumeReview", back_populates="resume", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index('ix_resumes_status_uploaded_at', 'status', 'uploaded_at'),
+    )
\ No newline at end of file
@@ -8,8 +8,8 @@ class Upvote(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id', ondelete="CASCADE"), nullable=False)
-    post_id = Column(Integer, ForeignKey('posts.id', ondelete="CASCADE"), nullable=True)
-    comment_id = Column(Integer, ForeignKey('comments.id', ondelete="CASCADE"), nullable=True)
+    post_id = Column(Integer, ForeignKey('posts.id', ondelete="CASCADE"), nullable=True, index=True)
+    comment_id = Column(Integer, ForeignKey('comments.id', ondelete="CASCADE"), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
     user = relationship("User", back_populates="upvotes")
@@ -27,8 +27,8 @@ class User(Base):
     degrees = Column(JSONB, nullable=True, default=list)
 
     current_occupation = Column(Text)
-    mentor_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    is_active = Column(Boolean, default=True)
+    mentor_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    is_active = Column(Boolean, default=True, index=True)
     linkedin_profile = Column(Text)
     instagram_profile = Column(Text, nullable=True)
     role = Column(Enum(UserRole), default=UserRole.user, nullable=False)
@@ -10,7 +10,7 @@ class UserEvent(Base):
         Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
     )
     event_id = Column(
-        Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True
+        Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True, index=True
     )
 
     user = relationship("User", back_populates="user_events")
@@ -0,0 +1,193 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import ColumnElement, delete, inspect, or_, select, tuple_, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from core.database import after_commit
+from core.session_cache import session_cache
+from models.account_deletion import AccountDeletion, AccountDeletionStatus
+from models.comment import Comment
+from models.post import Post
+from models.resume import Resume
+from models.resume_review import ResumeReview
+from models.upvote import Upvote
+from models.user import User
+from models.user_event import UserEvent
+from models.user_journey import UserJourney
+
+
+def _posts_of(user_id: int):
+    return select(Post.id).where(Post.author_id == user_id)
+
+
+def _comments_of(user_id: int):
+    return select(Comment.id).where(Comment.author_id == user_id)
+
+
+def _comments_on_posts_of(user_id: int):
+    return select(Comment.id).where(Comment.post_id.in_(_posts_of(user_id)))
+
+
+def _resumes_of(user_id: int):
+    return select(Resume.id).where(Resume.user_id == user_id)
+
+
+@dataclass(frozen=True)
+class PurgeStep:
+    name: str
+    model: type
+    where: Callable[[int], ColumnElement]
+    # column holding the URL of an S3 object that goes with the row
+    s3_url: Optional[ColumnElement] = None
+
+
+# Children before parents, so deleting a batch never cascades to an unbounded number of rows.
+PURGE_STEPS = [
+    PurgeStep("comment_upvotes", Upvote, lambda user_id: or_(
+        Upvote.comment_id.in_(_comments_of(user_id)),
+        Upvote.comment_id.in_(_comments_on_posts_of(user_id)),
+    )),
+    PurgeStep("post_upvotes", Upvote, lambda user_id: Upvote.post_id.in_(_posts_of(user_id))),
+    PurgeStep("upvotes", Upvote, lambda user_id: Upvote.user_id == user_id),
+    PurgeStep("comments_on_posts", Comment, lambda user_id: Comment.post_id.in_(_posts_of(user_id)), Comment.attachment_url),
+    PurgeStep("comments", Comment, lambda user_id: Comment.author_id == user_id, Comment.attachment_url),
+    PurgeStep("posts", Post, lambda user_id: Post.author_id == user_id, Post.attachment_url),
+    PurgeStep("resume_reviews", ResumeReview, lambda user_id: or_(
+        ResumeReview.reviewer_id == user_id,
+        ResumeReview.resume_id.in_(_resumes_of(user_id)),
+    )),
+    PurgeStep("resumes", Resume, lambda user_id: Resume.user_id == user_id, Resume.file_path),
+    PurgeStep("user_events", UserEvent, lambda user_id: UserEvent.user_id == user_id),
+    # user_journeys.user_id has no ON DELETE CASCADE.
+    PurgeStep("user_journeys", UserJourney, lambda user_id: UserJourney.user_id == user_id),
+]
+
+
+class AccountDeletionRepository:
+    def create_job(self, db: Session, user_id: int) -> AccountDeletion:
+        job = AccountDeletion(user_id=user_id, status=AccountDeletionStatus.pending, progress={}, s3_urls=[])
+        db.add(job)
+        db.flush()
+        return job
+
+    def get_job(self, db: Session, job_id: int) -> Optional[AccountDeletion]:
+        return db.get(AccountDeletion, job_id)
+
+    def get_open_job_for_user(self, db: Session, user_id: int) -> Optional[AccountDeletion]:
+        """The user's unfinished deletion, including one that failed for good; see reopen_job."""
+        return (
+            db.query(AccountDeletion)
+            .filter(
+                AccountDeletion.user_id == user_id,
+                AccountDeletion.status != AccountDeletionStatus.done,
+            )
+            .order_by(AccountDeletion.id.desc())
+            .first()
+        )
+
+    def reopen_job(self, db: Session, job: AccountDeletion) -> None:
+        """Puts a failed job back in the queue with a fresh set of attempts; its progress is kept."""
+        job.status = AccountDeletionStatus.pending
+        job.attempts = 0
+        job.error = None
+        job.updated_at = datetime.now(timezone.utc)
+        db.flush()
+
+    def claim_next_job(self, db: Session, stale_before: datetime, max_attempts: int) -> Optional[AccountDeletion]:
+        """
+        Marks the oldest runnable job as running and returns it: a pending one, or one with
+        attempts left that failed or whose worker stopped reporting progress before stale_before.
+        SKIP LOCKED lets several workers claim jobs at the same time.
+        """
+        try:
+            job = db.execute(
+                select(AccountDeletion)
+                .where(
+                    AccountDeletion.attempts < max_attempts,
+                    or_(
+                        AccountDeletion.status == AccountDeletionStatus.pending,
+                        AccountDeletion.status.in_([AccountDeletionStatus.running, AccountDeletionStatus.failed])
+                        & (AccountDeletion.updated_at < stale_before),
+                    ),
+                )
+                .order_by(AccountDeletion.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            ).scalar_one_or_none()
+            if job is None:
+                return None
+            job.status = AccountDeletionStatus.running
+            job.attempts += 1
+            job.error = None
+            job.updated_at = datetime.now(timezone.utc)
+            db.flush()
+            return job
+        except OperationalError as e:
+            raise ConnectionError(f"Database connection error: {e}")
+
+    def purge_batch(self, db: Session, step: PurgeStep, user_id: int, batch_size: int) -> Tuple[int, List[str]]:
+        """
+        Deletes at most batch_size of the user's rows for one step and returns how many went
+        and the S3 URLs they referenced. The caller commits each batch.
+        """
+        primary_key = inspect(step.model).primary_key
+        key = primary_key[0] if len(primary_key) == 1 else tuple_(*primary_key)
+        batch = select(*primary_key).where(step.where(user_id)).limit(batch_size)
+        statement = delete(step.model).where(key.in_(batch)).execution_options(synchronize_session=False)
+        try:
+            if step.s3_url is None:
+                return db.execute(statement).rowcount, []
+            urls = db.execute(statement.returning(step.s3_url)).scalars().all()
+            return len(urls), [url for url in urls if url]
+        except OperationalError as e:
+            raise ConnectionError(f"Database connection error: {e}")
+
+    def detach_mentees(self, db: Session, user_id: int, batch_size: int) -> int:
+        """Clears mentor_id on at most batch_size of the user's mentees; users.mentor_id does not cascade."""
+        batch = select(User.id).where(User.mentor_id == user_id).limit(batch_size)
+        try:
+            return db.execute(
+                update(User).where(User.id.in_(batch)).values(mentor_id=None)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        except OperationalError as e:
+            raise ConnectionError(f"Database connection error: {e}")
+
+    def delete_user_row(self, db: Session, user_id: int) -> Tuple[int, List[str]]:
+        """
+        Deletes the user once the purge steps have run; sessions and revoked tokens cascade.
+        Returns how many users went (0 when a previous attempt got this far) and the profile
+        picture URL, if any.
+        """
+        try:
+            row = db.execute(
+                delete(User).where(User.id == user_id).returning(User.image)
+                .execution_options(synchronize_session=False)
+            ).first()
+        except OperationalError as e:
+            raise ConnectionError(f"Database connection error: {e}")
+        after_commit(db, lambda: session_cache.invalidate_user(user_id))
+        if row is None:
+            return 0, []
+        return 1, [row.image] if row.image else []
+
+    def record_progress(self, db: Session, job: AccountDeletion, step: str, deleted: int, s3_urls: List[str]) -> None:
+        # JSONB columns are replaced, not mutated in place, so the ORM sees the change.
+        job.progress = {**job.progress, step: job.progress.get(step, 0) + deleted}
+        if s3_urls:
+            job.s3_urls = job.s3_urls + s3_urls
+        job.updated_at = datetime.now(timezone.utc)
+        db.flush()
+
+    def finish_job(self, db: Session, job: AccountDeletion, status: AccountDeletionStatus, error: Optional[str] = None) -> None:
+        now = datetime.now(timezone.utc)
+        job.status = status
+        job.error = error
+        job.updated_at = now
+        if status == AccountDeletionStatus.done:
+            job.finished_at = now
+            job.s3_urls = []
+        db.flush()
@@ -0,0 +1,61 @@
+from typing import Iterator, List, Optional, Sequence
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+# Postgres rejects a statement with more bind parameters than this.
+MAX_BIND_PARAMS = 65535
+
+
+def _chunks(model: type, rows: Sequence[dict]) -> Iterator[Sequence[dict]]:
+    # Every column may be bound, Python-side defaults included.
+    size = max(1, MAX_BIND_PARAMS // len(model.__table__.columns))
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def bulk_insert(db: Session, model: type, rows: Sequence[dict]) -> int:
+    """
+    Inserts rows, dicts of column values that all have the same keys, with one
+    INSERT ... VALUES (...), (...) per chunk of rows and returns how many were written.
+    No ORM objects are created: nothing is added to db's identity map and relationship
+    cascades do not run. Column defaults still apply. The caller commits.
+    """
+    written = 0
+    try:
+        for chunk in _chunks(model, rows):
+            written += db.execute(insert(model).values(list(chunk))).rowcount
+    except OperationalError as e:
+        raise ConnectionError(f"Database connection error: {e}")
+    return written
+
+
+def upsert(
+    db: Session,
+    model: type,
+    rows: Sequence[dict],
+    index_elements: List[str],
+    update_columns: Optional[List[str]] = None,
+) -> int:
+    """
+    bulk_insert with INSERT ... ON CONFLICT (index_elements): rows that collide with an
+    existing row update update_columns from the new values, or are skipped when there are
+    none. With update_columns, rows must not repeat a conflict key. Returns how many rows
+    were inserted or updated.
+    """
+    written = 0
+    try:
+        for chunk in _chunks(model, rows):
+            statement = insert(model).values(list(chunk))
+            if update_columns:
+                statement = statement.on_conflict_do_update(
+                    index_elements=index_elements,
+                    set_={column: statement.excluded[column] for column in update_columns},
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(index_elements=index_elements)
+            written += db.execute(statement).rowcount
+    except OperationalError as e:
+        raise ConnectionError(f"Database connection error: {e}")
+    return written
@@ -1,27 +1,23 @@
 from typing import Optional, List
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.comment import Comment
 from models.upvote import Upvote
-from utils.retry import retry_on_db_error
 
 class CommentRepository:
-    @retry_on_db_error()
     def create_comment(self, db: Session, comment: Comment) -> Comment:
         try:
             db.add(comment)
-            db.commit()
-            db.refresh(comment)
+            db.flush()
             return comment
         except Exception as e:
-            db.rollback()
             raise RuntimeError(f"An error occurred: {e}")
 
-    @retry_on_db_error()
     def get_comment_by_id(self, db: Session, comment_id: int) -> Optional[Comment]:
-        return db.query(Comment).filter(Comment.id == comment_id).first()
+        # Served from the identity map when the request already loaded the comment.
+        return db.get(Comment, comment_id)
 
-    @retry_on_db_error()
     def get_comments_by_post_id(self, db: Session, post_id: int) -> List[Comment]:
         return (
             db.query(Comment)
@@ -30,7 +26,6 @@ class CommentRepository:
             .all()
         )
     
-    @retry_on_db_error()
     def get_comments_by_post_id_with_upvote_count(self, db: Session, post_id: int) -> List[tuple]:
         """Returns list of tuples (Comment, upvote_count)"""
         return (
@@ -42,28 +37,36 @@ class CommentRepository:
             .all()
         )
 
-    @retry_on_db_error()
     def update_comment(self, db: Session, updated_comment: Comment) -> Optional[Comment]:
         db_comment = self.get_comment_by_id(db, updated_comment.id)
         if not db_comment:
             raise ValueError("Comment not found.")
         try:
             db.merge(updated_comment)
-            db.commit()
-            db.refresh(db_comment)
+            db.flush()
             return db_comment
         except Exception as e:
-            db.rollback()
             raise RuntimeError(f"Failed to update comment: {e}")
     
-    @retry_on_db_error()
     def delete_comment(self, db: Session, comment_id: int) -> None:
         db_comment = self.get_comment_by_id(db, comment_id)
         if not db_comment:
             raise ValueError("Comment not found.")
         try:
             db.delete(db_comment)
-            db.commit()
+            db.flush()
         except Exception as e:
-            db.rollback()
-            raise RuntimeError(f"Failed to delete comment: {e}")
\ No newline at end of file
+            raise RuntimeError(f"Failed to delete comment: {e}")
+
+
+class AsyncCommentRepository:
+    async def get_comments_by_post_id_with_upvote_count(self, db: AsyncSession, post_id: int) -> List[tuple]:
+        """Returns list of tuples (Comment, upvote_count)"""
+        result = await db.execute(
+            select(Comment, func.count(Upvote.id).label('upvote_count'))
+            .outerjoin(Upvote, Upvote.comment_id == Comment.id)
+            .where(Comment.post_id == post_id)
+            .group_by(Comment.id)
+            .order_by(Comment.created_at.desc())
+        )
+        return [tuple(row) for row in result.all()]
@@ -1,27 +1,35 @@
-from typing import Optional, List
+from typing import Dict, Optional, List, Set
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from models.post import Post
 from models.upvote import Upvote
 from models.comment import Comment
-from utils.retry import retry_on_db_error
+
+# Executed for every post in a listing; see _USER_BY_ID in user_repository.
+_COUNT_POST_LIKES = select(func.count(Upvote.id)).where(Upvote.post_id == bindparam("post_id"))
+_COUNT_POST_COMMENTS = select(func.count(Comment.id)).where(Comment.post_id == bindparam("post_id"))
+_USER_LIKE_ON_POST = (
+    select(Upvote.id)
+    .where(Upvote.post_id == bindparam("post_id"), Upvote.user_id == bindparam("user_id"))
+    .limit(1)
+)
+
+
 class PostRepository():
 
-    @retry_on_db_error()
     def create_post(self, post: Post, db: Session) -> Post:
         try: 
             db.add(post)
-            db.commit()
-            db.refresh(post)
+            db.flush()
             return post
         except Exception as e:
-            db.rollback()
             raise RuntimeError(f"An error occurred: {e}")
 
-    @retry_on_db_error()
     def get_post_by_id(self, post_id: int, db: Session) -> Optional[Post]:
-        return db.query(Post).filter(Post.id == post_id).first()
+        # Served from the identity map when the request already loaded the post.
+        return db.get(Post, post_id)
 
-    @retry_on_db_error()
     def get_recent_posts(self, db: Session, limit: int = 10, page: int = 1) -> List[Post]:
         offset = (page - 1) * limit
         return (
@@ -32,7 +40,6 @@ class PostRepository():
             .all()
         )
     
-    @retry_on_db_error()
     def get_post_by_category(self, db: Session, category: str, limit: int = 10, page: int = 1) -> List[Post]:
         offset = (page - 1) * limit
         return (
@@ -44,49 +51,79 @@ class PostRepository():
             .all()
         )
     
-    @retry_on_db_error()
     def update_post(self, updated_post: Post, db: Session) -> Optional[Post]:
         db_post = self.get_post_by_id(updated_post.id, db)
         if not db_post:
             raise ValueError("Post not found.")
         try:
             db.merge(updated_post)
-            db.commit()
-            db.refresh(db_post)
+            db.flush()
             return db_post
         except Exception as e:
-            db.rollback()
             raise RuntimeError(f"Failed to update post: {e}")
         
-    @retry_on_db_error()
     def delete_post(self, post_id: int, db: Session) -> None:
         db_post = self.get_post_by_id(post_id, db)
         if not db_post:
             raise ValueError("Post not found.")
         try:
             db.delete(db_post)
-            db.commit()
+            db.flush()
         except Exception as e:
-            db.rollback()
             raise RuntimeError(f"Failed to delete post: {e}")
     
-    @retry_on_db_error()
     def get_user_posts(self, user_id: int, db: Session) -> List[Post]:
         return db.query(Post).filter(Post.author_id == user_id).all()
     
-    @retry_on_db_error()
     def count_post_likes(self, post_id: int, db: Session) -> int:
-        return db.query(Upvote).filter(Upvote.post_id == post_id).count()
+        return db.scalar(_COUNT_POST_LIKES, {"post_id": post_id})
     
-    @retry_on_db_error()
     def count_post_comments(self, post_id: int, db: Session) -> int:
-        return db.query(Comment).filter(Comment.post_id == post_id).count()
+        return db.scalar(_COUNT_POST_COMMENTS, {"post_id": post_id})
     
-    @retry_on_db_error()
     def user_has_liked_post(self, db: Session, post_id: int, user_id: int) -> bool:
-        return (
-            db.query(Upvote)
-            .filter(Upvote.post_id == post_id, Upvote.user_id == user_id)
-            .first()
-            is not None
+        return db.scalar(_USER_LIKE_ON_POST, {"post_id": post_id, "user_id": user_id}) is not None
+
+
+class AsyncPostRepository:
+    """Read paths of PostRepository for async routes; counts come back per page, not per post."""
+
+    async def get_recent_posts(self, db: AsyncSession, limit: int = 10, page: int = 1) -> List[Post]:
+        offset = (page - 1) * limit
+        result = await db.execute(
+            select(Post).order_by(Post.created_at.desc()).offset(offset).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_post_by_category(self, db: AsyncSession, category: str, limit: int = 10, page: int = 1) -> List[Post]:
+        offset = (page - 1) * limit
+        result = await db.execute(
+            select(Post)
+            .where(Post.category == category)
+            .order_by(Post.created_at.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def count_post_likes(self, db: AsyncSession, post_ids: List[int]) -> Dict[int, int]:
+        result = await db.execute(
+            select(Upvote.post_id, func.count(Upvote.id))
+            .where(Upvote.post_id.in_(post_ids))
+            .group_by(Upvote.post_id)
+        )
+        return dict(result.all())
+
+    async def count_post_comments(self, db: AsyncSession, post_ids: List[int]) -> Dict[int, int]:
+        result = await db.execute(
+            select(Comment.post_id, func.count(Comment.id))
+            .where(Comment.post_id.in_(post_ids))
+            .group_by(Comment.post_id)
+        )
+        return dict(result.all())
+
+    async def posts_liked_by_user(self, db: AsyncSession, post_ids: List[int], user_id: int) -> Set[int]:
+        result = await db.execute(
+            select(Upvote.post_id).where(Upvote.post_id.in_(post_ids), Upvote.user_id == user_id)
         )
+        return set(result.scalars().all())
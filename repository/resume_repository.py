@@ -2,36 +2,28 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, OperationalError
 from models.resume import Resume, ResumeStatus
-from utils.retry import retry_on_db_error
 
 
 class ResumeRepository():
-    @retry_on_db_error()
     def add_resume(self, db: Session, resume: Resume) -> Resume:
         try:
             db.add(resume)
-            db.commit()
-            db.refresh(resume)
+            db.flush()
             return resume
         except IntegrityError:
-            db.rollback()
             raise ValueError("Resume could not be created due to data constraint violations.")
         except OperationalError as e:
-            db.rollback()
             raise ConnectionError("Database connection error: " + str(e))
         except Exception as e:
-            db.rollback()
             raise RuntimeError(f"An error occurred: {e}")
         
-    @retry_on_db_error()
     def get_resume_by_id(self, db: Session, resume_id: int) -> Optional[Resume]:
-        return db.query(Resume).filter(Resume.id == resume_id).first()
+        # Served from the identity map when the request already loaded the resume.
+        return db.get(Resume, resume_id)
     
-    @retry_on_db_error()
     def get_resumes_by_user_id(self, db: Session, user_id: int) -> List[Resume]:
         return db.query(Resume).filter(Resume.user_id == user_id).order_by(Resume.uploaded_at.desc()).all()
     
-    @retry_on_db_error()
     def get_user_resume_by_status(self, db: Session, user_id: int, statuses: List[ResumeStatus]) -> Optional[Resume]:
         
         return (
@@ -41,7 +33,6 @@ class ResumeRepository():
         )
 
     
-    @retry_on_db_error()
     def get_resumes_by_status(self, db: Session, status: ResumeStatus, limit: int = 10, page: int = 1) -> List[Resume]:
         offset = (page - 1) * limit
         return (
@@ -52,7 +43,6 @@ class ResumeRepository():
             .limit(limit)
             .all()
         )
-    @retry_on_db_error()
     def update_resume_status(self, db: Session, resume_id: int, status: ResumeStatus) -> Optional[Resume]:
         
         resume = self.get_resume_by_id(db, resume_id)
@@ -61,28 +51,21 @@ class ResumeRepository():
         
         try:
             resume.status = status
-            db.commit()
-            db.refresh(resume)
+            db.flush()
             return resume
         except Exception as e:
-            db.rollback()
             raise RuntimeError(f"An error occurred while updating resume status: {e}")
     
-    @retry_on_db_error()
     def update_resume(self, db: Session, resume: Resume) -> Optional[Resume]:
         try:
-            db.merge(resume)
-            db.commit()
-            db.refresh(resume)
+            resume = db.merge(resume)
+            db.flush()
             return resume
         except IntegrityError:
-            db.rollback()
             raise ValueError("Resume could not be updated due to data constraint violations")
         except Exception as e:
-            db.rollback()
             raise RuntimeError(f"An error occurred: {e}")
         
-    @retry_on_db_error()
     def delete_resume(self, db: Session, resume_id: int) -> None:
         resume = self.get_resume_by_id(db, resume_id)
         if not resume:
@@ -90,14 +73,11 @@ class ResumeRepository():
         
         try:
             db.delete(resume)
-            db.commit()
+            db.flush()
         except IntegrityError:
-            db.rollback()
             raise ValueError("Cannot delete resume due to integrity constraints.")
         except Exception as e:
-            db.rollback()
             raise RuntimeError(f"An error occurred: {e}")
         
-    @retry_on_db_error()
     def count_resumes_by_status(self, db: Session, status: ResumeStatus) -> int:
         return db.query(Resume).filter(Resume.status == status).count()
\ No newline at end of file
@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+from typing import List
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from models.revoked_token import RevokedToken
+
+
+class RevokedTokenRepository:
+    def add_revoked_token(
+        self, db: Session, jti: str, user_id: int, expires_at: datetime
+    ) -> RevokedToken:
+        """Stages the revocation; the caller commits it together with the session delete."""
+        revoked_token = RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at)
+        db.merge(revoked_token)
+        return revoked_token
+
+    def add_revoked_tokens(self, db: Session, revocations: List[dict]) -> None:
+        """Stages many revocations (jti, user_id, expires_at) in one INSERT; the caller commits."""
+        db.execute(
+            insert(RevokedToken).values(revocations).on_conflict_do_nothing(index_elements=["jti"])
+        )
+
+    def revoke_once(self, db: Session, jti: str, user_id: int, expires_at: datetime) -> bool:
+        """
+        Stages the revocation of a single-use token and returns False if it was already
+        revoked. A concurrent first use holds the row until it commits, so only one wins.
+        """
+        result = db.execute(
+            insert(RevokedToken)
+            .values(jti=jti, user_id=user_id, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=["jti"])
+        )
+        return result.rowcount == 1
+
+    def get_active_revocations(self, db: Session) -> List[RevokedToken]:
+        return (
+            db.query(RevokedToken)
+            .filter(RevokedToken.expires_at > datetime.now(timezone.utc))
+            .all()
+        )
+
+    def delete_expired_revocations(self, db: Session, batch_size: int) -> int:
+        """Revocations past the token's exp are redundant: the signature check already rejects it."""
+        expired_jtis = (
+            select(RevokedToken.jti)
+            .where(RevokedToken.expires_at <= datetime.now(timezone.utc))
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = db.execute(
+            delete(RevokedToken)
+            .where(RevokedToken.jti.in_(expired_jtis))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
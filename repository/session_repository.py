@@ -1,68 +1,138 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, timedelta, timezone
 
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, OperationalError
 
-from models.session import Session as SessionModel
-from utils.retry import retry_on_db_error
+from core.database import after_commit
+from core.session_cache import session_cache
+from core.token_denylist import token_denylist
+from repository.revoked_token_repository import RevokedTokenRepository
+from repository.session_store import SessionRecord, SessionStore, get_session_store
+from repository.user_repository import UserRepository
+from utils.func_utils import decode_session_jwt
 
 SESSION_DURATION_HOURS = 24 * 7
 
 
 class SessionRepository:
-    @retry_on_db_error()
-    def create_session(self, db: Session, user_id: int, token: str) -> SessionModel:
-        expires_at = datetime.now(timezone.utc) + timedelta(hours=SESSION_DURATION_HOURS)
+    """Session lifecycle on top of the configured SessionStore; revocations always live in the database."""
+
+    @property
+    def store(self) -> SessionStore:
+        return get_session_store()
 
-        new_session = SessionModel(
-            user_id=user_id,
-            session_token=token,
-            expires_at=expires_at,
-        )
+    def create_session(self, db: Session, user_id: int, token: str) -> SessionRecord:
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=SESSION_DURATION_HOURS)
 
         try:
-            db.add(new_session)
-            db.commit()
-            db.refresh(new_session)
-            return new_session
+            session = self.store.create(db, user_id, token, expires_at)
+            db.flush()
+            return session
         except IntegrityError:
-            db.rollback()
             raise ValueError("Failed to create session due to integrity constraint.")
+        except ValueError:
+            raise
         except OperationalError as e:
-            db.rollback()
             raise ConnectionError(f"Database connection error: {e}")
         except Exception as e:
-            db.rollback()
             raise RuntimeError(f"An unexpected error occurred while creating session: {e}")
 
-    @retry_on_db_error()
-    def get_by_token(self, db: Session, token: str) -> Optional[SessionModel]:
-        return db.query(SessionModel).filter(
-            SessionModel.session_token == token,
-            SessionModel.expires_at > datetime.now(timezone.utc)
-        ).first()
+    def get_by_token(self, db: Session, token: str) -> Optional[SessionRecord]:
+        return self.store.get(db, token)
 
-    @retry_on_db_error()
-    def deactivate_session(self, db: Session, token: str) -> None:
-        session = db.query(SessionModel).filter(SessionModel.session_token == token).first()
-        if not session:
-            raise ValueError("Session not found.")
+    def get_with_user_by_token(self, db: Session, token: str) -> Optional[SessionRecord]:
+        """Loads an unexpired session and its user; one joined SELECT with the SQL store."""
+        session = self.store.get(db, token)
+        if session and session.user is None:
+            session.user = UserRepository().get_user_by_id(db, session.user_id)
+            if session.user is None:
+                return None
+        return session
 
+    def deactivate_session(self, db: Session, token: str) -> None:
+        session_cache.invalidate_token(token)
+        claims = decode_session_jwt(token)
+        revoked_jti = claims.get("jti") if claims else None
+        token_expires_at = datetime.fromtimestamp(claims["exp"], tz=timezone.utc) if revoked_jti else None
         try:
-            db.delete(session)
-            db.commit()
+            session = self.store.delete(db, token)
+            if session and revoked_jti:
+                # Record the revocation so locally verified JWTs are rejected on every worker.
+                RevokedTokenRepository().add_revoked_token(
+                    db, jti=revoked_jti, user_id=session.user_id, expires_at=token_expires_at
+                )
+            db.flush()
         except IntegrityError:
-            db.rollback()
             raise ValueError("Unable to deactivate session due to integrity constraint.")
         except OperationalError as e:
-            db.rollback()
             raise ConnectionError(f"Database connection error: {e}")
         except Exception as e:
-            db.rollback()
             raise RuntimeError(f"An unexpected error occurred while deactivating session: {e}")
 
-    @retry_on_db_error()
+        if not session:
+            raise ValueError("Session not found.")
+        if revoked_jti:
+            after_commit(db, lambda: token_denylist.add(revoked_jti, token_expires_at))
+
+    def revoke_all_for_user(
+        self, db: Session, user_id: int, keep_token: Optional[str] = None
+    ) -> int:
+        """
+        Deletes every session of the user, except keep_token when given, in one statement
+        and stages revocations for their JWTs in the caller's transaction. Workers learn
+        about the revocations once it commits.
+        """
+        try:
+            tokens = self.store.delete_all_for_user(db, user_id, keep_token=keep_token)
+            revocations = []
+            for token in tokens:
+                claims = decode_session_jwt(token)
+                if claims and claims.get("jti"):
+                    revocations.append({
+                        "jti": claims["jti"],
+                        "user_id": user_id,
+                        "expires_at": datetime.fromtimestamp(claims["exp"], tz=timezone.utc),
+                    })
+            if revocations:
+                RevokedTokenRepository().add_revoked_tokens(db, revocations)
+        except OperationalError as e:
+            raise ConnectionError(f"Database connection error: {e}")
+        except Exception as e:
+            raise RuntimeError(f"An unexpected error occurred while revoking sessions: {e}")
+
+        # Memory and Redis stores have already dropped the sessions; drop cached copies now,
+        # and again after commit in case a concurrent request cached one from the database.
+        session_cache.invalidate_user(user_id)
+
+        def on_commit() -> None:
+            session_cache.invalidate_user(user_id)
+            for revocation in revocations:
+                token_denylist.add(revocation["jti"], revocation["expires_at"])
+
+        after_commit(db, on_commit)
+        return len(tokens)
+
+    def delete_expired_sessions(self, db: Session, batch_size: int) -> int:
+        """
+        Deletes at most batch_size expired sessions and returns how many were removed. The
+        caller commits each batch.
+        """
+        try:
+            return self.store.delete_expired(db, batch_size)
+        except OperationalError as e:
+            raise ConnectionError(f"Database connection error: {e}")
+
+    def extend_sessions(self, db: Session, tokens: List[str], expires_at: datetime) -> int:
+        """
+        Moves expires_at forward for the given live sessions in one write. Sessions that
+        already expired stay expired, and a later expiry is never pulled back.
+        """
+        try:
+            return self.store.extend(db, tokens, expires_at)
+        except OperationalError as e:
+            raise ConnectionError(f"Database connection error: {e}")
+
     def is_session_valid(self, db: Session, token: str) -> bool:
         """Helper method to check if a session is active and not expired."""
         session = self.get_by_token(db, token)
@@ -0,0 +1,311 @@
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.orm import Session, contains_eager
+
+from core.settings import settings
+from models.session import Session as SessionModel
+from models.user import User
+
+
+@dataclass
+class SessionRecord:
+    user_id: int
+    expires_at: datetime
+    user: Optional[User] = None
+
+
+# Session and user in a single joined SELECT, built once: it runs on every authenticated request.
+_LIVE_SESSION_WITH_USER = (
+    select(SessionModel)
+    .join(SessionModel.user)
+    .options(contains_eager(SessionModel.user))
+    .where(SessionModel.session_token == bindparam("token"), SessionModel.expires_at > bindparam("now"))
+    .limit(1)
+)
+
+
+class SessionStore(ABC):
+    """
+    Where session tokens live. Every method takes the caller's SQLAlchemy session; only the
+    SQL backend uses it, so its writes join the caller's transaction and commit with it.
+    The other backends apply writes immediately.
+    """
+
+    @abstractmethod
+    def create(self, db: Session, user_id: int, token: str, expires_at: datetime) -> SessionRecord:
+        ...
+
+    @abstractmethod
+    def get(self, db: Session, token: str) -> Optional[SessionRecord]:
+        """The unexpired session for token, or None."""
+
+    @abstractmethod
+    def delete(self, db: Session, token: str) -> Optional[SessionRecord]:
+        ...
+
+    @abstractmethod
+    def delete_all_for_user(self, db: Session, user_id: int, keep_token: Optional[str] = None) -> List[str]:
+        """Removes the user's sessions except keep_token and returns the removed tokens."""
+
+    @abstractmethod
+    def extend(self, db: Session, tokens: List[str], expires_at: datetime) -> int:
+        """Pushes live sessions forward to expires_at, never backwards; returns how many moved."""
+
+    @abstractmethod
+    def delete_expired(self, db: Session, batch_size: int) -> int:
+        ...
+
+
+class SqlSessionStore(SessionStore):
+    """The sessions table in the primary database."""
+
+    def create(self, db: Session, user_id: int, token: str, expires_at: datetime) -> SessionRecord:
+        db.add(SessionModel(user_id=user_id, session_token=token, expires_at=expires_at))
+        return SessionRecord(user_id=user_id, expires_at=expires_at)
+
+    def get(self, db: Session, token: str) -> Optional[SessionRecord]:
+        session = db.scalars(
+            _LIVE_SESSION_WITH_USER, {"token": token, "now": datetime.now(timezone.utc)}
+        ).first()
+        if not session:
+            return None
+        return SessionRecord(user_id=session.user_id, expires_at=session.expires_at, user=session.user)
+
+    def delete(self, db: Session, token: str) -> Optional[SessionRecord]:
+        row = db.execute(
+            delete(SessionModel)
+            .where(SessionModel.session_token == token)
+            .returning(SessionModel.user_id, SessionModel.expires_at)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if not row:
+            return None
+        return SessionRecord(user_id=row.user_id, expires_at=row.expires_at)
+
+    def delete_all_for_user(self, db: Session, user_id: int, keep_token: Optional[str] = None) -> List[str]:
+        statement = delete(SessionModel).where(SessionModel.user_id == user_id)
+        if keep_token:
+            statement = statement.where(SessionModel.session_token != keep_token)
+        statement = statement.returning(SessionModel.session_token).execution_options(
+            synchronize_session=False
+        )
+        return list(db.execute(statement).scalars().all())
+
+    def extend(self, db: Session, tokens: List[str], expires_at: datetime) -> int:
+        result = db.execute(
+            update(SessionModel)
+            .where(
+                SessionModel.session_token.in_(tokens),
+                SessionModel.expires_at > datetime.now(timezone.utc),
+                SessionModel.expires_at < expires_at,
+            )
+            .values(expires_at=expires_at)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    def delete_expired(self, db: Session, batch_size: int) -> int:
+        expired_ids = (
+            select(SessionModel.id)
+            .where(SessionModel.expires_at <= datetime.now(timezone.utc))
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = db.execute(
+            delete(SessionModel)
+            .where(SessionModel.id.in_(expired_ids))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+
+class MemorySessionStore(SessionStore):
+    """Process-local sessions for single-node deployments; everything is lost on restart."""
+
+    def __init__(self):
+        self._sessions: Dict[str, Tuple[int, datetime]] = {}
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, db: Session, user_id: int, token: str, expires_at: datetime) -> SessionRecord:
+        with self._lock:
+            if token in self._sessions:
+                raise ValueError("Failed to create session due to integrity constraint.")
+            self._sessions[token] = (user_id, expires_at)
+            self._tokens_by_user.setdefault(user_id, set()).add(token)
+        return SessionRecord(user_id=user_id, expires_at=expires_at)
+
+    def get(self, db: Session, token: str) -> Optional[SessionRecord]:
+        entry = self._sessions.get(token)
+        if entry is None or entry[1] <= datetime.now(timezone.utc):
+            return None
+        return SessionRecord(user_id=entry[0], expires_at=entry[1])
+
+    def delete(self, db: Session, token: str) -> Optional[SessionRecord]:
+        with self._lock:
+            entry = self._remove(token)
+        return SessionRecord(user_id=entry[0], expires_at=entry[1]) if entry else None
+
+    def delete_all_for_user(self, db: Session, user_id: int, keep_token: Optional[str] = None) -> List[str]:
+        with self._lock:
+            tokens = [token for token in self._tokens_by_user.get(user_id, ()) if token != keep_token]
+            for token in tokens:
+                self._remove(token)
+        return tokens
+
+    def extend(self, db: Session, tokens: List[str], expires_at: datetime) -> int:
+        now = datetime.now(timezone.utc)
+        extended = 0
+        with self._lock:
+            for token in tokens:
+                entry = self._sessions.get(token)
+                if entry and now < entry[1] < expires_at:
+                    self._sessions[token] = (entry[0], expires_at)
+                    extended += 1
+        return extended
+
+    def delete_expired(self, db: Session, batch_size: int) -> int:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            expired = [token for token, (_, expires_at) in self._sessions.items() if expires_at <= now]
+            for token in expired[:batch_size]:
+                self._remove(token)
+        return min(len(expired), batch_size)
+
+    def _remove(self, token: str) -> Optional[Tuple[int, datetime]]:
+        entry = self._sessions.pop(token, None)
+        if entry:
+            tokens = self._tokens_by_user.get(entry[0])
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._tokens_by_user[entry[0]]
+        return entry
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Sessions in Redis (or anything speaking its protocol). Each token is a key holding
+    "user_id:expires_at" that Redis expires on its own; a per-user set of tokens backs
+    revoke-all.
+    """
+
+    def __init__(self, client, prefix: str = "session:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisSessionStore":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("SESSION_STORE=redis requires the redis package") from e
+        return cls(redis.Redis.from_url(url, decode_responses=True))
+
+    def create(self, db: Session, user_id: int, token: str, expires_at: datetime) -> SessionRecord:
+        expires_ts = int(expires_at.timestamp())
+        pipe = self.client.pipeline()
+        pipe.set(self._token_key(token), self._encode(user_id, expires_at), exat=expires_ts, nx=True)
+        pipe.sadd(self._user_key(user_id), token)
+        # Sessions are always created and extended to now + duration, so the newest expiry is the latest.
+        pipe.expireat(self._user_key(user_id), expires_ts)
+        created, _, _ = pipe.execute()
+        if not created:
+            raise ValueError("Failed to create session due to integrity constraint.")
+        return SessionRecord(user_id=user_id, expires_at=expires_at)
+
+    def get(self, db: Session, token: str) -> Optional[SessionRecord]:
+        return self._decode(self.client.get(self._token_key(token)))
+
+    def delete(self, db: Session, token: str) -> Optional[SessionRecord]:
+        record = self._decode(self.client.getdel(self._token_key(token)))
+        if record:
+            self.client.srem(self._user_key(record.user_id), token)
+        return record
+
+    def delete_all_for_user(self, db: Session, user_id: int, keep_token: Optional[str] = None) -> List[str]:
+        tokens = [token for token in self.client.smembers(self._user_key(user_id)) if token != keep_token]
+        if not tokens:
+            return []
+        pipe = self.client.pipeline()
+        for token in tokens:
+            pipe.delete(self._token_key(token))
+        pipe.srem(self._user_key(user_id), *tokens)
+        deleted = pipe.execute()[:-1]
+        return [token for token, existed in zip(tokens, deleted) if existed]
+
+    def extend(self, db: Session, tokens: List[str], expires_at: datetime) -> int:
+        if not tokens:
+            return 0
+        now = datetime.now(timezone.utc)
+        current = self.client.mget([self._token_key(token) for token in tokens])
+        expires_ts = int(expires_at.timestamp())
+        pipe = self.client.pipeline()
+        extended = 0
+        for token, value in zip(tokens, current):
+            record = self._decode(value)
+            if record and now < record.expires_at < expires_at:
+                pipe.set(self._token_key(token), self._encode(record.user_id, expires_at), exat=expires_ts, xx=True)
+                pipe.expireat(self._user_key(record.user_id), expires_ts)
+                extended += 1
+        if extended:
+            pipe.execute()
+        return extended
+
+    def delete_expired(self, db: Session, batch_size: int) -> int:
+        # Redis expires session keys itself.
+        return 0
+
+    def _token_key(self, token: str) -> str:
+        return f"{self.prefix}{token}"
+
+    def _user_key(self, user_id: int) -> str:
+        return f"{self.prefix}user:{user_id}"
+
+    @staticmethod
+    def _encode(user_id: int, expires_at: datetime) -> str:
+        return f"{user_id}:{expires_at.timestamp()}"
+
+    @staticmethod
+    def _decode(value: Optional[str]) -> Optional[SessionRecord]:
+        if not value:
+            return None
+        user_id, expires_ts = value.split(":")
+        expires_at = datetime.fromtimestamp(float(expires_ts), tz=timezone.utc)
+        if expires_at <= datetime.now(timezone.utc):
+            return None
+        return SessionRecord(user_id=int(user_id), expires_at=expires_at)
+
+
+def create_session_store(backend: str, url: Optional[str] = None) -> SessionStore:
+    if backend == "database":
+        return SqlSessionStore()
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "redis":
+        if not url:
+            raise ValueError("SESSION_STORE=redis requires SESSION_STORE_URL")
+        return RedisSessionStore.from_url(url)
+    raise ValueError(f"Unknown session store {backend!r}, expected database, memory or redis")
+
+
+_session_store: Optional[SessionStore] = None
+
+
+def get_session_store() -> SessionStore:
+    global _session_store
+    if _session_store is None:
+        _session_store = create_session_store(settings.SESSION_STORE, settings.SESSION_STORE_URL)
+    return _session_store
+
+
+def set_session_store(store: Optional[SessionStore]) -> None:
+    """Replaces the process-wide store; None rebuilds it from settings on next use."""
+    global _session_store
+    _session_store = store
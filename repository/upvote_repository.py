@@ -1,57 +1,48 @@
 from typing import Optional
+from sqlalchemy import bindparam, func, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from models.upvote import Upvote
-from utils.retry import retry_on_db_error
+
+_UPVOTE_BY_USER_AND_POST = (
+    select(Upvote).where(Upvote.user_id == bindparam("user_id"), Upvote.post_id == bindparam("post_id")).limit(1)
+)
+_UPVOTE_BY_USER_AND_COMMENT = (
+    select(Upvote).where(Upvote.user_id == bindparam("user_id"), Upvote.comment_id == bindparam("comment_id")).limit(1)
+)
+_COUNT_POST_UPVOTES = select(func.count(Upvote.id)).where(Upvote.post_id == bindparam("post_id"))
+_COUNT_COMMENT_UPVOTES = select(func.count(Upvote.id)).where(Upvote.comment_id == bindparam("comment_id"))
 
 class UpvoteRepository:
 
-    @retry_on_db_error()
     def create_upvote(self,db: Session, upvote: Upvote) -> Upvote:
         try:
             db.add(upvote)
-            db.commit()
-            db.refresh(upvote)
+            db.flush()
             return upvote
         except IntegrityError:
-            db.rollback()
             raise ValueError("You have already upvoted this item")
         except Exception as e:
-            db.rollback()
             raise RuntimeError(f"An error occurred: {e}")
 
-    @retry_on_db_error()
     def get_upvote_by_user_and_post(self, user_id: int, post_id: int, db: Session) -> Optional[Upvote]:
-        return (
-            db.query(Upvote)
-            .filter(Upvote.user_id == user_id, Upvote.post_id == post_id)
-            .first()
-        )
+        return db.scalars(_UPVOTE_BY_USER_AND_POST, {"user_id": user_id, "post_id": post_id}).first()
 
-    @retry_on_db_error()
     def get_upvote_by_user_and_comment(self, user_id: int, comment_id: int, db: Session) -> Optional[Upvote]:
-        return (
-            db.query(Upvote)
-            .filter(Upvote.user_id == user_id, Upvote.comment_id == comment_id)
-            .first()
-        )
+        return db.scalars(_UPVOTE_BY_USER_AND_COMMENT, {"user_id": user_id, "comment_id": comment_id}).first()
 
-    @retry_on_db_error()
     def delete_upvote(self, upvote_id: int, db: Session) -> None:
-        upvote = db.query(Upvote).filter(Upvote.id == upvote_id).first()
+        upvote = db.get(Upvote, upvote_id)
         if not upvote:
             raise ValueError("Upvote not found.")
         try:
             db.delete(upvote)
-            db.commit()
+            db.flush()
         except Exception as e:
-            db.rollback()
             raise RuntimeError(f"Failed to delete upvote: {e}")
     
-    @retry_on_db_error()
     def get_post_upvote_count(self, post_id: int, db: Session) -> int:
-        return db.query(Upvote).filter(Upvote.post_id == post_id).count()
+        return db.scalar(_COUNT_POST_UPVOTES, {"post_id": post_id})
     
-    @retry_on_db_error()
     def get_comment_upvote_count(self, comment_id: int, db: Session) -> int:
-        return db.query(Upvote).filter(Upvote.comment_id == comment_id).count()
\ No newline at end of file
+        return db.scalar(_COUNT_COMMENT_UPVOTES, {"comment_id": comment_id})
\ No newline at end of file
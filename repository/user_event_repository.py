@@ -1,14 +1,14 @@
-from sqlalchemy import String
+from sqlalchemy import String, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from models.user_event import UserEvent
 from models.user import User
 from models.event import Event
-from utils.retry import retry_on_db_error
+from repository.bulk import upsert
 
 
 class UserEventRepository():
-    @retry_on_db_error()
     def add_user_to_event(self, db: Session, user_email: String, event_id: int) -> None:
         try:
             user = db.query(User).filter(User.email == user_email).first()
@@ -16,17 +16,19 @@ class UserEventRepository():
                 raise ValueError(f"User with email {user_email} does not exist.")
             user_event = UserEvent(user_id=user.id, event_id=event_id)
             db.add(user_event)
-            db.commit()
+            db.flush()
         except IntegrityError:
-            db.rollback()
             raise ValueError(
                 f"User with email {user_email} is already registered for event {event_id}."
             )
         except Exception as e:
-            db.rollback()
             raise RuntimeError(f"An error occurred while adding user to event: {e}")
 
-    @retry_on_db_error()
+    def add_users_to_event(self, db: Session, user_ids: list[int], event_id: int) -> int:
+        """Registers the users in one statement per chunk; returns how many were not registered yet."""
+        rows = [{"user_id": user_id, "event_id": event_id} for user_id in user_ids]
+        return upsert(db, UserEvent, rows, index_elements=["user_id", "event_id"])
+
     def remove_user_from_event(
         self, db: Session, user_email: String, event_id: int
     ) -> None:
@@ -41,22 +43,19 @@ class UserEventRepository():
             )
             if user_event:
                 db.delete(user_event)
-                db.commit()
+                db.flush()
             else:
                 raise ValueError(
                     f"User with email {user_email} is not registered for event {event_id}."
                 )
         except Exception as e:
-            db.rollback()
             raise RuntimeError(f"An error occurred while removing user from event: {e}")
 
-    @retry_on_db_error()
     def get_users_for_event(self, db: Session, event_id: int) -> list[User]:
         return (
             db.query(User).join(UserEvent).filter(UserEvent.event_id == event_id).order_by(User.id).all()
         )
 
-    @retry_on_db_error()
     def get_events_for_user(self, db: Session, user_email: String) -> list[Event]:
         user = db.query(User).filter(User.email == user_email).first()
         if not user:
@@ -65,7 +64,6 @@ class UserEventRepository():
             db.query(Event).join(UserEvent).filter(UserEvent.user_id == user.id).order_by(Event.start_time).all()
         )
 
-    @retry_on_db_error()
     def is_user_registered_for_event(
         self, db: Session, user_email: String, event_id: int
     ) -> bool:
@@ -78,3 +76,14 @@ class UserEventRepository():
             .count()
             > 0
         )
+
+
+class AsyncUserEventRepository():
+    async def get_events_for_user(self, db: AsyncSession, user_email: String) -> list[Event]:
+        user_id = (await db.execute(select(User.id).where(User.email == user_email))).scalar()
+        if user_id is None:
+            raise ValueError(f"User with email {user_email} does not exist.")
+        result = await db.execute(
+            select(Event).join(UserEvent).where(UserEvent.user_id == user_id).order_by(Event.start_time)
+        )
+        return list(result.scalars().all())
@@ -1,12 +1,13 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from models.user import User
 from models.user_journey import UserJourney
+from repository.bulk import bulk_insert
 from typing import Optional, List
 from datetime import datetime
-from utils.retry import retry_on_db_error
 
 class UserJourneyRepository:
 
-    @retry_on_db_error()
     def create_log(
         self,
         db: Session,
@@ -30,11 +31,20 @@ class UserJourneyRepository:
             user_agent=user_agent,
         )
         db.add(journey_log)
-        db.commit()
-        db.refresh(journey_log)
+        db.flush()
         return journey_log
 
-    @retry_on_db_error()
+    def create_logs(self, db: Session, rows: List[dict], skip_missing_users: bool = False) -> int:
+        """
+        Writes journey rows (create_log's arguments as dicts) in one INSERT per chunk. With
+        skip_missing_users, rows of users deleted since are dropped instead of failing the batch.
+        """
+        if skip_missing_users:
+            user_ids = {row["user_id"] for row in rows}
+            existing = set(db.scalars(select(User.id).where(User.id.in_(user_ids))))
+            rows = [row for row in rows if row["user_id"] in existing]
+        return bulk_insert(db, UserJourney, rows)
+
     def get_user_journey(
         self,
         db: Session,
@@ -51,7 +61,6 @@ class UserJourneyRepository:
             .all()
         )
 
-    @retry_on_db_error()
     def get_session_journey(
         self,
         db: Session,
@@ -64,7 +73,6 @@ class UserJourneyRepository:
             .all()
         )
 
-    @retry_on_db_error()
     def get_action_count(
         self,
         db: Session,
@@ -1,86 +1,77 @@
-from typing import Optional, List
+from typing import Dict, Optional, List
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, OperationalError
+from core.database import after_commit
+from core.session_cache import session_cache
 from models.user import User
-from utils.retry import retry_on_db_error
+
+# Hot lookups are built once at import and executed with bind parameters: rebuilding a
+# Query per call cost more Python time than the round trip to Postgres.
+_USER_BY_ID = select(User).where(User.id == bindparam("user_id")).limit(1)
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email")).limit(1)
 
 
 class UserRepository():
-    @retry_on_db_error()
     def add_user(self, db: Session, user: User) -> User:
         try:
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            db.flush()
             return user
         except IntegrityError:
-            db.rollback()
             raise ValueError(f"User with email {user.email} already exists.")
         except OperationalError as e:
-            db.rollback()
             raise ConnectionError("Database connection error: " + str(e))
         except Exception as e:
-            db.rollback()
             raise RuntimeError(f"An error occurred: {e}")
 
-    @retry_on_db_error()
     def get_user_by_id(self, db: Session, user_id: int) -> Optional[User]:
-        return db.query(User).filter(User.id == user_id).first()
+        return db.scalars(_USER_BY_ID, {"user_id": user_id}).first()
 
-    @retry_on_db_error()
     def get_user_by_email(self, db: Session, email: str) -> Optional[User]:
-        return db.query(User).filter(User.email == email).first()
+        return db.scalars(_USER_BY_EMAIL, {"email": email}).first()
 
-    @retry_on_db_error()
     def get_users(self, db: Session, active) -> List[User]:
         query = db.query(User)
         if active:
             query = query.filter(User.is_active)
         return query.order_by(User.id).all()
 
-    @retry_on_db_error()
     def update_user(self, db: Session, user: User) -> Optional[User]:
         try:
-            db.merge(user)
-            db.commit()
-            db.refresh(user)
+            user = db.merge(user)
+            db.flush()
+            user_id = user.id
+            after_commit(db, lambda: session_cache.invalidate_user(user_id))
             return user
         except IntegrityError:
-            db.rollback()
             raise ValueError(f"User with email {user.email} already exists.")
         except Exception as e:
-            db.rollback()
             raise RuntimeError(f"An error occurred: {e}")
 
-    @retry_on_db_error()
-    def delete_user(self, db: Session, user_id: int) -> None:
-        user = self.get_user_by_id(db, user_id)
-        if not user:
-            raise ValueError("User not found.")
-
+    def update_password_hash(self, db: Session, user_id: int, hashed_password: str) -> None:
         try:
-            db.delete(user)
-            db.commit()
-        except IntegrityError:
-            db.rollback()
-            raise ValueError("Unable to delete user due to integrity constraints.")
+            db.execute(update(User).where(User.id == user_id).values(password=hashed_password))
         except Exception as e:
-            db.rollback()
-            raise RuntimeError(f"An error occurred while deleting the user: {e}")
-    
-    @retry_on_db_error()
+            raise RuntimeError(f"An error occurred: {e}")
+
     def get_users_by_ids(self, db: Session, user_ids: List[int]) -> List[User]:
         if not user_ids:
             return []
         return db.query(User).filter(User.id.in_(user_ids)).order_by(User.id).all()
 
-    @retry_on_db_error()
     def get_users_by_emails(self, db: Session, emails: List[str]) -> List[User]:
         if not emails:
             return []
         return db.query(User).filter(User.email.in_(emails)).order_by(User.id).all()
 
-    @retry_on_db_error()
+    def get_ids_by_emails(self, db: Session, emails: List[str]) -> Dict[str, int]:
+        """Maps each known email to its user id without loading User objects."""
+        if not emails:
+            return {}
+        return dict(db.execute(select(User.email, User.id).where(User.email.in_(emails))).all())
+
     def get_all_mentees(self, db: Session, mentor_id: int) -> List[User]:
         user = self.get_user_by_id(db, mentor_id)
         if not user:
@@ -90,3 +81,11 @@ class UserRepository():
             return mentees if mentees else []
         except Exception as e:
             raise RuntimeError(f"An error occurred while retrieving mentees: {e}")
+
+
+class AsyncUserRepository:
+    async def get_users_by_ids(self, db: AsyncSession, user_ids: List[int]) -> List[User]:
+        if not user_ids:
+            return []
+        result = await db.execute(select(User).where(User.id.in_(user_ids)).order_by(User.id))
+        return list(result.scalars().all())
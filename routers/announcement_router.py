@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from core.database import get_db
+from core.database import get_async_db, get_db, RetryingRoute
 from schemas.announcement_schema import (
     AnnouncementCreate,
     AnnouncementUpdate,
@@ -10,7 +11,7 @@ from services.announcement_service import AnnouncementService
 from models.announcement import Announcement
 from core.logging_config import LOGGER
 
-router = APIRouter(tags=["Announcements"])
+router = APIRouter(tags=["Announcements"], route_class=RetryingRoute)
 
 
 @router.post(
@@ -19,7 +20,7 @@ router = APIRouter(tags=["Announcements"])
     response_model=AnnouncementResponse,
 )
 def create_announcement(
-    announcement: AnnouncementCreate, session: Session = Depends(get_db)
+    announcement: AnnouncementCreate, session: Session = Depends(get_db, scope="function")
 ) -> AnnouncementResponse:
     service = AnnouncementService()
     try:
@@ -38,12 +39,12 @@ def create_announcement(
     status_code=status.HTTP_200_OK,
     response_model=list[AnnouncementCreate],
 )
-def get_all_announcements(
-    session: Session = Depends(get_db),
+async def get_all_announcements(
+    session: AsyncSession = Depends(get_async_db, scope="function"),
 ) -> list[AnnouncementCreate]:
     service = AnnouncementService()
     try:
-        anns = service.get_all_announcements(session)
+        anns = await service.get_all_announcements_async(session)
         return anns
     except Exception as e:
         LOGGER.error(f"SERVER ERROR in get_all_announcements: {str(e)}")
@@ -56,7 +57,7 @@ def get_all_announcements(
     response_model=AnnouncementCreate,
 )
 def get_announcement_by_id(
-    announcement_id: int, session: Session = Depends(get_db)
+    announcement_id: int, session: Session = Depends(get_db, scope="function")
 ) -> Announcement:
     service = AnnouncementService()
     try:
@@ -80,7 +81,7 @@ def get_announcement_by_id(
 def update_announcement(
     announcement_id: int,
     announcement: AnnouncementUpdate,
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_db, scope="function"),
 ) -> AnnouncementUpdate:
     service = AnnouncementService()
     try:
@@ -104,7 +105,7 @@ def update_announcement(
     response_model=AnnouncementResponse,
 )
 def delete_announcement(
-    announcement_id: int, session: Session = Depends(get_db)
+    announcement_id: int, session: Session = Depends(get_db, scope="function")
 ) -> AnnouncementResponse:
     service = AnnouncementService()
     try:
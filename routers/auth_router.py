@@ -1,13 +1,16 @@
-from fastapi import APIRouter, status, Depends, HTTPException, Response
+from fastapi import APIRouter, status, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
-from core.database import get_db
+from core.database import get_db, RetryingRoute
 from schemas import user_schema
 from services.auth_service import AuthService
 from services.user_service import UserService
 from core.logging_config import LOGGER
-from utils.func_utils import decode_jwt
+from core.settings import settings
+from core.login_throttle import LoginThrottledError, client_address, login_throttle, retry_after_header
+from core.password_pool import PasswordPoolSaturatedError
+from utils.func_utils import PASSWORD_RESET_TOKEN, decode_jwt
 
-router = APIRouter(tags=["Authentication"])
+router = APIRouter(tags=["Authentication"], route_class=RetryingRoute)
 MAX_AGE = 86400 * 30 # 30 days
 @router.post(
     "/login",
@@ -15,11 +18,21 @@ MAX_AGE = 86400 * 30 # 30 days
     response_model=user_schema.UserLoginResponse,
 )
 def login(
-    user: user_schema.UserLogin, response: Response, session: Session = Depends(get_db)
+    user: user_schema.UserLogin,
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_db, scope="function"),
 ) -> user_schema.UserLoginResponse:
     service = AuthService()
     masked_email = user.email[:3] + "****"
+    client_ip = client_address(
+        request.headers.get("x-forwarded-for"),
+        request.client.host if request.client else None,
+        settings.LOGIN_TRUSTED_PROXY_HOPS,
+    )
     try:
+        # Throttled attempts never reach the user lookup or bcrypt.
+        login_throttle.check(user.email, client_ip)
         login_response = service.login(session, user.email.lower(), user.password)
         response.set_cookie(
             key="session_token",
@@ -30,6 +43,20 @@ def login(
             max_age=MAX_AGE
         )
         return login_response
+    except LoginThrottledError as e:
+        LOGGER.warning(f"Login for {masked_email} from {client_ip} throttled: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": retry_after_header(e.retry_after)},
+        )
+    except PasswordPoolSaturatedError as e:
+        LOGGER.warning(f"Login for {masked_email} rejected, password hashing saturated: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except ValueError as e:
         LOGGER.warning(f"Login failed for {masked_email}: {str(e)}")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
@@ -41,7 +68,7 @@ def login(
         )
 
 @router.post("/logout")
-def logout(response: Response, db: Session = Depends(get_db), session_token: str | None = None):
+def logout(response: Response, db: Session = Depends(get_db, scope="function"), session_token: str | None = None):
     service = AuthService()
     if not session_token:
         raise HTTPException(status_code=401, detail="No active session found")
@@ -56,18 +83,23 @@ def logout(response: Response, db: Session = Depends(get_db), session_token: str
     response_model=user_schema.UserUpdate,
 )
 def reset_password(
-    body: user_schema.PasswordReset, session: Session = Depends(get_db)
+    body: user_schema.PasswordReset, session: Session = Depends(get_db, scope="function")
 ) -> user_schema.UserUpdate:
     service = UserService()
     try:
         decoded:dict = decode_jwt(body.token)
         email = decoded.get("user_id")
-        if not email:
+        # Session tokens carry uid and live for days; only a reset link's token resets a password.
+        if not email or decoded.get("purpose") != PASSWORD_RESET_TOKEN or "uid" in decoded:
             raise ValueError("Invalid token")
-        user = service.get_user_by_email(session, email)
-        if not user:
-            raise ValueError("User not found")
-        return service.reset_password(session, user.id, body.new_password)
+        return service.reset_password_with_token(session, decoded, body.new_password)
+    except PasswordPoolSaturatedError as e:
+        LOGGER.warning(f"Password reset rejected, password hashing saturated: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except ValueError as e:
         LOGGER.error(f"Password reset failed: {str(e)}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
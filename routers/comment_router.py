@@ -1,22 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
 from schemas.comment_schema import CommentCreate, CommentUpdate, CommentResponse, CommentDeletedResponse
 from services.comment_service import CommentService
-from core.database import get_db
+from core.database import get_async_db, get_db, not_retried, RetryingRoute
 from core.logging_config import LOGGER
 from core.auth import get_current_user
 from models import User
 
-router = APIRouter( tags=["Comments"])
+router = APIRouter(tags=["Comments"], route_class=RetryingRoute)
+# Creating or updating a comment can upload its attachment to S3; those routes are not replayed.
 comment_service = CommentService()
 
 @router.post("/comments/", status_code=status.HTTP_201_CREATED, response_model=CommentResponse)
+@not_retried
 def create_comment(
     post_id: int,
     comment_data: CommentCreate,
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ) -> CommentResponse:
     comment = comment_service.add_comment(db = session, post_id = post_id, comment_data = comment_data, user_id = current_user.id)
@@ -25,16 +28,16 @@ def create_comment(
     return response
 
 @router.get("/post/{post_id}/comments", status_code=status.HTTP_200_OK, response_model=List[CommentResponse])
-def get_comments_by_post(
+async def get_comments_by_post(
     post_id: int,
-    session: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db, scope="function")
 ) -> List[CommentResponse]:
-    return comment_service.get_comments_by_post_id(db = session, post_id = post_id)
+    return await comment_service.get_comments_by_post_id_async(db = session, post_id = post_id)
 
 @router.get("/comments/{comment_id}", status_code=status.HTTP_200_OK, response_model=CommentResponse)
 def get_comment(
     comment_id: int,
-    session: Session = Depends(get_db)
+    session: Session = Depends(get_db, scope="function")
 ) -> CommentResponse:
     comment = comment_service.get_comment_by_id(db = session, comment_id = comment_id)
     if not comment:
@@ -44,10 +47,11 @@ def get_comment(
     return response
 
 @router.put("/comments/{comment_id}", status_code=status.HTTP_200_OK, response_model=CommentResponse)
+@not_retried
 def update_comment(
     comment_id: int,
     comment_data: CommentUpdate,
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ) -> CommentResponse:
     try:
@@ -65,7 +69,7 @@ def update_comment(
 @router.delete("/comments/{comment_id}", status_code=status.HTTP_200_OK, response_model=CommentDeletedResponse)
 def delete_comment(
     comment_id: int,
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ) -> CommentDeletedResponse:
     try:
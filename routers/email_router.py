@@ -2,10 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from pydantic import BaseModel, EmailStr
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from core.database import get_db
+from core.database import get_db, get_read_db
 from services.email_service import EmailService
 from core.logging_config import LOGGER
+from core.query_limits import query_profile
 
+# Not a RetryingRoute: replaying a request could send the same mail twice.
 router = APIRouter(prefix="/emails", tags=["Emails"])
 
 class UserEmailRequest(BaseModel):
@@ -25,11 +27,12 @@ class EmailRequest(BaseModel):
 class ResetPasswordRequest(BaseModel):
     email: EmailStr
 
-@router.post("/send_to_users")
+@router.post("/send_to_users", dependencies=[Depends(query_profile("export"))])
 def send_emails_to_users(
     payload: UserEmailRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    # Request scope: the background task keeps using this session after the response is built.
+    db: Session = Depends(get_read_db),
 ):
     if not payload.user_ids:
         raise HTTPException(status_code=400, detail="user_ids cannot be empty.")
@@ -65,7 +68,7 @@ def send_email(
 @router.post("/reset-password")
 def request_password_reset(
     payload: ResetPasswordRequest,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
 ):
     if not payload.email:
         raise HTTPException(status_code=400, detail="Email is required.")
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional
 from schemas.event_schema import (
     EventBase,
+    EventBatchRegistration,
+    EventBatchRegistrationResponse,
     EventCreate,
     EventRegistration,
     EventResponse,
@@ -11,17 +14,18 @@ from schemas.event_schema import (
 )
 from schemas.user_schema import UserGetResponse
 from services.event_service import EventService
-from core.database import get_db
+from core.database import get_async_db, get_db, RetryingRoute
 from core.logging_config import LOGGER
+from core.query_limits import query_profile
 
-router = APIRouter(tags=["Events"])
+router = APIRouter(tags=["Events"], route_class=RetryingRoute)
 
 
 @router.post(
     "/events/", status_code=status.HTTP_201_CREATED, response_model=EventResponse
 )
 def create_event(
-    event_data: EventCreate, db: Session = Depends(get_db)
+    event_data: EventCreate, db: Session = Depends(get_db, scope="function")
 ) -> EventResponse:
     event_service = EventService()
     try:
@@ -35,16 +39,16 @@ def create_event(
 @router.get(
     "/events/", status_code=status.HTTP_200_OK, response_model=List[EventResponse]
 )
-def get_all_events(
-    db: Session = Depends(get_db),
+async def get_all_events(
+    db: AsyncSession = Depends(get_async_db, scope="function"),
     user_email: Optional[str] = Query(None, description="Filter events by user email"),
 ) -> List[EventResponse]:
     event_service = EventService()
     try:
         if user_email:
-            events = event_service.get_user_events(db, user_email)
+            events = await event_service.get_user_events_async(db, user_email)
         else:
-            events = event_service.get_all_events(db)
+            events = await event_service.get_all_events_async(db)
         return events
     except Exception as e:
         LOGGER.error(f"SERVER ERROR in get_all_events: {str(e)}")
@@ -54,7 +58,7 @@ def get_all_events(
 @router.get(
     "/events/{event_id}", status_code=status.HTTP_200_OK, response_model=EventResponse
 )
-def get_event_by_id(event_id: int, db: Session = Depends(get_db)) -> EventResponse:
+def get_event_by_id(event_id: int, db: Session = Depends(get_db, scope="function")) -> EventResponse:
     event_service = EventService()
     try:
         event = event_service.get_event_by_id(db, event_id=event_id)
@@ -70,7 +74,7 @@ def get_event_by_id(event_id: int, db: Session = Depends(get_db)) -> EventRespon
     "/events/{event_id}", status_code=status.HTTP_200_OK, response_model=EventBase
 )
 def update_event(
-    event_id: int, event_data: EventUpdate, db: Session = Depends(get_db)
+    event_id: int, event_data: EventUpdate, db: Session = Depends(get_db, scope="function")
 ) -> EventBase:
     event_service = EventService()
     try:
@@ -85,7 +89,7 @@ def update_event(
 
 
 @router.delete("/events/{event_id}")
-def delete_event(event_id: int, db: Session = Depends(get_db)) -> Dict:
+def delete_event(event_id: int, db: Session = Depends(get_db, scope="function")) -> Dict:
     event_service = EventService()
     try:
         event_service.delete_event(db, event_id)
@@ -100,7 +104,7 @@ def delete_event(event_id: int, db: Session = Depends(get_db)) -> Dict:
 
 @router.post("/events/{event_id}/register")
 def register_user_for_event(
-    event_id: int, event_registration: EventRegistration, db: Session = Depends(get_db)
+    event_id: int, event_registration: EventRegistration, db: Session = Depends(get_db, scope="function")
 ) -> Dict:
     event_service = EventService()
     masked_email = event_registration.email[:3] + "****"
@@ -121,9 +125,29 @@ def register_user_for_event(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/events/{event_id}/register/batch", response_model=EventBatchRegistrationResponse)
+def register_users_for_event(
+    event_id: int, registration: EventBatchRegistration, db: Session = Depends(get_db, scope="function")
+) -> EventBatchRegistrationResponse:
+    event_service = EventService()
+    try:
+        result = event_service.register_users_for_event(db, registration, event_id)
+        LOGGER.info(
+            f"Batch registration for event_id={event_id}: {result.registered} registered, "
+            f"{result.already_registered} already registered, {len(result.unknown_emails)} unknown"
+        )
+        return result
+    except ValueError as e:
+        LOGGER.warning(f"Batch register failed: event_id={event_id}, error={str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        LOGGER.error(f"SERVER ERROR in register_users_for_event for event_id={event_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.post("/events/{event_id}/unregister")
 def unregister_user_from_event(
-    event_id: int, event_registration: EventRegistration, db: Session = Depends(get_db)
+    event_id: int, event_registration: EventRegistration, db: Session = Depends(get_db, scope="function")
 ) -> Dict:
     event_service = EventService()
     masked_email = event_registration.email[:3] + "****"
@@ -145,9 +169,9 @@ def unregister_user_from_event(
 
 
 # REMOVE THIS ENDPOINT LATER
-@router.get("/internal/events/", response_model=List[EventWithAttendees])
+@router.get("/internal/events/", response_model=List[EventWithAttendees], dependencies=[Depends(query_profile("export"))])
 def get_events_with_attendees(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
 ) -> List[EventWithAttendees]:
     event_service = EventService()
     try:
@@ -161,7 +185,7 @@ def get_events_with_attendees(
 # TODO: Use attendees instead of users
 @router.get("/events/{event_id}/users", response_model=List[UserGetResponse])
 def get_event_attendees(
-    event_id: int, db: Session = Depends(get_db)
+    event_id: int, db: Session = Depends(get_db, scope="function")
 ) -> List[UserGetResponse]:
     event_service = EventService()
     try:
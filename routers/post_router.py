@@ -1,30 +1,33 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from schemas.post_schema import PostCreate, PostUpdate, PostResponse, PostDeletedResponse
 from services.post_service import PostService
-from core.database import get_db
+from core.database import get_async_db, get_db, not_retried, RetryingRoute
 from core.logging_config import LOGGER
 from core.auth import get_current_user
 from models.user import User
 
 
-router = APIRouter(prefix="/posts", tags=["Posts"])
+router = APIRouter(prefix="/posts", tags=["Posts"], route_class=RetryingRoute)
+# Creating or updating a post can upload its attachment to S3; those routes are not replayed.
 post_service = PostService()
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=PostResponse)
-def create_post(post_data: PostCreate, session: Session = Depends(get_db), current_user: User = Depends(get_current_user)) -> PostResponse:
+@not_retried
+def create_post(post_data: PostCreate, session: Session = Depends(get_db, scope="function"), current_user: User = Depends(get_current_user)) -> PostResponse:
     return post_service.add_post(post_data=post_data, user_id=current_user.id, db=session)
 
 @router.get("/recent", status_code=status.HTTP_200_OK, response_model=List[PostResponse])
-def get_recent_posts(category: Optional[str] = Query(None, description="Filter by category"), page: int = Query(1, ge=1), limit: int = Query(10, ge=1, le=100), session: Session = Depends(get_db), current_user: User = Depends(get_current_user)) -> List[PostResponse]:
+async def get_recent_posts(category: Optional[str] = Query(None, description="Filter by category"), page: int = Query(1, ge=1), limit: int = Query(10, ge=1, le=100), session: AsyncSession = Depends(get_async_db, scope="function"), current_user: User = Depends(get_current_user)) -> List[PostResponse]:
     if category:
-        return post_service.get_recent_posts_by_category(category=category, user_id=current_user.id, db=session, limit=limit, page=page)
-    return post_service.get_recent_posts(user_id=current_user.id, db=session, limit=limit, page=page)
+        return await post_service.get_recent_posts_by_category_async(category=category, user_id=current_user.id, db=session, limit=limit, page=page)
+    return await post_service.get_recent_posts_async(user_id=current_user.id, db=session, limit=limit, page=page)
 
 @router.get("/{post_id}", status_code=status.HTTP_200_OK, response_model=PostResponse)
-def get_post(post_id: int, session: Session = Depends(get_db), current_user: User = Depends(get_current_user)) -> PostResponse:
+def get_post(post_id: int, session: Session = Depends(get_db, scope="function"), current_user: User = Depends(get_current_user)) -> PostResponse:
     post = post_service.get_post_by_id(post_id=post_id, user_id=current_user.id, db=session)
     if not post:
         LOGGER.error(f"Post not found: {post_id}")
@@ -32,7 +35,8 @@ def get_post(post_id: int, session: Session = Depends(get_db), current_user: Use
     return post
 
 @router.put("/{post_id}", status_code=status.HTTP_200_OK, response_model=PostResponse)
-def update_post(post_id: int, post_data: PostUpdate, session: Session = Depends(get_db), current_user: User = Depends(get_current_user)) -> PostResponse:
+@not_retried
+def update_post(post_id: int, post_data: PostUpdate, session: Session = Depends(get_db, scope="function"), current_user: User = Depends(get_current_user)) -> PostResponse:
     try:
         return post_service.update_post(post_id=post_id, user_id=current_user.id, updated_data=post_data, db=session)
     except ValueError as e:
@@ -43,7 +47,7 @@ def update_post(post_id: int, post_data: PostUpdate, session: Session = Depends(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
 @router.delete("/{post_id}", status_code=status.HTTP_200_OK, response_model=PostDeletedResponse)
-def delete_post(post_id: int, session: Session = Depends(get_db), current_user: User = Depends(get_current_user)) -> PostDeletedResponse:
+def delete_post(post_id: int, session: Session = Depends(get_db, scope="function"), current_user: User = Depends(get_current_user)) -> PostDeletedResponse:
     try:
         post_service.delete_post(post_id=post_id, user_id=current_user.id, db=session)
         return PostDeletedResponse(message=f"Post with ID {post_id} was successfully deleted")
@@ -55,5 +59,5 @@ def delete_post(post_id: int, session: Session = Depends(get_db), current_user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
 @router.get("/user/{user_id}", status_code=status.HTTP_200_OK, response_model=List[PostResponse])
-def get_user_posts(user_id: int, session: Session = Depends(get_db)) -> List[PostResponse]:
+def get_user_posts(user_id: int, session: Session = Depends(get_db, scope="function")) -> List[PostResponse]:
     return post_service.get_user_posts(user_id=user_id, db=session)
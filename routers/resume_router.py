@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from sqlalchemy.orm import Session
 from typing import List
-from core.database import get_db
+from core.database import get_db, RetryingRoute
 from services.resume_service import ResumeService
 from schemas.resume_schema import (
     ResumeResponse,
@@ -16,14 +16,14 @@ from schemas.resume_schema import (
 from models.resume import ResumeStatus
 from core.logging_config import LOGGER
 
-router = APIRouter(prefix="/resumes", tags=["Resumes"])
+router = APIRouter(prefix="/resumes", tags=["Resumes"], route_class=RetryingRoute)
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=ResumeUploadResponse)
 def upload_resume(
     user_id: int = Query(..., description="ID of the user uploading the resume"),
     file: UploadFile = File(..., description="Resume file (PDF only)"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ) -> ResumeUploadResponse:
     """Upload a new resume."""
     resume_service = ResumeService()
@@ -69,7 +69,7 @@ def upload_resume(
 @router.get("/can-upload", status_code=status.HTTP_200_OK)
 def can_upload_resume(
     user_id: int = Query(..., description="ID of the user"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Check if a user can upload a new resume."""
     resume_service = ResumeService()
@@ -97,7 +97,7 @@ def get_resumes_for_review(
     status_filter: ResumeStatus = Query(ResumeStatus.pending, alias="status", description="Status of resumes to retrieve"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Number of items per page"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ) -> ResumesForReviewListResponse:
     """Get resumes available for review (admin only)."""
     resume_service = ResumeService()
@@ -139,7 +139,7 @@ def get_resumes_for_review(
 @router.get("/me", status_code=status.HTTP_200_OK, response_model=List[ResumeResponse])
 def get_my_resumes(
     user_id: int = Query(..., description="ID of the user"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ) -> List[ResumeResponse]:
     """Get all resumes for the current user."""
     resume_service = ResumeService()
@@ -163,7 +163,7 @@ def get_my_resumes(
 def get_resume_by_id(
     resume_id: int,
     user_id: int = Query(..., description="ID of the requesting user"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ) -> ResumeWithReviews:
     """Get a specific resume with its reviews."""
     resume_service = ResumeService()
@@ -202,7 +202,7 @@ def submit_resume_review(
     resume_id: int,
     review_data: ResumeReviewCreate,
     reviewer_id: int = Query(..., description="ID of the reviewer"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Submit a review for a resume (admin only)."""
     resume_service = ResumeService()
@@ -239,7 +239,7 @@ def update_resume_status(
     resume_id: int,
     status_update: ResumeStatusUpdate,
     user_id: int = Query(..., description="ID of the requesting user"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ) -> ResumeResponse:
     """Update the status of a resume (admin only)."""
     resume_service = ResumeService()
@@ -279,7 +279,7 @@ def update_resume_status(
 def delete_resume(
     resume_id: int,
     user_id: int = Query(..., description="ID of the requesting user"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ) -> ResumeDeletedResponse:
     """Delete a resume (owner or admin only)."""
     resume_service = ResumeService()
@@ -3,18 +3,18 @@ from sqlalchemy.orm import Session
 
 from schemas.upvote_schema import UpvoteCreatedResponse, UpvoteDeletedResponse, UpvoteResponse
 from services.upvote_service import UpvoteService
-from core.database import get_db
+from core.database import get_db, RetryingRoute
 from core.logging_config import LOGGER
 from core.auth import get_current_user
 from models import User
 
-router = APIRouter(tags=["Upvotes"])
+router = APIRouter(tags=["Upvotes"], route_class=RetryingRoute)
 upvote_service = UpvoteService()
 
 @router.post("/post/{post_id}/upvote", status_code=status.HTTP_201_CREATED, response_model=UpvoteCreatedResponse)
 def upvote_post(
     post_id: int,
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ) -> UpvoteCreatedResponse:
     try:
@@ -31,7 +31,7 @@ def upvote_post(
 @router.delete("/post/{post_id}/upvote", status_code=status.HTTP_200_OK, response_model=UpvoteDeletedResponse)
 def remove_upvote_from_post(
     post_id: int,
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ) -> UpvoteDeletedResponse:
     try:
@@ -47,7 +47,7 @@ def remove_upvote_from_post(
 @router.post("/comment/{comment_id}/upvote", status_code=status.HTTP_201_CREATED, response_model=UpvoteCreatedResponse)
 def upvote_comment(
     comment_id: int,
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ) -> UpvoteCreatedResponse:
     try:
@@ -63,7 +63,7 @@ def upvote_comment(
 @router.delete("/comment/{comment_id}/upvote", status_code=status.HTTP_200_OK, response_model=UpvoteDeletedResponse)
 def remove_upvote_from_comment(
     comment_id: int,
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ) -> UpvoteDeletedResponse:
     try:
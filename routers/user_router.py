@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Query, status, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Query, Request, status, Depends, HTTPException
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from core.database import get_db
+from core.database import get_db, not_retried, RetryingRoute
 from schemas import user_schema
 from services.user_service import UserService
 from core.logging_config import LOGGER
+from core.password_pool import PasswordPoolSaturatedError
+from core.query_limits import query_profile
+from jobs.account_deleter import account_deleter
 
-router = APIRouter(tags = ["Users"])
+router = APIRouter(tags = ["Users"], route_class=RetryingRoute)
 
 @router.post(
     "/users/",
@@ -14,7 +17,7 @@ router = APIRouter(tags = ["Users"])
     response_model=user_schema.UserCreatedResponse,
 )
 def create_user(
-    user: user_schema.UserCreate, session: Session = Depends(get_db)
+    user: user_schema.UserCreate, session: Session = Depends(get_db, scope="function")
 ) -> user_schema.UserCreatedResponse:
     service = UserService()
     masked_email = user.email[:3] + "****"
@@ -22,6 +25,13 @@ def create_user(
         user_data = user.model_dump()
         new_user = service.register_user(session, **user_data)
         return new_user
+    except PasswordPoolSaturatedError as e:
+        LOGGER.warning(f"User creation for {masked_email} rejected, password hashing saturated: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except ValueError as e:
         LOGGER.error(f"User creation failed for {masked_email}: {str(e)}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -34,7 +44,7 @@ def create_user(
 
 @router.get("/users/", status_code=status.HTTP_200_OK)
 def get_all_users(
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_db, scope="function"),
     counts: bool = Query(False, alias="counts"),
     active: bool = Query(False, alias="active"),
 ):
@@ -58,7 +68,7 @@ def get_all_users(
     response_model=user_schema.UserGetResponseWithId,
 )
 def get_user_by_id(
-    user_id: int, session: Session = Depends(get_db)
+    user_id: int, session: Session = Depends(get_db, scope="function")
 ) -> user_schema.UserGetResponseWithId:
     service = UserService()
     try:
@@ -89,7 +99,7 @@ def get_user_by_id(
     response_model=list[user_schema.UserCreatedResponse],
 )
 def get_mentees(
-    user_id: int, session: Session = Depends(get_db)
+    user_id: int, session: Session = Depends(get_db, scope="function")
 ) -> user_schema.UserCreatedResponse:
     service = UserService()
     try:
@@ -109,7 +119,7 @@ def get_mentees(
     response_model=user_schema.UserGetResponse,
 )
 def update_user(
-    user_id: int, user_data: user_schema.UserUpdate, session: Session = Depends(get_db)
+    user_id: int, user_data: user_schema.UserUpdate, session: Session = Depends(get_db, scope="function")
 ) -> user_schema.UserUpdate:
     user_service = UserService()
     try:
@@ -135,7 +145,7 @@ def update_user(
     response_model=user_schema.UserGetResponse,
 )
 def update_user_email(
-    user_id: int, body: user_schema.EmailUpdate, session: Session = Depends(get_db)
+    user_id: int, body: user_schema.EmailUpdate, session: Session = Depends(get_db, scope="function")
 ) -> user_schema.UserGetResponse:
     service = UserService()
     try:
@@ -163,18 +173,35 @@ def update_user_email(
     response_model=user_schema.UserGetResponse,
 )
 def update_user_password(
-    user_id: int, body: user_schema.PasswordUpdate, session: Session = Depends(get_db)
+    user_id: int,
+    body: user_schema.PasswordUpdate,
+    request: Request,
+    session: Session = Depends(get_db, scope="function"),
 ) -> user_schema.UserGetResponse:
     service = UserService()
+    # A user changing their own password stays signed in on this session only.
+    keep_session_token = (
+        request.cookies.get("session_token")
+        if getattr(request.state, "user_id", None) == user_id
+        else None
+    )
     try:
         updated_user = service.update_password(
             session,
             old_password=body.old_password,
             new_password=body.new_password,
             user_id=user_id,
+            keep_session_token=keep_session_token,
         )
         LOGGER.info(f"User password updated: {user_id}")
         return updated_user
+    except PasswordPoolSaturatedError as e:
+        LOGGER.warning(f"Password update for {user_id} rejected, password hashing saturated: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except ValueError as e:
         LOGGER.error(f"User password update failed for {user_id}: {str(e)}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -193,10 +220,11 @@ def update_user_password(
     status_code=200,
     response_model=user_schema.UserUpdate,
 )
+@not_retried
 def update_profile_picture(
     user_id: int,
     body: user_schema.ProfilePictureUpdate,
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_db, scope="function"),
 ) -> str:
     service = UserService()
     try:
@@ -212,16 +240,16 @@ def update_profile_picture(
 
 @router.delete(
     "/users/{user_id}",
-    status_code=status.HTTP_200_OK,
+    status_code=status.HTTP_202_ACCEPTED,
     response_model=user_schema.UserDeletedResponse,
 )
 def delete_user(
-    user_id: int, session: Session = Depends(get_db)
+    user_id: int, background_tasks: BackgroundTasks, session: Session = Depends(get_db, scope="function")
 ) -> user_schema.UserDeletedResponse:
     service = UserService()
     try:
-        service.remove_user(session, user_id)
-        LOGGER.info(f"User deleted: {user_id}")
+        deletion = service.remove_user(session, user_id)
+        LOGGER.info(f"User deletion queued: {user_id}")
     except ValueError as e:
         LOGGER.error(f"User deletion failed for {user_id}: {str(e)}")
         raise HTTPException(status_code=404, detail=str(e))
@@ -231,17 +259,37 @@ def delete_user(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
         )
+    # Starts right after the response, once get_db has committed the job; the periodic
+    # run picks it up instead if this worker goes away first.
+    background_tasks.add_task(account_deleter.run_once)
     return user_schema.UserDeletedResponse(
-        message=f"user with email {user_id} was successfully deleted"
+        message=f"user {user_id} is being deleted",
+        deletion=user_schema.AccountDeletionResponse.model_validate(deletion),
     )
 
 
+@router.get(
+    "/account-deletions/{deletion_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=user_schema.AccountDeletionResponse,
+)
+def get_account_deletion(
+    deletion_id: int, session: Session = Depends(get_db, scope="function")
+) -> user_schema.AccountDeletionResponse:
+    service = UserService()
+    try:
+        return service.get_account_deletion(session, deletion_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
 @router.get(
     "/internal/users/",
     status_code=status.HTTP_200_OK,
     response_model=list[user_schema.UserGetResponseInternal],
+    dependencies=[Depends(query_profile("export"))],
 )
-def get_all_users_internal(session: Session = Depends(get_db)):
+def get_all_users_internal(session: Session = Depends(get_db, scope="function")):
     service = UserService()
     try:
         users = service.get_users(session)
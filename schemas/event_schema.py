@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from datetime import datetime
 from typing import List, Optional
 
@@ -39,3 +39,13 @@ class EventWithAttendees(EventResponse):
 
 class EventRegistration(BaseModel):
     email: EmailStr
+
+
+class EventBatchRegistration(BaseModel):
+    emails: List[EmailStr] = Field(min_length=1, max_length=10000)
+
+
+class EventBatchRegistrationResponse(BaseModel):
+    registered: int
+    already_registered: int
+    unknown_emails: List[str]
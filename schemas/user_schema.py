@@ -1,6 +1,8 @@
-from typing import Optional, List
+from datetime import datetime
+from typing import Dict, Optional, List
 from pydantic import BaseModel, ConfigDict, EmailStr
 from pydantic import field_validator
+from models.account_deletion import AccountDeletionStatus
 from models.user import User, UserRole
 
 class DegreeInfo(BaseModel):
@@ -91,8 +93,22 @@ class UserLogin(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class AccountDeletionResponse(BaseModel):
+    id: int
+    user_id: int
+    status: AccountDeletionStatus
+    # rows deleted so far per step
+    progress: Dict[str, int]
+    error: Optional[str] = None
+    requested_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class UserDeletedResponse(BaseModel):
     message: str
+    deletion: AccountDeletionResponse
 
 
 class UserUpdate(BaseModel):
@@ -1,6 +1,7 @@
 from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from repository.announcement_repository import AnnouncementRepository
+from repository.announcement_repository import AnnouncementRepository, AsyncAnnouncementRepository
 from schemas.announcement_schema import (
     AnnouncementCreate,
     AnnouncementUpdate,
@@ -33,6 +34,13 @@ class AnnouncementService:
             for announcement in announcements
         ]
 
+    async def get_all_announcements_async(self, db: AsyncSession) -> list[AnnouncementCreate]:
+        announcements = await AsyncAnnouncementRepository().get_announcements(db)
+        return [
+            AnnouncementCreate.model_validate(announcement)
+            for announcement in announcements
+        ]
+
     def get_announcement_by_id(
         self, db: Session, announcement_id: int
     ) -> Optional[AnnouncementCreate]:
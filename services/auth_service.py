@@ -1,11 +1,16 @@
+from datetime import timedelta
 from sqlalchemy.orm import Session
 from core.logging_config import LOGGER
+from core.password_pool import PasswordPoolSaturatedError
 from repository.user_repository import UserRepository
-from repository.session_repository import SessionRepository
+from repository.session_repository import SessionRepository, SESSION_DURATION_HOURS
 from schemas import user_schema
 from utils.func_utils import (
     check_password,
     create_jwt,
+    get_password_hash,
+    password_needs_rehash,
+    SESSION_TOKEN,
 )
 
 class AuthService:
@@ -24,7 +29,14 @@ class AuthService:
         user = self.user_repo.get_user_by_email(db, email)
         if not user or not check_password(password, user.password):
             raise ValueError("Invalid email or password")
-        token = create_jwt(user.email)
+        # Deactivated, e.g. while the account is deleted in batches: a new session would add rows.
+        # NULL predates the column's default and counts as active.
+        if user.is_active is False:
+            raise ValueError("This account is deactivated.")
+        self._rehash_if_needed(db, user, password)
+        token = create_jwt(
+            user.email, SESSION_TOKEN, expires_in=timedelta(hours=SESSION_DURATION_HOURS), uid=user.id
+        )
         user_login_response: user_schema.UserLoginResponse = (
             user_schema.UserLoginResponse.create_user_login_response(
                 user, access_token=token
@@ -34,6 +46,22 @@ class AuthService:
         LOGGER.info(f"User {user.email} logged in successfully.")
         return user_login_response
 
+    def _rehash_if_needed(self, db: Session, user, password: str) -> None:
+        """Upgrade a hash made under an older scheme or cost while the plain password is at hand."""
+        if not password_needs_rehash(user.password):
+            return
+        try:
+            hashed_password = get_password_hash(password)
+            # A savepoint, so a failed rehash does not roll back the login's session insert.
+            with db.begin_nested():
+                self.user_repo.update_password_hash(db, user.id, hashed_password)
+            LOGGER.info(f"Rehashed password for user {user.id} under the current policy.")
+        except PasswordPoolSaturatedError:
+            # The next login retries; a busy pool should not fail an otherwise valid login.
+            pass
+        except Exception as e:
+            LOGGER.warning(f"Password rehash failed for user {user.id}: {str(e)}")
+
     def logout(self, db: Session, token: str):
         self.session_repo.deactivate_session(db, token)
         LOGGER.info(f"User logged out successfully")
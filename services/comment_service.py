@@ -1,20 +1,23 @@
 from typing import List, Optional
 from uuid import uuid4
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from models.comment import Comment
-from repository.comment_repository import CommentRepository
+from repository.comment_repository import AsyncCommentRepository, CommentRepository
 from schemas.comment_schema import CommentCreate, CommentUpdate, CommentResponse, Author
 from models.enums import AttachmentType
 from utils.image_utils import validate_image
 from utils.func_utils import upload_image_to_s3
 from core.logging_config import LOGGER
-from repository.user_repository import UserRepository
+from repository.user_repository import AsyncUserRepository, UserRepository
 
 class CommentService:
     def __init__(self):
         self.comment_repository = CommentRepository()
         self.user_repository = UserRepository()
+        self.async_comment_repository = AsyncCommentRepository()
+        self.async_user_repository = AsyncUserRepository()
 
     def _create_author(self, user_id: int, db: Session) -> Author:
         user = self.user_repository.get_user_by_id(user_id=user_id, db=db)
@@ -25,9 +28,13 @@ class CommentService:
         )
 
     def _create_comment_response(self, comment: Comment, author: Author, upvote_count: Optional[int] = 0) -> CommentResponse:
-        comment_response = CommentResponse.model_validate(comment, from_attributes=True).model_copy(update={"author": author})
-        comment_response.upvote_count = upvote_count
-        return comment_response
+        # Built from column values: validating the ORM object would lazy-load comment.author
+        # again although the author has already been looked up.
+        return CommentResponse.model_validate({
+            **{column.key: getattr(comment, column.key) for column in Comment.__table__.columns},
+            "author": author,
+            "upvote_count": upvote_count,
+        })
 
     def _verify_comment_ownership(self, comment: Comment, user_id: int) -> None:
         if not comment:
@@ -80,6 +87,24 @@ class CommentService:
         
         return result
 
+    async def get_comments_by_post_id_async(self, db: AsyncSession, post_id: int) -> List[CommentResponse]:
+        comment_tuples = await self.async_comment_repository.get_comments_by_post_id_with_upvote_count(db=db, post_id=post_id)
+        author_ids = list({comment.author_id for comment, _ in comment_tuples})
+        authors = {
+            user.id: Author(first_name=user.first_name, last_name=user.last_name, avatar_url=user.image)
+            for user in await self.async_user_repository.get_users_by_ids(db=db, user_ids=author_ids)
+        }
+        # Built from column values: validating the ORM object would lazy-load comment.author,
+        # which an AsyncSession cannot do implicitly.
+        return [
+            CommentResponse.model_validate({
+                **{column.key: getattr(comment, column.key) for column in Comment.__table__.columns},
+                "author": authors[comment.author_id],
+                "upvote_count": upvote_count,
+            })
+            for comment, upvote_count in comment_tuples
+        ]
+
     def update_comment(self, db: Session, comment_id: int, user_id: int, updated_data: CommentUpdate) -> CommentResponse:
         db_comment = self.comment_repository.get_comment_by_id(db=db, comment_id=comment_id)
         self._verify_comment_ownership(db_comment, user_id)
@@ -7,7 +7,7 @@ from core.logging_config import LOGGER
 from .user_service import UserService
 from sqlalchemy.orm import Session
 from core.settings import settings
-from utils.func_utils import create_jwt
+from utils.func_utils import PASSWORD_RESET_TOKEN, create_jwt
 
 class EmailService:
     def __init__(self):
@@ -94,7 +94,7 @@ class EmailService:
         if not user:
             raise ValueError("User not found")
         try:
-            token = create_jwt(email)
+            token = create_jwt(email, PASSWORD_RESET_TOKEN)
             self.reset_password_email(email, token, user.first_name)
         except Exception as e:
             LOGGER.error("Error sending reset password email. %s", e)
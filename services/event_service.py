@@ -1,11 +1,15 @@
 from typing import List
 from sqlalchemy import String
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from models.event import Event
-from repository.event_repository import EventRepository
-from repository.user_event_repository import UserEventRepository
+from repository.event_repository import AsyncEventRepository, EventRepository
+from repository.user_event_repository import AsyncUserEventRepository, UserEventRepository
 from models.user import User
+from repository.user_repository import UserRepository
 from schemas.event_schema import (
+    EventBatchRegistration,
+    EventBatchRegistrationResponse,
     EventCreate,
     EventRegistration,
     EventUpdate,
@@ -58,6 +62,29 @@ class EventService():
             raise ValueError("User is already registered for this event.")
         user_event_repository.add_user_to_event(db, user_email, event_id)
 
+    def register_users_for_event(
+        self, db: Session, registration: EventBatchRegistration, event_id: int
+    ) -> EventBatchRegistrationResponse:
+        event_repository = EventRepository()
+        user_event_repository = UserEventRepository()
+
+        event = event_repository.get_event_by_id(db, event_id)
+        if not event:
+            raise ValueError("Event not found.")
+
+        current_time = datetime.now(timezone.utc).replace(tzinfo=None)
+        if event.end_time < current_time:
+            raise ValueError("Cannot register for past events.")
+
+        emails = list(dict.fromkeys(registration.emails))
+        user_ids = UserRepository().get_ids_by_emails(db, emails)
+        registered = user_event_repository.add_users_to_event(db, list(user_ids.values()), event_id)
+        return EventBatchRegistrationResponse(
+            registered=registered,
+            already_registered=len(user_ids) - registered,
+            unknown_emails=[email for email in emails if email not in user_ids],
+        )
+
     def unregister_user_from_event(
         self, db: Session, event_registration: EventRegistration, event_id: int
     ) -> None:
@@ -81,6 +108,12 @@ class EventService():
         event_repository = EventRepository()
         return event_repository.get_events(db)
 
+    async def get_user_events_async(self, db: AsyncSession, user_email: String) -> List[Event]:
+        return await AsyncUserEventRepository().get_events_for_user(db, user_email)
+
+    async def get_all_events_async(self, db: AsyncSession) -> List[Event]:
+        return await AsyncEventRepository().get_events(db)
+
     def get_event_by_id(self, db: Session, event_id: int) -> Event:
         event_repository = EventRepository()
         return event_repository.get_event_by_id(db, event_id=event_id)
@@ -1,9 +1,10 @@
 from typing import List, Optional, Dict
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from models.post import Post
-from repository.post_repository import PostRepository
-from repository.user_repository import UserRepository
+from repository.post_repository import AsyncPostRepository, PostRepository
+from repository.user_repository import AsyncUserRepository, UserRepository
 from schemas.post_schema import PostCreate, PostUpdate, Author, PostResponse
 from models.enums import AttachmentType
 from utils.image_utils import validate_image
@@ -15,6 +16,8 @@ class PostService:
     def __init__(self):
         self.post_repository = PostRepository()
         self.user_repository = UserRepository()
+        self.async_post_repository = AsyncPostRepository()
+        self.async_user_repository = AsyncUserRepository()
 
     def _create_author(self, user_id: int, db: Session) -> Author:
         user = self.user_repository.get_user_by_id(db=db, user_id=user_id)
@@ -31,14 +34,18 @@ class PostService:
         if user_id:
             liked_by_user = self.post_repository.user_has_liked_post(db=db, post_id=post.id, user_id=user_id)
 
-        return PostResponse.model_validate(post, from_attributes=True).model_copy(
-            update={
-                "author": author,
-                "upvotes_count": likes_count,
-                "comments_count": comments_count,
-                "liked_by_user": liked_by_user
-            }
-        )
+        return self._build_post_response(post, author, likes_count, comments_count, liked_by_user)
+
+    def _build_post_response(self, post: Post, author: Author, upvotes_count: int, comments_count: int, liked_by_user: bool) -> PostResponse:
+        # Built from column values: validating the ORM object would lazy-load post.author
+        # again although the author has already been looked up.
+        return PostResponse.model_validate({
+            **{column.key: getattr(post, column.key) for column in Post.__table__.columns},
+            "author": author,
+            "upvotes_count": upvotes_count,
+            "comments_count": comments_count,
+            "liked_by_user": liked_by_user
+        })
 
     def _create_post_responses(self, posts: List[Post], user_id: Optional[int], db: Session) -> List[PostResponse]:
         if not posts:
@@ -71,6 +78,39 @@ class PostService:
             for post in posts
         ]
 
+    async def _create_post_responses_async(self, posts: List[Post], user_id: Optional[int], db: AsyncSession) -> List[PostResponse]:
+        if not posts:
+            return []
+
+        post_ids = [post.id for post in posts]
+        authors = await self.async_user_repository.get_users_by_ids(db=db, user_ids=[post.author_id for post in posts])
+        authors_dict: Dict[int, Author] = {
+            author.id: Author(
+                first_name=author.first_name,
+                last_name=author.last_name,
+                avatar_url=author.image
+            )
+            for author in authors
+        }
+        upvote_counts = await self.async_post_repository.count_post_likes(db=db, post_ids=post_ids)
+        comment_counts = await self.async_post_repository.count_post_comments(db=db, post_ids=post_ids)
+        liked_post_ids = set()
+        if user_id:
+            liked_post_ids = await self.async_post_repository.posts_liked_by_user(db=db, post_ids=post_ids, user_id=user_id)
+
+        # Built from column values: validating the ORM object would lazy-load post.author,
+        # which an AsyncSession cannot do implicitly.
+        return [
+            PostResponse.model_validate({
+                **{column.key: getattr(post, column.key) for column in Post.__table__.columns},
+                "author": authors_dict[post.author_id],
+                "upvotes_count": upvote_counts.get(post.id, 0),
+                "comments_count": comment_counts.get(post.id, 0),
+                "liked_by_user": post.id in liked_post_ids
+            })
+            for post in posts
+        ]
+
     def _verify_post_ownership(self, post: Post, user_id: int) -> None:
         if not post:
             raise ValueError("Post not found.")
@@ -103,7 +143,8 @@ class PostService:
             self.post_repository.update_post(post, db)
         
         author = self._create_author(user_id, db)
-        return self._create_post_response(post, author, user_id, db)
+        # Nothing can have upvoted or commented on a post that was just created.
+        return self._build_post_response(post, author, upvotes_count=0, comments_count=0, liked_by_user=False)
 
     def update_post(self, post_id: int, user_id: int, updated_data: PostUpdate, db: Session) -> PostResponse:
         db_post = self.post_repository.get_post_by_id(post_id, db=db)
@@ -146,6 +187,14 @@ class PostService:
         posts = self.post_repository.get_post_by_category(category=category, limit=limit, page=page, db=db)
         return self._create_post_responses(posts, user_id, db)
 
+    async def get_recent_posts_async(self, user_id: Optional[int], db: AsyncSession, limit: int = 10, page: int = 1) -> List[PostResponse]:
+        posts = await self.async_post_repository.get_recent_posts(limit=limit, page=page, db=db)
+        return await self._create_post_responses_async(posts, user_id, db)
+
+    async def get_recent_posts_by_category_async(self, category: str, user_id: Optional[int], db: AsyncSession, limit: int = 10, page: int = 1) -> List[PostResponse]:
+        posts = await self.async_post_repository.get_post_by_category(category=category, limit=limit, page=page, db=db)
+        return await self._create_post_responses_async(posts, user_id, db)
+
     def delete_post(self, post_id: int, user_id: int, db: Session) -> None:
         post = self.post_repository.get_post_by_id(post_id, db)
         self._verify_post_ownership(post, user_id)
@@ -1,10 +1,16 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from core.logging_config import LOGGER
 from typing import List, Optional, Type
 
 from sqlalchemy.orm import Session
 
+from core.database import after_commit
+from core.token_denylist import token_denylist
+from models.account_deletion import AccountDeletion, AccountDeletionStatus
 from models.user import User
+from repository.account_deletion_repository import AccountDeletionRepository
+from repository.revoked_token_repository import RevokedTokenRepository
+from repository.session_repository import SessionRepository
 from repository.user_repository import UserRepository
 from utils.func_utils import (
     check_password,
@@ -17,6 +23,9 @@ from utils.image_utils import validate_image
 class UserService():
     def __init__(self):
         self.user_repository = UserRepository()
+        self.session_repository = SessionRepository()
+        self.account_deletion_repository = AccountDeletionRepository()
+        self.revoked_token_repository = RevokedTokenRepository()
 
     def register_user(
         self,
@@ -75,11 +84,31 @@ class UserService():
     def get_users(self, db: Session, active: bool = False) -> list[Type[User]]:
         return self.user_repository.get_users(db, active=active)
 
-    def remove_user(self, db: Session, user_id: int):
+    def remove_user(self, db: Session, user_id: int) -> AccountDeletion:
+        """
+        Deactivates the user, signs them out everywhere and queues the deletion of their
+        account for jobs.account_deleter; until it finishes they cannot log in again. Asking
+        again while a deletion is queued returns that one, and restarts it if it failed.
+        """
         user = self.user_repository.get_user_by_id(db, user_id)
         if user is None:
             raise ValueError("User does not exist.")
-        return self.user_repository.delete_user(db, user_id)
+        user.is_active = False
+        self.user_repository.update_user(db, user)
+        # The sessions table cascades, but sessions held in memory or Redis do not.
+        self.session_repository.revoke_all_for_user(db, user_id)
+        job = self.account_deletion_repository.get_open_job_for_user(db, user_id)
+        if job is None:
+            job = self.account_deletion_repository.create_job(db, user_id)
+        elif job.status == AccountDeletionStatus.failed:
+            self.account_deletion_repository.reopen_job(db, job)
+        return job
+
+    def get_account_deletion(self, db: Session, job_id: int) -> AccountDeletion:
+        job = self.account_deletion_repository.get_job(db, job_id)
+        if job is None:
+            raise ValueError("Account deletion not found.")
+        return job
 
     def save_profile_picture(self, db: Session, user_id: int, image: str) -> str:
         user = self.user_repository.get_user_by_id(db, user_id)
@@ -118,7 +147,12 @@ class UserService():
         return self.user_repository.update_user(db, user)
 
     def update_password(
-        self, db: Session, old_password: str, new_password: str, user_id: int
+        self,
+        db: Session,
+        old_password: str,
+        new_password: str,
+        user_id: int,
+        keep_session_token: Optional[str] = None,
     ) -> Optional[User]:
         if not user_id:
             raise ValueError("User ID is required.")
@@ -130,8 +164,26 @@ class UserService():
         if not check_password(old_password, user.password):
             raise ValueError("Your old password does not match our records.")
         user.password = get_password_hash(new_password)
-        return self.user_repository.update_user(db, user)
+        updated_user = self.user_repository.update_user(db, user)
+        # Every other session was opened with the old password.
+        self.session_repository.revoke_all_for_user(db, user_id, keep_token=keep_session_token)
+        return updated_user
     
+    def reset_password_with_token(self, db: Session, claims: dict, new_password: str) -> Optional[User]:
+        """
+        Resets the password of the user a verified reset token was issued to. The token's jti
+        is revoked in the same transaction, so each reset link works once.
+        """
+        user = self.user_repository.get_user_by_email(db, claims["user_id"])
+        if not user:
+            raise ValueError("User not found")
+        jti = claims.get("jti")
+        expires_at = datetime.fromtimestamp(claims["exp"], tz=timezone.utc)
+        if not jti or not self.revoked_token_repository.revoke_once(db, jti, user.id, expires_at):
+            raise ValueError("Invalid token")
+        after_commit(db, lambda: token_denylist.add(jti, expires_at))
+        return self.reset_password(db, user.id, new_password)
+
     def reset_password(self, db: Session, user_id: int, new_password: str) -> Optional[User]:
         if not user_id:
             raise ValueError("User ID is required.")
@@ -141,7 +193,9 @@ class UserService():
         if not user:
             raise ValueError("User not found")
         user.password = get_password_hash(new_password)
-        return self.user_repository.update_user(db, user)
+        updated_user = self.user_repository.update_user(db, user)
+        self.session_repository.revoke_all_for_user(db, user_id)
+        return updated_user
     
     def get_users_by_ids(self, db: Session, user_ids: List[int]) -> List[User]:
         if not user_ids:
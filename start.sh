@@ -4,6 +4,7 @@ set -e
 echo "Running migrations..."
 alembic upgrade head || echo "Alembic upgrade failed (already applied?)"
 
-# Start the app
+# Start the app. Every X-Forwarded-For sender is trusted for logging; the login throttle
+# only trusts the last LOGIN_TRUSTED_PROXY_HOPS entries (core/login_throttle.py).
 echo "Starting FastAPI..."
 exec uvicorn main:app --host 0.0.0.0 --port 9000 --proxy-headers --forwarded-allow-ips "*"
@@ -0,0 +1,189 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from clients.s3_client import S3Client
+from jobs.account_deleter import AccountDeleter, account_deleter
+from models.account_deletion import AccountDeletion, AccountDeletionStatus
+from models.comment import Comment
+from models.event import Event
+from models.post import Post
+from models.resume import Resume
+from models.resume_review import ResumeReview
+from models.upvote import Upvote
+from models.user import User
+from models.user_event import UserEvent
+from models.user_journey import UserJourney
+
+BUCKET_URL = S3Client().generate_file_url("")
+
+
+def _user(db_session, email: str, **kwargs) -> User:
+    user = User(email=email, first_name="Del", last_name="Eted", password="x", **kwargs)
+    db_session.add(user)
+    db_session.flush()
+    return user
+
+
+@pytest.fixture
+def leaving_user(db_session) -> int:
+    """A user with a bit of everything, and a second user whose rows partly depend on theirs."""
+    leaving = _user(db_session, "leaving@example.com", image=f"{BUCKET_URL}profile-pictures/leaving.png")
+    staying = _user(db_session, "staying@example.com", mentor_id=leaving.id)
+    event = Event(title="Reunion", start_time=datetime(2026, 1, 1), end_time=datetime(2026, 1, 2), location="Hall")
+    db_session.add(event)
+    db_session.flush()
+
+    posts = [
+        Post(author_id=leaving.id, title=f"Post {i}", content="Body", attachment_url=f"{BUCKET_URL}posts/{i}.png")
+        for i in range(5)
+    ]
+    other_post = Post(author_id=staying.id, title="Staying", content="Body")
+    db_session.add_all(posts + [other_post])
+    db_session.flush()
+    replies = [Comment(post_id=post.id, author_id=staying.id, content="Reply") for post in posts]
+    own_comment = Comment(
+        post_id=other_post.id, author_id=leaving.id, content="Mine", attachment_url=f"{BUCKET_URL}comments/mine.png"
+    )
+    db_session.add_all(replies + [own_comment])
+    db_session.flush()
+    db_session.add_all([Upvote(user_id=staying.id, post_id=post.id) for post in posts])
+    db_session.add_all([Upvote(user_id=staying.id, comment_id=own_comment.id), Upvote(user_id=leaving.id, post_id=other_post.id)])
+
+    resume = Resume(user_id=leaving.id, file_name="cv.pdf", file_path=f"{BUCKET_URL}resumes/cv.pdf")
+    other_resume = Resume(user_id=staying.id, file_name="cv.pdf", file_path=f"{BUCKET_URL}resumes/other.pdf")
+    db_session.add_all([resume, other_resume])
+    db_session.flush()
+    db_session.add_all([
+        ResumeReview(resume_id=resume.id, reviewer_id=staying.id, comments="Fine"),
+        ResumeReview(resume_id=other_resume.id, reviewer_id=leaving.id, comments="Great"),
+        UserEvent(user_id=leaving.id, event_id=event.id),
+        UserJourney(user_id=leaving.id, action="view_post"),
+        UserJourney(user_id=leaving.id, action="create_comment"),
+    ])
+    db_session.commit()
+    return leaving.id
+
+
+@pytest.fixture
+def s3_deletes(mocker):
+    return mocker.patch("jobs.account_deleter.delete_files_from_s3", side_effect=lambda urls: len(urls))
+
+
+def test_deleting_a_user_queues_a_job_that_removes_everything(client: TestClient, db_session, leaving_user, s3_deletes):
+    response = client.delete(f"/users/{leaving_user}")
+    assert response.status_code == 202
+    deletion_id = response.json()["deletion"]["id"]
+
+    # The job ran as a background task once the response was sent.
+    deletion = client.get(f"/account-deletions/{deletion_id}").json()
+    assert deletion["status"] == "done"
+    assert deletion["progress"] == {
+        "comment_upvotes": 1, "post_upvotes": 5, "upvotes": 1, "comments_on_posts": 5, "comments": 1,
+        "posts": 5, "resume_reviews": 2, "resumes": 1, "user_events": 1, "user_journeys": 2,
+        "mentees": 1, "users": 1, "s3_objects": 8,
+    }
+    assert sorted(s3_deletes.call_args.args[0]) == sorted(
+        [f"{BUCKET_URL}posts/{i}.png" for i in range(5)]
+        + [f"{BUCKET_URL}comments/mine.png", f"{BUCKET_URL}resumes/cv.pdf", f"{BUCKET_URL}profile-pictures/leaving.png"]
+    )
+
+    db_session.expire_all()
+    assert db_session.get(User, leaving_user) is None
+    staying = db_session.query(User).one()
+    assert staying.mentor_id is None
+    assert db_session.query(Post).count() == 1
+    assert db_session.query(Comment).count() == 0
+    assert db_session.query(Upvote).count() == 0
+    assert db_session.query(Resume).one().user_id == staying.id
+    assert db_session.query(ResumeReview).count() == 0
+    assert db_session.query(UserJourney).filter(UserJourney.user_id == leaving_user).count() == 0
+
+    assert client.delete(f"/users/{leaving_user}").status_code == 404
+
+
+def test_deletes_in_bounded_batches(client: TestClient, db_session, leaving_user, s3_deletes, statements):
+    db_session.add(AccountDeletion(user_id=leaving_user, progress={}, s3_urls=[]))
+    db_session.commit()
+
+    with statements:
+        assert AccountDeleter(batch_size=2, stale_seconds=600, max_attempts=3).run_once() == 1
+    # 5 posts in batches of 2, the last one coming back short
+    assert statements.verbs().count("DELETE posts") == 3
+    assert statements.verbs().count("DELETE users") == 1
+
+
+def test_repeated_request_returns_the_queued_job(client: TestClient, leaving_user, monkeypatch):
+    monkeypatch.setattr(account_deleter, "run_once", lambda: 0)
+    first = client.delete(f"/users/{leaving_user}").json()["deletion"]
+    second = client.delete(f"/users/{leaving_user}").json()["deletion"]
+    assert first["id"] == second["id"]
+    assert second["status"] == "pending"
+
+
+def test_queued_deletion_signs_the_user_out_and_blocks_login(client: TestClient, db_session, monkeypatch):
+    monkeypatch.setattr(account_deleter, "run_once", lambda: 0)
+    credentials = {"email": "leaving@example.com", "password": "pass123"}
+    user_id = client.post("/users/", json={**credentials, "first_name": "Del", "last_name": "Eted"}).json()["id"]
+    token = client.post("/login/", json=credentials).cookies.get("session_token")
+
+    assert client.delete(f"/users/{user_id}").status_code == 202
+
+    client.cookies.clear()
+    assert client.get("/posts/recent", cookies={"session_token": token}).status_code == 401
+    assert client.post("/login/", json=credentials).status_code == 401
+    assert db_session.get(User, user_id).is_active is False
+
+
+def test_repeated_request_restarts_a_job_out_of_attempts(client: TestClient, db_session, leaving_user, monkeypatch):
+    monkeypatch.setattr(account_deleter, "run_once", lambda: 0)
+    job = AccountDeletion(
+        user_id=leaving_user, status=AccountDeletionStatus.failed, attempts=5, error="S3 is down",
+        progress={"posts": 5}, s3_urls=[],
+    )
+    db_session.add(job)
+    db_session.commit()
+
+    deletion = client.delete(f"/users/{leaving_user}").json()["deletion"]
+    assert deletion["id"] == job.id
+    assert deletion["status"] == "pending"
+    assert deletion["progress"] == {"posts": 5}
+    db_session.expire_all()
+    assert (job.attempts, job.error) == (0, None)
+
+
+def test_failed_s3_cleanup_is_retried(client: TestClient, db_session, leaving_user, mocker):
+    db_session.add(AccountDeletion(user_id=leaving_user, progress={}, s3_urls=[]))
+    db_session.commit()
+    s3_deletes = mocker.patch("jobs.account_deleter.delete_files_from_s3", side_effect=ValueError("S3 is down"))
+
+    deleter = AccountDeleter(batch_size=100, stale_seconds=0, max_attempts=2)
+    assert deleter.run_once() == 0
+    job = db_session.query(AccountDeletion).one()
+    assert job.status == AccountDeletionStatus.failed
+    assert job.error == "S3 is down"
+    # The rows are gone; the files they pointed at are still owed.
+    assert db_session.get(User, leaving_user) is None
+    assert len(job.s3_urls) == 8
+
+    s3_deletes.side_effect = lambda urls: len(urls)
+    assert deleter.run_once() == 1
+    db_session.expire_all()
+    job = db_session.query(AccountDeletion).one()
+    assert job.status == AccountDeletionStatus.done
+    assert job.attempts == 2
+    assert job.s3_urls == []
+    assert len(s3_deletes.call_args.args[0]) == 8
+
+    # Out of attempts: a failed job is left for someone to look at.
+    job.status = AccountDeletionStatus.failed
+    db_session.commit()
+    assert deleter.run_once() == 0
+
+
+def test_s3_urls_outside_the_bucket_are_ignored():
+    s3 = S3Client()
+    assert s3.key_for_url(f"{BUCKET_URL}resumes/cv.pdf") == "resumes/cv.pdf"
+    assert s3.key_for_url("https://media.giphy.com/media/abc/giphy.gif") is None
+    assert s3.key_for_url(None) is None
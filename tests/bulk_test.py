@@ -0,0 +1,41 @@
+from models.user import User
+from repository import bulk
+from repository.bulk import bulk_insert, upsert
+
+
+def test_bulk_insert_chunks_under_the_bind_parameter_limit(db_session, statements, monkeypatch):
+    columns = len(User.__table__.columns)
+    monkeypatch.setattr(bulk, "MAX_BIND_PARAMS", columns * 2)
+    rows = [
+        {"email": f"bulk{i}@example.com", "first_name": "B", "last_name": "Ulk", "password": "x"}
+        for i in range(5)
+    ]
+
+    with statements:
+        assert bulk_insert(db_session, User, rows) == 5
+    db_session.commit()
+    assert statements.verbs() == ["INSERT users"] * 3
+    # Python-side defaults still apply per row.
+    assert db_session.query(User).filter(User.is_active.is_(True)).count() == 5
+
+
+def test_upsert_skips_or_updates_existing_rows(db_session):
+    rows = [
+        {"email": f"upsert{i}@example.com", "first_name": "Old", "last_name": "Name", "password": "x"}
+        for i in range(3)
+    ]
+    assert upsert(db_session, User, rows[:2], index_elements=["email"]) == 2
+    assert upsert(db_session, User, rows, index_elements=["email"]) == 1
+
+    renamed = [dict(row, first_name="New") for row in rows]
+    assert upsert(db_session, User, renamed, index_elements=["email"], update_columns=["first_name"]) == 3
+    db_session.commit()
+    assert {user.first_name for user in db_session.query(User)} == {"New"}
+    assert db_session.query(User).count() == 3
+
+
+def test_nothing_to_write_runs_no_statement(db_session, statements):
+    with statements:
+        assert bulk_insert(db_session, User, []) == 0
+        assert upsert(db_session, User, [], index_elements=["email"]) == 0
+    assert statements.statements == []
@@ -315,4 +315,22 @@ def test_update_comment_with_new_attachment(
     comment = CommentResponse.model_validate(response.json())
     assert comment.content == "Updated comment with attachment"
     assert comment.attachment_type == AttachmentType.IMAGE
-    assert comment.attachment_url == "https://fake-s3-bucket.com/comments/updated.png"
\ No newline at end of file
+    assert comment.attachment_url == "https://fake-s3-bucket.com/comments/updated.png"
+
+def test_create_comment_does_not_reread_the_new_row(client: TestClient, test_users, test_post, statements):
+    _, token1 = test_users[0]
+    with statements:
+        response = client.post("/comments/", json={"content": "Quick"}, params={"post_id": test_post.id}, cookies={"session_token": token1})
+    assert response.status_code == 201
+    assert statements.verbs() == ["INSERT comments", "SELECT"]
+    assert "FROM users" in statements.statements[1]
+
+
+def test_update_comment_reads_the_row_once(client: TestClient, test_users, test_post, statements):
+    _, token1 = test_users[0]
+    comment_id = client.post("/comments/", json={"content": "Before"}, params={"post_id": test_post.id}, cookies={"session_token": token1}).json()["id"]
+    with statements:
+        response = client.put(f"/comments/{comment_id}", json={"content": "After"}, cookies={"session_token": token1})
+    assert response.status_code == 200
+    assert response.json()["content"] == "After"
+    assert statements.verbs() == ["SELECT", "UPDATE comments", "SELECT"]
@@ -0,0 +1,107 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+import core.database as database
+from core.pool_metrics import pool_metrics
+from models.user import User
+from main import app
+
+
+def test_lazy_session_is_built_on_first_use(engine):
+    built = []
+
+    def factory():
+        built.append(database.SessionLocal())
+        return built[-1]
+
+    db = database.LazySession(factory)
+    db.rollback()
+    db.close()
+    assert not db.started
+    assert built == []
+
+    assert db.execute(text("SELECT 1")).scalar() == 1
+    assert db.started
+    assert len(built) == 1
+    db.execute(text("SELECT 1"))
+    assert len(built) == 1
+    db.close()
+
+
+def test_get_db_builds_no_session_when_unused(engine, monkeypatch):
+    calls = []
+    session_local = database.SessionLocal
+    monkeypatch.setattr(database, "SessionLocal", lambda: calls.append(1) or session_local())
+
+    generator = database.get_db()
+    db = next(generator)
+    generator.close()
+    assert not db.started
+    assert calls == []
+
+
+@pytest.fixture
+def real_get_db(client: TestClient, db_url: str):
+    database.init_db(db_url)
+    app.dependency_overrides.pop(database.get_db, None)
+    yield
+    database.engine.dispose()
+
+
+def test_rejected_request_builds_no_session(real_get_db, monkeypatch):
+    calls = []
+    session_local = database.SessionLocal
+    monkeypatch.setattr(database, "SessionLocal", lambda: calls.append(1) or session_local())
+
+    response = TestClient(app).post("/users/", json={"email": "not-an-email"})
+    assert response.status_code == 422
+    assert calls == []
+
+
+def test_connection_is_back_in_the_pool_before_the_response_is_sent(real_get_db):
+    checked_out_at_start = []
+
+    async def probe(scope, receive, send):
+        async def probe_send(message):
+            if message["type"] == "http.response.start":
+                checked_out_at_start.append(database.engine.pool.checkedout())
+            await send(message)
+
+        await app(scope, receive, probe_send)
+
+    response = TestClient(probe).get("/users/")
+    assert response.status_code == 200
+    assert checked_out_at_start == [0]
+    assert pool_metrics.get("primary").snapshot()["checkouts"] == 1
+
+
+def test_after_commit_callbacks_run_only_on_commit(engine):
+    calls = []
+    db = database.SessionLocal()
+    try:
+        database.after_commit(db, lambda: calls.append("rolled back"))
+        db.execute(text("SELECT 1"))
+        db.rollback()
+        database.after_commit(db, lambda: calls.append("committed"))
+        db.execute(text("SELECT 1"))
+        assert calls == []
+        db.commit()
+        assert calls == ["committed"]
+        db.commit()
+        assert calls == ["committed"]
+    finally:
+        db.close()
+
+
+def test_session_scope_commits_or_rolls_back(engine):
+    with pytest.raises(RuntimeError):
+        with database.session_scope() as db:
+            db.add(User(email="scope@example.com", first_name="S", last_name="Cope", password="x"))
+            db.flush()
+            raise RuntimeError("boom")
+    with database.session_scope() as db:
+        assert db.query(User).filter(User.email == "scope@example.com").count() == 0
+        db.add(User(email="scope@example.com", first_name="S", last_name="Cope", password="x"))
+    with database.session_scope() as db:
+        assert db.query(User).filter(User.email == "scope@example.com").count() == 1
@@ -1,5 +1,6 @@
 from fastapi.testclient import TestClient
 from schemas.event_schema import EventCreate, EventResponse
+from models.user import User
 from schemas.user_schema import UserCreatedResponse
 from pydantic import TypeAdapter
 from typing import List
@@ -169,3 +170,42 @@ def test_cannot_register_for_past_event(client: TestClient) -> None:
 
     assert registration_response.status_code == 400
     assert "Cannot register for past events" in registration_response.json()["detail"]
+
+
+def test_batch_registration_is_one_insert(client: TestClient, db_session, statements) -> None:
+    future_time = datetime.now(timezone.utc) + timedelta(days=7)
+    event_response = client.post("/events/", json={
+        "title": "Reunion",
+        "start_time": future_time.isoformat(),
+        "end_time": (future_time + timedelta(hours=3)).isoformat(),
+        "location": "Main Hall",
+    })
+    event = EventResponse.model_validate(event_response.json())
+    db_session.add_all(
+        User(email=f"alumnus{i}@example.com", first_name="A", last_name="Lumnus", password="x")
+        for i in range(300)
+    )
+    db_session.commit()
+    client.post(f"/events/{event.id}/register", json={"email": "alumnus0@example.com"})
+
+    emails = [f"alumnus{i}@example.com" for i in range(300)] + ["stranger@example.com", "alumnus1@example.com"]
+    with statements:
+        response = client.post(f"/events/{event.id}/register/batch", json={"emails": emails})
+    assert response.status_code == 200
+    assert response.json() == {"registered": 299, "already_registered": 1, "unknown_emails": ["stranger@example.com"]}
+    # the event, the user ids, and the registrations
+    assert statements.verbs() == ["SELECT", "SELECT", "INSERT user_events"]
+    assert len(client.get(f"/events/{event.id}/users").json()) == 300
+
+
+def test_batch_registration_for_past_event_is_rejected(client: TestClient) -> None:
+    past_time = datetime.now(timezone.utc) - timedelta(days=1)
+    event_response = client.post("/events/", json={
+        "title": "Over",
+        "start_time": (past_time - timedelta(hours=2)).isoformat(),
+        "end_time": past_time.isoformat(),
+        "location": "Main Hall",
+    })
+    response = client.post(f"/events/{event_response.json()['id']}/register/batch", json={"emails": ["a@example.com"]})
+    assert response.status_code == 400
+    assert "Cannot register for past events" in response.json()["detail"]
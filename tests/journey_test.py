@@ -0,0 +1,89 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from jobs.journey_recorder import JourneyRecorder, journey_recorder
+from models.user import User
+from models.user_journey import UserJourney
+
+
+def _user(db_session, email: str) -> int:
+    user = User(email=email, first_name="Jo", last_name="Urney", password="x")
+    db_session.add(user)
+    db_session.commit()
+    return user.id
+
+
+class _JourneyInserts:
+    """Counts INSERTs into user_journeys, which the statements fixture leaves out."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self) -> "_JourneyInserts":
+        event.listen(Engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(Engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().startswith("INSERT INTO user_journeys"):
+            self.count += 1
+
+
+def test_recorder_writes_a_batch_per_flush(client: TestClient, db_session):
+    user_id = _user(db_session, "jo@example.com")
+    recorder = JourneyRecorder(flush_seconds=60, batch_size=3, max_pending=100)
+
+    flush_due = [recorder.record(user_id=user_id, action=f"action_{i}") for i in range(5)]
+    assert flush_due == [False, False, True, True, True]
+
+    with _JourneyInserts() as inserts:
+        assert recorder.flush() == 5
+    assert inserts.count == 1
+    assert recorder.pending() == 0
+    assert db_session.query(UserJourney).filter(UserJourney.user_id == user_id).count() == 5
+    assert db_session.query(UserJourney).filter(UserJourney.timestamp.is_(None)).count() == 0
+
+
+def test_recorder_drops_rows_past_max_pending(client: TestClient):
+    recorder = JourneyRecorder(flush_seconds=60, batch_size=100, max_pending=2)
+    for _ in range(3):
+        recorder.record(user_id=1, action="view_post")
+    assert recorder.pending() == 2
+    assert recorder.stats()["total_dropped"] == 1
+
+
+def test_rows_of_deleted_users_do_not_sink_the_batch(client: TestClient, db_session):
+    staying = _user(db_session, "staying@example.com")
+    leaving = _user(db_session, "leaving@example.com")
+    recorder = JourneyRecorder(flush_seconds=60, batch_size=100, max_pending=100)
+    recorder.record(user_id=staying, action="view_post")
+    recorder.record(user_id=leaving, action="view_post")
+    recorder.record(user_id=staying, action="create_comment")
+
+    db_session.query(User).filter(User.id == leaving).delete()
+    db_session.commit()
+
+    assert recorder.flush() == 2
+    assert recorder.stats()["total_dropped"] == 1
+    assert db_session.query(UserJourney).filter(UserJourney.user_id == staying).count() == 2
+
+
+def test_requests_are_buffered_until_flushed(client: TestClient, db_session, monkeypatch):
+    monkeypatch.setattr(journey_recorder, "flush_seconds", 60)
+    client.post("/users/", json={
+        "email": "jo@example.com", "first_name": "Jo", "last_name": "Urney", "password": "pass123",
+    })
+    token = client.post("/login/", json={"email": "jo@example.com", "password": "pass123"}).cookies.get("session_token")
+    journey_recorder.clear()
+
+    assert client.get("/users/", cookies={"session_token": token}).status_code == 200
+    assert journey_recorder.pending() == 1
+    assert db_session.query(UserJourney).count() == 0
+
+    assert journey_recorder.flush() == 1
+    journey = db_session.query(UserJourney).one()
+    assert (journey.endpoint, journey.method, journey.session_token) == ("/users/", "GET", token)
+    assert journey.extra_metadata["status_code"] == 200
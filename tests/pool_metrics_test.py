@@ -0,0 +1,97 @@
+import base64
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import exc, text
+
+import core.database as database
+from core.pool_metrics import PoolMetrics, pool_metrics
+from core.settings import settings
+
+
+@pytest.fixture
+def small_pool(db_url: str, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 1)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT_SECONDS", 0.1)
+    monkeypatch.setattr(settings, "DB_POOL_RECYCLE_SECONDS", 60)
+    database.init_db(db_url)
+    yield database.engine
+    database.engine.dispose()
+
+
+def test_pool_is_sized_from_settings(small_pool):
+    pool = small_pool.pool
+    assert pool.size() == 1
+    assert pool._max_overflow == 1
+    assert pool._timeout == 0.1
+    assert pool._recycle == 60
+
+
+def test_checkouts_are_counted_and_timed(small_pool):
+    metrics = pool_metrics.get("primary")
+    with small_pool.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        busy = metrics.snapshot()
+    idle = metrics.snapshot()
+
+    assert busy["checked_out"] == 1
+    assert busy["idle"] == 0
+    assert idle["checked_out"] == 0
+    assert idle["idle"] == 1
+    assert idle["checkouts"] == idle["checkins"] == 1
+    assert idle["connects"] == 1
+    assert idle["checkout_wait_ms"]["count"] == 1
+    assert sum(idle["checkout_wait_ms"]["histogram"].values()) == 1
+
+
+def test_overflow_and_checkout_timeouts_are_reported(small_pool):
+    metrics = pool_metrics.get("primary")
+    with small_pool.connect(), small_pool.connect():
+        assert metrics.snapshot()["overflow"] == 1
+        with pytest.raises(exc.TimeoutError):
+            small_pool.connect()
+    snapshot = metrics.snapshot()
+    assert snapshot["checkout_timeouts"] == 1
+    assert snapshot["checkout_wait_ms"]["count"] == 2
+
+
+def test_metrics_survive_dispose(small_pool):
+    metrics = pool_metrics.get("primary")
+    small_pool.dispose()
+    with small_pool.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    snapshot = metrics.snapshot()
+    assert snapshot["checkouts"] == 1
+    assert snapshot["checkout_wait_ms"]["count"] == 1
+
+
+def test_replica_pools_are_reported_separately(db_url: str):
+    database.init_db(db_url, [db_url])
+    try:
+        assert {"primary", "replica-0"} <= set(pool_metrics.snapshot())
+        database.init_db(db_url)
+        assert "replica-0" not in pool_metrics.snapshot()
+    finally:
+        for e in [database.engine, *database.replica_engines]:
+            e.dispose()
+
+
+def test_wait_histogram_buckets():
+    metrics = PoolMetrics("test", buckets_ms=(1, 10))
+    for wait_ms in (0.5, 1, 5, 50):
+        metrics.record_wait(wait_ms)
+    wait = metrics.snapshot()["checkout_wait_ms"]
+    assert wait["histogram"] == {"le_1": 2, "le_10": 1, "le_inf": 1}
+    assert wait["max"] == 50
+
+
+def test_pool_metrics_endpoint_requires_docs_credentials(client: TestClient, monkeypatch):
+    monkeypatch.setattr(settings, "DOCS_AUTH_USERNAME", "ops")
+    monkeypatch.setattr(settings, "DOCS_AUTH_PASSWORD", "secret")
+    assert client.get("/metrics/db-pool").status_code == 401
+
+    auth = base64.b64encode(b"ops:secret").decode()
+    response = client.get("/metrics/db-pool", headers={"Authorization": f"Basic {auth}"})
+    assert response.status_code == 200
+    assert "checkout_wait_ms" in response.json()["primary"]
@@ -1,5 +1,11 @@
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import core.database as database
+from models.comment import Comment
+from models.post import Post
+from models.upvote import Upvote
 from models.user import User
 from schemas.post_schema import PostResponse
 from schemas.user_schema import UserCreatedResponse
@@ -472,4 +478,112 @@ def test_comments_count_increments(client: TestClient, test_users, test_post):
     assert resp.status_code == 201
 
     post_resp = client.get(f"/posts/{test_post.id}", cookies={"session_token": token1})
-    assert post_resp.json()["comments_count"] == 1
\ No newline at end of file
+    assert post_resp.json()["comments_count"] == 1
+
+def test_recent_posts_counts_match_post_detail(client: TestClient, test_users, test_post):
+    (_, token1), (_, token2) = test_users
+    client.post("/posts/", json={"title": "Other", "content": "Other post"}, cookies={"session_token": token2})
+    client.post(f"/post/{test_post.id}/upvote", cookies={"session_token": token1})
+    client.post(f"/post/{test_post.id}/upvote", cookies={"session_token": token2})
+    client.post("/comments/", json={"content": "Hi"}, params={"post_id": test_post.id}, cookies={"session_token": token2})
+
+    recent = client.get("/posts/recent", cookies={"session_token": token1}).json()
+    detail = client.get(f"/posts/{test_post.id}", cookies={"session_token": token1}).json()
+    listed = next(post for post in recent if post["id"] == test_post.id)
+    for key in ("upvotes_count", "comments_count", "liked_by_user", "author", "title"):
+        assert listed[key] == detail[key]
+    other = next(post for post in recent if post["id"] != test_post.id)
+    assert other["upvotes_count"] == 0
+    assert other["liked_by_user"] is False
+
+
+def test_recent_posts_query_count_does_not_grow_with_page_size(client: TestClient, test_users):
+    _, token1 = test_users[0]
+    for i in range(5):
+        client.post("/posts/", json={"title": f"Post {i}", "content": "Body"}, cookies={"session_token": token1})
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT") and "sessions" not in statement and "user_journeys" not in statement:
+            statements.append(statement)
+
+    client.get("/posts/recent", cookies={"session_token": token1})
+    event.listen(Engine, "before_cursor_execute", record_statement)
+    try:
+        response = client.get("/posts/recent", cookies={"session_token": token1})
+    finally:
+        event.remove(Engine, "before_cursor_execute", record_statement)
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+    # posts, authors, upvote counts, comment counts, the caller's upvotes
+    assert len(statements) == 5
+
+
+def test_async_routes_fall_back_to_thread_pool_without_asyncpg(client: TestClient, test_users, test_post, monkeypatch):
+    _, token1 = test_users[0]
+    monkeypatch.setattr(database, "AsyncSessionLocal", None)
+
+    response = client.get("/posts/recent", cookies={"session_token": token1})
+    assert response.status_code == 200
+    assert [post["id"] for post in response.json()] == [test_post.id]
+    assert client.get(f"/post/{test_post.id}/comments").status_code == 200
+    assert client.get("/events/").status_code == 200
+    assert client.get("/announcements/").status_code == 200
+
+
+def test_failed_attachment_upload_leaves_no_post(client, test_users, db_session, mocker):
+    """The post insert and its attachment update are one unit of work."""
+    _, token1 = test_users[0]
+    mocker.patch("services.post_service.validate_image", return_value=True)
+    mocker.patch("services.post_service.upload_image_to_s3", side_effect=ValueError("S3 is down"))
+
+    with pytest.raises(ValueError):
+        client.post("/posts/", json={
+            "title": "Never saved",
+            "content": "The upload fails",
+            "category": "Visuals",
+            "attachment": base64.b64encode(b"fake image bytes").decode("utf-8"),
+            "attachment_type": AttachmentType.IMAGE,
+        }, cookies={"session_token": token1})
+
+    assert db_session.query(Post).count() == 0
+
+
+def test_create_post_does_not_reread_the_new_row(client: TestClient, test_users, statements):
+    _, token1 = test_users[0]
+    with statements:
+        response = client.post("/posts/", json={"title": "Fresh", "content": "Just written"}, cookies={"session_token": token1})
+    assert response.status_code == 201
+    assert response.json()["upvotes_count"] == 0
+    # The INSERT returns the id; the only read left is the author shown in the response.
+    assert statements.verbs() == ["INSERT posts", "SELECT"]
+    assert "FROM users" in statements.statements[1]
+
+
+def test_update_post_reads_the_row_once(client: TestClient, test_users, test_post, statements):
+    _, token1 = test_users[0]
+    with statements:
+        response = client.put(f"/posts/{test_post.id}", json={"title": "Edited"}, cookies={"session_token": token1})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Edited"
+    assert statements.verbs() == ["SELECT", "UPDATE posts", "SELECT", "SELECT", "SELECT", "SELECT"]
+    assert sum(" FROM posts " in s for s in statements.statements) == 1
+
+
+def test_delete_post_leaves_children_to_the_database(client: TestClient, test_users, test_post, db_session, statements):
+    (alice, token1), (bob, _) = test_users
+    comments = [Comment(post_id=test_post.id, author_id=bob.id, content=f"Comment {i}") for i in range(3)]
+    db_session.add_all(comments)
+    db_session.flush()
+    db_session.add_all([Upvote(user_id=alice.id, post_id=test_post.id), Upvote(user_id=bob.id, post_id=test_post.id)])
+    db_session.add_all(Upvote(user_id=alice.id, comment_id=comment.id) for comment in comments)
+    db_session.commit()
+    db_session.expunge_all()
+
+    with statements:
+        response = client.delete(f"/posts/{test_post.id}", cookies={"session_token": token1})
+    assert response.status_code == 200
+    # ON DELETE CASCADE removes the comments and upvotes; none of them are loaded first.
+    assert statements.verbs() == ["SELECT", "DELETE posts"]
+    assert db_session.query(Comment).count() == 0
+    assert db_session.query(Upvote).count() == 0
@@ -0,0 +1,85 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+import core.database as database
+from core.query_limits import QueryBudgetExceeded, QueryLimits, apply_limits, query_profile
+from core.settings import settings
+from main import app
+
+
+@pytest.fixture
+def real_get_db(client: TestClient, db_url: str):
+    database.init_db(db_url)
+    app.dependency_overrides.pop(database.get_db, None)
+    yield TestClient(app)
+    database.engine.dispose()
+
+
+def _timeouts(statements) -> list:
+    return [s for s in statements.statements if s.startswith("SET LOCAL statement_timeout")]
+
+
+def test_statement_timeout_follows_the_route_profile(real_get_db, statements, monkeypatch):
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_READ_MS", 1234)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_EXPORT_MS", 98765)
+
+    with statements:
+        assert real_get_db.get("/users/").status_code == 200
+    assert _timeouts(statements) == ["SET LOCAL statement_timeout = 1234"]
+    assert statements.statements[0].startswith("SET LOCAL")
+
+    for export in ("/internal/events/", "/internal/users/"):
+        with statements:
+            assert real_get_db.get(export).status_code == 200
+        assert _timeouts(statements) == ["SET LOCAL statement_timeout = 98765"]
+
+
+def test_timeout_does_not_outlive_the_request(real_get_db):
+    assert real_get_db.get("/users/").status_code == 200
+    with database.engine.connect() as conn:
+        assert conn.execute(text("SHOW statement_timeout")).scalar() == "0"
+        assert "query_limits" not in conn.info
+
+
+def test_runaway_statement_is_cancelled(engine):
+    db = database.SessionLocal()
+    try:
+        apply_limits(db, QueryLimits("read", statement_timeout_ms=50, query_budget=0))
+        with pytest.raises(OperationalError) as error:
+            db.execute(text("SELECT pg_sleep(2)"))
+        assert error.value.orig.pgcode == "57014"
+    finally:
+        db.rollback()
+        db.close()
+
+
+def test_query_budget_raises_past_the_limit(engine):
+    db = database.SessionLocal()
+    try:
+        apply_limits(db, QueryLimits("read", statement_timeout_ms=0, query_budget=2, action="raise"))
+        db.execute(text("SELECT 1"))
+        db.execute(text("SELECT 2"))
+        with pytest.raises(QueryBudgetExceeded):
+            db.execute(text("SELECT 3"))
+    finally:
+        db.rollback()
+        db.close()
+
+
+def test_query_budget_logs_once_by_default(real_get_db, monkeypatch):
+    warnings = []
+    monkeypatch.setattr(settings, "DB_QUERY_BUDGET_WRITE", 1)
+    monkeypatch.setattr("core.query_limits.LOGGER.warning", warnings.append)
+
+    # the duplicate-email check and the INSERT
+    response = real_get_db.post("/users/", json={"email": "budget@example.com", "first_name": "B", "last_name": "U", "password": "p"})
+    assert response.status_code == 201
+    assert len(warnings) == 1
+    assert "write request ran 2 queries, over its budget of 1" in warnings[0]
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        query_profile("reporting")
@@ -0,0 +1,122 @@
+"""
+EXPLAIN harness: runs each repository read against seeded tables and fails when the plan
+sequentially scans one of the large tables, i.e. when a query has lost its supporting index.
+Queries that read a whole table by design (get_users without a filter, get_events,
+get_announcements) are not listed.
+"""
+from typing import Callable, Iterator, List, Tuple
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+import core.database as database
+from models.resume import ResumeStatus
+from repository.comment_repository import CommentRepository
+from repository.post_repository import PostRepository
+from repository.resume_repository import ResumeRepository
+from repository.upvote_repository import UpvoteRepository
+from repository.user_event_repository import UserEventRepository
+from repository.user_repository import UserRepository
+
+ROWS = 20_000
+# Tables big enough in production that a sequential scan per request is a regression.
+LARGE_TABLES = {"users", "posts", "comments", "upvotes", "resumes", "user_events"}
+
+SEED = [
+    # Most accounts belong to alumni who no longer sign in.
+    f"""INSERT INTO users (email, first_name, last_name, password, role, is_active, mentor_id)
+        SELECT 'user' || i || '@example.com', 'First', 'Last', 'x', 'user', i % 20 = 0,
+               CASE WHEN i > 100 THEN i % 100 + 1 END
+        FROM generate_series(1, {ROWS}) AS i""",
+    f"""INSERT INTO posts (author_id, title, content, category, created_at, updated_at)
+        SELECT i % {ROWS} + 1, 'Post ' || i, 'Body', 'category-' || i % 50,
+               now() - i * interval '1 minute', now()
+        FROM generate_series(1, {ROWS}) AS i""",
+    f"""INSERT INTO comments (post_id, author_id, content, created_at, updated_at)
+        SELECT i % {ROWS} + 1, (i * 7) % {ROWS} + 1, 'Comment', now() - i * interval '1 second', now()
+        FROM generate_series(1, {ROWS * 2}) AS i""",
+    # Two upvotes per post and per comment, from voters spread over all users.
+    f"""INSERT INTO upvotes (user_id, post_id, created_at)
+        SELECT ((i - 1) % {ROWS} + (i - 1) / {ROWS} * 7919) % {ROWS} + 1, (i - 1) % {ROWS} + 1, now()
+        FROM generate_series(1, {ROWS * 2}) AS i""",
+    f"""INSERT INTO upvotes (user_id, comment_id, created_at)
+        SELECT ((i - 1) % {ROWS} + (i - 1) / {ROWS} * 7919) % {ROWS} + 1, (i - 1) % {ROWS} + 1, now()
+        FROM generate_series(1, {ROWS * 2}) AS i""",
+    # Nearly every resume has been reviewed; the queue of pending ones is short.
+    f"""INSERT INTO resumes (user_id, file_name, file_path, status, uploaded_at, updated_at)
+        SELECT i, 'cv.pdf', 'resumes/cv.pdf',
+               (CASE WHEN i % 50 = 0 THEN 'pending' WHEN i % 50 = 1 THEN 'in_review' ELSE 'reviewed' END)::resumestatus,
+               now() - i * interval '1 minute', now()
+        FROM generate_series(1, {ROWS}) AS i""",
+    """INSERT INTO events (title, start_time, end_time, location, is_active)
+        SELECT 'Event ' || i, now(), now(), 'Hall', true FROM generate_series(1, 500) AS i""",
+    f"""INSERT INTO user_events (user_id, event_id)
+        SELECT i, i % 500 + 1 FROM generate_series(1, {ROWS}) AS i""",
+]
+
+CASES: List[Tuple[str, Callable[[Session], object]]] = [
+    ("get_recent_posts", lambda db: PostRepository().get_recent_posts(db, limit=10, page=3)),
+    ("get_post_by_category", lambda db: PostRepository().get_post_by_category(db, "category-7", limit=10)),
+    ("get_user_posts", lambda db: PostRepository().get_user_posts(42, db)),
+    ("count_post_likes", lambda db: PostRepository().count_post_likes(42, db)),
+    ("count_post_comments", lambda db: PostRepository().count_post_comments(42, db)),
+    ("user_has_liked_post", lambda db: PostRepository().user_has_liked_post(db, 42, 1)),
+    ("get_comments_by_post_id", lambda db: CommentRepository().get_comments_by_post_id(db, 42)),
+    ("get_comments_by_post_id_with_upvote_count", lambda db: CommentRepository().get_comments_by_post_id_with_upvote_count(db, 42)),
+    ("get_post_upvote_count", lambda db: UpvoteRepository().get_post_upvote_count(42, db)),
+    ("get_comment_upvote_count", lambda db: UpvoteRepository().get_comment_upvote_count(42, db)),
+    ("get_upvote_by_user_and_comment", lambda db: UpvoteRepository().get_upvote_by_user_and_comment(1, 42, db)),
+    ("get_resumes_by_status", lambda db: ResumeRepository().get_resumes_by_status(db, ResumeStatus.pending)),
+    ("count_resumes_by_status", lambda db: ResumeRepository().count_resumes_by_status(db, ResumeStatus.pending)),
+    ("get_resumes_by_user_id", lambda db: ResumeRepository().get_resumes_by_user_id(db, 42)),
+    ("get_user_resume_by_status", lambda db: ResumeRepository().get_user_resume_by_status(db, 42, [ResumeStatus.pending])),
+    ("get_users_for_event", lambda db: UserEventRepository().get_users_for_event(db, 42)),
+    ("get_events_for_user", lambda db: UserEventRepository().get_events_for_user(db, "user42@example.com")),
+    ("get_all_mentees", lambda db: UserRepository().get_all_mentees(db, 42)),
+    ("get_active_users", lambda db: UserRepository().get_users(db, active=True)),
+    ("get_users_by_ids", lambda db: UserRepository().get_users_by_ids(db, [1, 2, 3])),
+]
+
+
+@pytest.fixture(scope="module")
+def seeded_engine(db_url: str) -> Iterator:
+    seeded = create_engine(db_url)
+    database.Base.metadata.drop_all(bind=seeded)
+    database.Base.metadata.create_all(bind=seeded)
+    with seeded.begin() as conn:
+        for statement in SEED:
+            conn.execute(text(statement))
+    with seeded.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE"))
+    yield seeded
+    database.Base.metadata.drop_all(bind=seeded)
+    seeded.dispose()
+
+
+def _sequential_scans(plan: dict) -> List[str]:
+    scans = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in LARGE_TABLES:
+        scans.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        scans.extend(_sequential_scans(child))
+    return scans
+
+
+@pytest.mark.parametrize("name, query", CASES, ids=[name for name, _ in CASES])
+def test_repository_query_uses_an_index(seeded_engine, name, query):
+    with seeded_engine.connect() as conn:
+        executed = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                executed.append((statement, parameters))
+
+        event.listen(conn, "before_cursor_execute", record)
+        query(Session(bind=conn))
+        event.remove(conn, "before_cursor_execute", record)
+        assert executed, f"{name} ran no SELECT"
+
+        for statement, parameters in executed:
+            plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()[0]["Plan"]
+            assert not _sequential_scans(plan), f"{name} scans {_sequential_scans(plan)} sequentially:\n{statement}"
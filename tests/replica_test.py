@@ -0,0 +1,169 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import core.database as database
+from core.replica_routing import ReadYourWrites, ReplicaRouter, read_your_writes
+from main import app
+from utils.func_utils import decode_session_jwt
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_round_robin_cycles_through_replicas():
+    router = ReplicaRouter(["a", "b", "c"])
+    assert [router.choose() for _ in range(5)] == ["a", "b", "c", "a", "b"]
+
+
+def test_random_policy_only_returns_configured_replicas():
+    router = ReplicaRouter(["a", "b"], policy="random")
+    assert {router.choose() for _ in range(50)} <= {"a", "b"}
+
+
+def test_router_without_replicas_is_falsy():
+    router = ReplicaRouter([])
+    assert not router
+    assert router.choose() is None
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        ReplicaRouter(["a"], policy="nearest")
+
+
+def test_write_pins_user_for_the_window_only():
+    clock = Clock()
+    tracker = ReadYourWrites(window_seconds=5, clock=clock)
+    tracker.record_write(7)
+    assert tracker.is_pinned(7)
+    assert not tracker.is_pinned(8)
+    clock.now += 5
+    assert not tracker.is_pinned(7)
+
+
+def test_anonymous_writes_and_zero_window_pin_nobody():
+    tracker = ReadYourWrites(window_seconds=0)
+    tracker.record_write(7)
+    tracker.record_write(None)
+    assert not tracker.is_pinned(7)
+    assert not tracker.is_pinned(None)
+
+
+def test_tracker_stays_bounded():
+    clock = Clock()
+    tracker = ReadYourWrites(window_seconds=5, max_entries=3, clock=clock)
+    for user_id in range(5):
+        clock.now += 1
+        tracker.record_write(user_id)
+    assert len(tracker._pinned_until) == 3
+    assert tracker.is_pinned(4)
+
+
+@pytest.fixture
+def replica(client: TestClient, db_url: str):
+    """
+    Routes through the real get_db with one "replica" that is the test database itself,
+    and counts the statements each engine runs.
+    """
+    database.init_db(db_url, [db_url])
+    app.dependency_overrides.pop(database.get_db, None)
+    read_your_writes.clear()
+    counts = {"primary": 0, "replica": 0}
+
+    def counter(name):
+        def count(conn, cursor, statement, parameters, context, executemany):
+            if "sessions" in statement or "user_journeys" in statement:
+                return
+            # Every request transaction starts with SET LOCAL statement_timeout; count real queries.
+            if not statement.startswith("SET LOCAL"):
+                counts[name] += 1
+        return count
+
+    event.listen(database.engine, "before_cursor_execute", counter("primary"))
+    event.listen(database.replica_engines[0], "before_cursor_execute", counter("replica"))
+    yield counts
+    read_your_writes.clear()
+    database.engine.dispose()
+    for replica_engine in database.replica_engines:
+        replica_engine.dispose()
+    database.replica_engines = []
+    database.ReplicaSessionLocal = ReplicaRouter([])
+
+
+def login(client: TestClient, email: str) -> str:
+    client.post("/users/", json={
+        "email": email, "first_name": "Rita", "last_name": "Replica", "password": "pass123",
+    })
+    response = client.post("/login", json={"email": email, "password": "pass123"})
+    return response.cookies.get("session_token")
+
+
+def test_reads_go_to_replica_and_writes_to_primary(client: TestClient, replica):
+    token = login(client, "rita@example.com")
+    read_your_writes.clear()
+    replica.update(primary=0, replica=0)
+
+    response = client.get("/users/", cookies={"session_token": token})
+    assert response.status_code == 200
+    assert replica == {"primary": 0, "replica": 1}
+
+    response = client.post("/posts/", json={
+        "title": "Hello", "content": "From the primary", "category": "General",
+    }, cookies={"session_token": token})
+    assert response.status_code == 201
+    assert replica["primary"] > 0
+    assert replica["replica"] == 1
+
+
+def test_caller_reads_own_write_from_primary(client: TestClient, replica):
+    token = login(client, "rita@example.com")
+    other_token = login(client, "otto@example.com")
+    response = client.post("/posts/", json={
+        "title": "Hello", "content": "Fresh", "category": "General",
+    }, cookies={"session_token": token})
+    post_id = response.json()["id"]
+
+    replica.update(primary=0, replica=0)
+    assert client.get(f"/posts/{post_id}", cookies={"session_token": token}).status_code == 200
+    assert replica["replica"] == 0
+
+    # Other users are not pinned by someone else's write.
+    assert client.get(f"/posts/{post_id}", cookies={"session_token": other_token}).status_code == 200
+    assert replica["replica"] > 0
+
+    read_your_writes.clear()
+    replica.update(primary=0, replica=0)
+    assert client.get(f"/posts/{post_id}", cookies={"session_token": token}).status_code == 200
+    assert replica["primary"] == 0
+
+
+def test_reads_on_the_primary_do_not_extend_the_pin(client: TestClient, replica):
+    token = login(client, "rita@example.com")
+    user_id = decode_session_jwt(token)["uid"]
+    client.post("/posts/", json={
+        "title": "Hello", "content": "Fresh", "category": "General",
+    }, cookies={"session_token": token})
+    pinned_until = read_your_writes._pinned_until[user_id]
+
+    replica.update(primary=0, replica=0)
+    assert client.get("/users/", cookies={"session_token": token}).status_code == 200
+    assert replica == {"primary": 1, "replica": 0}
+    assert read_your_writes._pinned_until[user_id] == pinned_until
+
+
+def test_async_fallback_routes_reads_to_replica(client: TestClient, replica, monkeypatch):
+    token = login(client, "rita@example.com")
+    read_your_writes.clear()
+    monkeypatch.setattr(database, "AsyncSessionLocal", None)
+    replica.update(primary=0, replica=0)
+
+    response = client.get("/announcements/", cookies={"session_token": token})
+    assert response.status_code == 200
+    assert replica["primary"] == 0
+    assert replica["replica"] > 0
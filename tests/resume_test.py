@@ -0,0 +1,26 @@
+from fastapi.testclient import TestClient
+
+from models.resume import Resume, ResumeStatus
+from models.resume_review import ResumeReview
+from models.user import User, UserRole
+
+
+def test_submit_review_does_not_reread_written_rows(client: TestClient, db_session, statements):
+    author = User(email="author@example.com", first_name="Res", last_name="Ume", password="x")
+    admin = User(email="admin@example.com", first_name="Ad", last_name="Min", password="x", role=UserRole.admin)
+    db_session.add_all([author, admin])
+    db_session.flush()
+    resume = Resume(user_id=author.id, file_name="cv.pdf", file_path="resumes/cv.pdf")
+    db_session.add(resume)
+    db_session.commit()
+    resume_id, admin_id = resume.id, admin.id
+    db_session.expunge_all()
+
+    with statements:
+        response = client.post(f"/resumes/{resume_id}/review", json={"comments": "Looks good"}, params={"reviewer_id": admin_id})
+    assert response.status_code == 201
+    # Reviewer, resume, the review INSERT ... RETURNING id and the status UPDATE.
+    assert statements.verbs() == ["SELECT", "SELECT", "INSERT resume_reviews", "UPDATE resumes"]
+
+    assert db_session.get(ResumeReview, response.json()["review_id"]).comments == "Looks good"
+    assert db_session.get(Resume, resume_id).status == ResumeStatus.reviewed
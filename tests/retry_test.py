@@ -0,0 +1,184 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+import core.database as database
+from core.settings import settings
+from models.post import Post
+from models.upvote import Upvote
+from repository.post_repository import PostRepository
+from repository.upvote_repository import UpvoteRepository
+from utils.retry import Deadline, RetryPolicy, is_retryable, mark_not_retryable, retry_call
+
+
+class _PgError(Exception):
+    def __init__(self, pgcode):
+        self.pgcode = pgcode
+
+
+def _disconnect() -> OperationalError:
+    return OperationalError("SELECT 1", {}, Exception("server closed the connection unexpectedly"), connection_invalidated=True)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_only_connection_errors_are_retryable():
+    assert is_retryable(_disconnect())
+    assert is_retryable(OperationalError("SELECT 1", {}, _PgError("08006")))
+    assert is_retryable(OperationalError("SELECT 1", {}, _PgError("57P01")))
+    # statement timeout, deadlock, constraint violation, pool exhaustion
+    assert not is_retryable(OperationalError("SELECT 1", {}, _PgError("57014")))
+    assert not is_retryable(OperationalError("SELECT 1", {}, _PgError("40P01")))
+    assert not is_retryable(IntegrityError("INSERT", {}, _PgError("23505")))
+    assert not is_retryable(PoolTimeoutError("QueuePool limit reached"))
+    assert not is_retryable(ValueError("Post not found."))
+
+
+def test_wrapped_connection_errors_are_retryable_unless_raised_by_commit():
+    try:
+        try:
+            raise _disconnect()
+        except OperationalError as e:
+            raise RuntimeError(f"Failed to update post: {e}")
+    except RuntimeError as wrapped:
+        assert is_retryable(wrapped)
+        mark_not_retryable(wrapped.__context__)
+        assert not is_retryable(wrapped)
+
+
+def test_retry_call_replays_until_success_with_bounded_jitter():
+    clock = FakeClock()
+    policy = RetryPolicy(attempts=3, base_delay=0.05, max_delay=0.5, deadline_seconds=2)
+    calls = []
+
+    def work():
+        calls.append(clock.now)
+        if len(calls) < 3:
+            raise _disconnect()
+        return "done"
+
+    assert retry_call(work, policy, Deadline(2, clock), sleep=clock.sleep) == "done"
+    assert len(calls) == 3
+    assert 0 <= calls[1] - calls[0] <= 0.05
+    assert 0 <= calls[2] - calls[1] <= 0.1
+
+
+def test_retry_call_gives_up_after_attempts_or_at_the_deadline():
+    clock = FakeClock()
+    calls = []
+
+    def work():
+        calls.append(clock.now)
+        raise _disconnect()
+
+    with pytest.raises(OperationalError):
+        retry_call(work, RetryPolicy(attempts=3), Deadline(10, clock), sleep=clock.sleep)
+    assert len(calls) == 3
+
+    calls.clear()
+    clock.now = 0.0
+    with pytest.raises(OperationalError):
+        retry_call(work, RetryPolicy(attempts=10, base_delay=1, max_delay=1), Deadline(0, clock), sleep=clock.sleep)
+    assert calls == [0.0]
+
+
+def test_retry_call_does_not_retry_other_errors():
+    calls = []
+
+    def work():
+        calls.append(1)
+        raise ValueError("Post not found.")
+
+    with pytest.raises(ValueError):
+        retry_call(work, RetryPolicy(attempts=3), sleep=lambda _: None)
+    assert calls == [1]
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "DB_RETRY_BACKOFF_SECONDS", 0.001)
+    monkeypatch.setattr(settings, "DB_RETRY_MAX_BACKOFF_SECONDS", 0.001)
+
+
+@pytest.fixture
+def author_token(client: TestClient) -> str:
+    user = {"email": "retry@example.com", "first_name": "Re", "last_name": "Try", "password": "pass123"}
+    client.post("/users/", json=user)
+    return client.post("/login", json={"email": user["email"], "password": user["password"]}).cookies.get("session_token")
+
+
+@pytest.fixture
+def post_id(client: TestClient, author_token: str) -> int:
+    return client.post("/posts/", json={"title": "Hello", "content": "World"}, cookies={"session_token": author_token}).json()["id"]
+
+
+@pytest.fixture
+def flaky_upvotes(monkeypatch) -> list:
+    """Loses the connection on the first create_upvote; returns the list of attempts."""
+    create_upvote = UpvoteRepository.create_upvote
+    attempts = []
+
+    def flaky_create_upvote(self, db, upvote):
+        attempts.append(upvote.post_id)
+        if len(attempts) == 1:
+            db.add(upvote)
+            db.flush()
+            error = _disconnect()
+            raise RuntimeError(f"An error occurred: {error}") from error
+        return create_upvote(self, db, upvote)
+
+    monkeypatch.setattr(UpvoteRepository, "create_upvote", flaky_create_upvote)
+    return attempts
+
+
+def test_route_is_replayed_after_losing_the_connection(client: TestClient, db_session, author_token, post_id, flaky_upvotes, fast_retries):
+    response = client.post(f"/post/{post_id}/upvote", cookies={"session_token": author_token})
+
+    assert response.status_code == 201
+    assert flaky_upvotes == [post_id, post_id]
+    assert db_session.query(Upvote).count() == 1
+
+
+def test_route_runs_once_without_fastapi_exit_stacks(client: TestClient, author_token, post_id, flaky_upvotes, fast_retries, monkeypatch):
+    monkeypatch.setattr(database, "_EXIT_STACK_KEYS", {"fastapi_renamed_astack"})
+    with pytest.raises(RuntimeError):
+        client.post(f"/post/{post_id}/upvote", cookies={"session_token": author_token})
+    assert flaky_upvotes == [post_id]
+
+
+def test_routes_with_external_side_effects_are_not_replayed(client: TestClient, db_session, author_token, fast_retries, monkeypatch):
+    attempts = []
+
+    def flaky_create_post(self, post, db):
+        attempts.append(post.title)
+        error = _disconnect()
+        raise RuntimeError(f"An error occurred: {error}") from error
+
+    monkeypatch.setattr(PostRepository, "create_post", flaky_create_post)
+    with pytest.raises(RuntimeError):
+        client.post("/posts/", json={"title": "Once", "content": "Body"}, cookies={"session_token": author_token})
+    assert attempts == ["Once"]
+    assert db_session.query(Post).count() == 0
+
+
+def test_failed_commit_is_not_replayed(engine, fast_retries, monkeypatch):
+    calls = []
+
+    def commit(self):
+        calls.append(1)
+        raise _disconnect()
+
+    monkeypatch.setattr(database.Session, "commit", commit)
+    with pytest.raises(OperationalError):
+        database.run_in_transaction(lambda db: db.add(Post(author_id=1, title="t", content="c")))
+    assert calls == [1]
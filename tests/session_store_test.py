@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from repository.session_store import (
+    MemorySessionStore,
+    RedisSessionStore,
+    SessionStore,
+    SqlSessionStore,
+    create_session_store,
+    set_session_store,
+)
+from utils.func_utils import PASSWORD_RESET_TOKEN, create_jwt
+
+
+def _create_user(client: TestClient, email: str) -> int:
+    user_data = {
+        "email": email,
+        "first_name": "Store",
+        "last_name": "Tester",
+        "password": "securepassword",
+    }
+    response = client.post("/users/", json=user_data)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _redis_store() -> RedisSessionStore:
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisSessionStore(fakeredis.FakeRedis(decode_responses=True))
+
+
+@pytest.fixture(params=["database", "memory", "redis"])
+def store(request):
+    if request.param == "database":
+        return SqlSessionStore()
+    if request.param == "memory":
+        return MemorySessionStore()
+    return _redis_store()
+
+
+@pytest.fixture(params=["memory", "redis"])
+def external_store(request):
+    store = MemorySessionStore() if request.param == "memory" else _redis_store()
+    set_session_store(store)
+    yield store
+    set_session_store(None)
+
+
+def test_session_store_contract(client: TestClient, db_session, store):
+    user_id = _create_user(client, "store_contract@example.com")
+    now = datetime.now(timezone.utc)
+    for token in ("token-a", "token-b", "token-c"):
+        store.create(db_session, user_id, token, now + timedelta(hours=1))
+    db_session.commit()
+
+    session = store.get(db_session, "token-a")
+    assert session.user_id == user_id
+    assert store.get(db_session, "missing") is None
+
+    assert store.extend(db_session, ["token-a", "missing"], now + timedelta(hours=2)) == 1
+    assert store.extend(db_session, ["token-a"], now + timedelta(minutes=30)) == 0
+    db_session.commit()
+    assert store.get(db_session, "token-a").expires_at > now + timedelta(minutes=90)
+
+    assert store.delete(db_session, "token-b").user_id == user_id
+    assert store.delete(db_session, "token-b") is None
+    db_session.commit()
+
+    assert sorted(store.delete_all_for_user(db_session, user_id, keep_token="token-c")) == ["token-a"]
+    db_session.commit()
+    assert store.get(db_session, "token-a") is None
+    assert store.get(db_session, "token-c").user_id == user_id
+
+
+def test_expired_sessions_are_not_returned(client: TestClient, db_session, store):
+    user_id = _create_user(client, "store_expired@example.com")
+    now = datetime.now(timezone.utc)
+    store.create(db_session, user_id, "expired-token", now - timedelta(seconds=1))
+    db_session.commit()
+
+    assert store.get(db_session, "expired-token") is None
+    assert store.extend(db_session, ["expired-token"], now + timedelta(hours=1)) == 0
+    if not isinstance(store, RedisSessionStore):
+        assert store.delete_expired(db_session, batch_size=10) == 1
+
+
+def test_external_store_serves_sessions_without_sessions_table(client: TestClient, external_store):
+    user_id = _create_user(client, "store_login@example.com")
+    response = client.post("/login/", json={"email": "store_login@example.com", "password": "securepassword"})
+    token = response.cookies.get("session_token")
+    client.cookies.set("session_token", token)
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record_statement)
+    try:
+        assert client.get("/posts/recent").status_code == 200
+    finally:
+        event.remove(Engine, "before_cursor_execute", record_statement)
+    assert not [s for s in statements if "sessions" in s]
+    assert external_store.get(None, token).user_id == user_id
+
+    assert client.post(f"/logout?session_token={token}").status_code == 204
+    client.cookies.set("session_token", token)
+    assert client.get("/posts/recent").status_code == 401
+
+
+def test_external_store_revokes_sessions_on_password_reset(client: TestClient, external_store):
+    _create_user(client, "store_reset@example.com")
+    response = client.post("/login/", json={"email": "store_reset@example.com", "password": "securepassword"})
+    token = response.cookies.get("session_token")
+
+    client.cookies.clear()
+    response = client.post(
+        "/auth/password-reset",
+        json={"token": create_jwt("store_reset@example.com", PASSWORD_RESET_TOKEN), "new_password": "resetpassword"},
+    )
+    assert response.status_code == 200
+    assert external_store.get(None, token) is None
+
+
+def test_unknown_session_store_is_rejected():
+    with pytest.raises(ValueError):
+        create_session_store("memcached")
+    with pytest.raises(ValueError):
+        create_session_store("redis")
+
+
+def test_store_must_implement_the_interface():
+    class ReadOnlyStore(SessionStore):
+        def get(self, db, token):
+            return None
+
+    with pytest.raises(TypeError):
+        ReadOnlyStore()
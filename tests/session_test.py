@@ -1,4 +1,19 @@
+import pytest
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from core.login_throttle import LoginThrottle, LoginThrottledError, TokenBucketLimiter, client_address, login_throttle
+from core.session_cache import session_cache
+from core.settings import settings
+from core.token_denylist import token_denylist
+from jobs.session_reaper import SessionReaper
+from jobs.session_renewer import SessionRenewer, session_renewer
+from models.revoked_token import RevokedToken
+from models.session import Session as SessionModel
+from repository.session_repository import SessionRepository, SESSION_DURATION_HOURS
+from utils.func_utils import PASSWORD_RESET_TOKEN, create_jwt, decode_jwt, decode_session_jwt
 
 def _create_user_and_login(client: TestClient, email="session_test@example.com"):
     user_data = {
@@ -19,3 +34,384 @@ def _create_user_and_login(client: TestClient, email="session_test@example.com")
 def test_session_created_on_login(client: TestClient):
     token, _ = _create_user_and_login(client)
     assert token is not None
+
+
+def test_session_cache_hit_after_first_lookup(client: TestClient):
+    token, _ = _create_user_and_login(client, email="cache_hit@example.com")
+    client.cookies.set("session_token", token)
+
+    response = client.get("/posts/recent")
+    assert response.status_code == 200
+    misses = session_cache.stats()["misses"]
+    hits = session_cache.stats()["hits"]
+
+    response = client.get("/posts/recent")
+    assert response.status_code == 200
+    assert session_cache.stats()["hits"] == hits + 1
+    assert session_cache.stats()["misses"] == misses
+
+
+def test_session_cache_disabled_with_zero_ttl(client: TestClient, monkeypatch):
+    monkeypatch.setattr(session_cache, "ttl_seconds", 0)
+    token, _ = _create_user_and_login(client, email="cache_off@example.com")
+    client.cookies.set("session_token", token)
+
+    assert client.get("/posts/recent").status_code == 200
+    assert client.get("/posts/recent").status_code == 200
+    assert session_cache.stats()["size"] == 0
+    assert session_cache.stats()["hits"] == 0
+
+
+def test_logout_invalidates_cached_session(client: TestClient):
+    token, _ = _create_user_and_login(client, email="cache_logout@example.com")
+    client.cookies.set("session_token", token)
+    assert client.get("/posts/recent").status_code == 200
+
+    response = client.post(f"/logout?session_token={token}")
+    assert response.status_code == 204
+
+    client.cookies.set("session_token", token)
+    response = client.get("/posts/recent")
+    assert response.status_code == 401
+
+
+def test_user_update_invalidates_cached_session(client: TestClient):
+    token, _ = _create_user_and_login(client, email="cache_update@example.com")
+    client.cookies.set("session_token", token)
+    assert client.get("/posts/recent").status_code == 200
+    assert session_cache.stats()["size"] == 1
+
+    user_id = client.get("/users/").json()[0]["id"]
+    response = client.put(f"/users/{user_id}", json={"first_name": "Renamed"})
+    assert response.status_code == 200
+    assert session_cache.stats()["size"] == 0
+
+
+def test_session_and_user_loaded_in_one_query(client: TestClient, db_session, engine):
+    token, email = _create_user_and_login(client, email="joined_loader@example.com")
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        session = SessionRepository().get_with_user_by_token(db_session, token)
+        assert session.user.email == email
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+    assert len(statements) == 1
+
+
+def test_expired_session_is_rejected(client: TestClient, db_session):
+    token, _ = _create_user_and_login(client, email="expired_session@example.com")
+    session = db_session.query(SessionModel).filter(SessionModel.session_token == token).first()
+    session.expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    db_session.commit()
+
+    assert SessionRepository().get_with_user_by_token(db_session, token) is None
+    client.cookies.set("session_token", token)
+    response = client.get("/posts/recent")
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid session"
+
+
+def test_session_resolved_once_per_request(client: TestClient):
+    token, _ = _create_user_and_login(client, email="resolve_once@example.com")
+    client.cookies.set("session_token", token)
+    session_cache.clear()
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # Listen on every engine: the middleware uses the app's engine, not the test fixture's.
+    event.listen(Engine, "before_cursor_execute", record_statement)
+    try:
+        response = client.get("/posts/recent")
+    finally:
+        event.remove(Engine, "before_cursor_execute", record_statement)
+    assert response.status_code == 200
+    assert len([s for s in statements if "FROM sessions" in s]) == 1
+
+
+def test_jwt_mode_verifies_sessions_without_sessions_table(client: TestClient, monkeypatch):
+    monkeypatch.setattr(settings, "SESSION_VERIFICATION", "jwt")
+    token, _ = _create_user_and_login(client, email="jwt_mode@example.com")
+    client.cookies.set("session_token", token)
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record_statement)
+    try:
+        assert client.get("/posts/recent").status_code == 200
+        assert client.get("/posts/recent").status_code == 200
+    finally:
+        event.remove(Engine, "before_cursor_execute", record_statement)
+    assert not [s for s in statements if "FROM sessions" in s]
+
+
+def test_jwt_mode_rejects_revoked_and_tampered_tokens(client: TestClient, monkeypatch):
+    monkeypatch.setattr(settings, "SESSION_VERIFICATION", "jwt")
+    token, _ = _create_user_and_login(client, email="jwt_revoked@example.com")
+    client.cookies.set("session_token", token)
+    assert client.get("/posts/recent").status_code == 200
+
+    client.cookies.set("session_token", token[:-2] + "xx")
+    assert client.get("/posts/recent").status_code == 401
+
+    assert client.post(f"/logout?session_token={token}").status_code == 204
+    client.cookies.set("session_token", token)
+    assert client.get("/posts/recent").status_code == 401
+
+
+def test_denylist_sync_picks_up_revocations_from_other_workers(client: TestClient):
+    token, _ = _create_user_and_login(client, email="jwt_sync@example.com")
+    assert client.post(f"/logout?session_token={token}").status_code == 204
+    jti = decode_session_jwt(token)["jti"]
+
+    token_denylist.clear()
+    assert not token_denylist.is_revoked(jti)
+    assert token_denylist.sync_from_db() == 1
+    assert token_denylist.is_revoked(jti)
+
+
+def test_login_with_long_email(client: TestClient):
+    token, _ = _create_user_and_login(client, email=("long" * 20) + "@example.com")
+    assert len(token) > 255
+
+
+def test_reaper_deletes_expired_sessions_in_batches(client: TestClient, db_session):
+    for i in range(5):
+        _create_user_and_login(client, email=f"reaper_{i}@example.com")
+    expired_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    sessions = db_session.query(SessionModel).order_by(SessionModel.id).all()
+    for session in sessions[:3]:
+        session.expires_at = expired_at
+    db_session.commit()
+
+    reaper = SessionReaper(batch_size=2)
+    assert reaper.run_once() == 3
+    assert reaper.stats()["last_run_deleted"] == 3
+    assert reaper.run_once() == 0
+    assert reaper.stats()["total_deleted"] == 3
+    db_session.expire_all()
+    assert db_session.query(SessionModel).count() == 2
+
+
+def test_deactivated_user_cannot_log_in(client: TestClient, statements):
+    credentials = {"email": "inactive_login@example.com", "password": "securepassword"}
+    client.post("/users/", json={**credentials, "first_name": "In", "last_name": "Active", "is_active": False})
+
+    with statements:
+        assert client.post("/login/", json=credentials).status_code == 401
+    assert statements.verbs() == ["SELECT"]
+
+
+def test_login_throttled_per_email_before_password_check(client: TestClient, monkeypatch):
+    monkeypatch.setattr(login_throttle.by_email, "capacity", 2)
+    _create_user_and_login(client, email="throttle@example.com")
+
+    checked = []
+    monkeypatch.setattr("services.auth_service.check_password", lambda *args: checked.append(args))
+    response = client.post("/login/", json={"email": " Throttle@Example.com", "password": "wrong"})
+    assert response.status_code == 401
+    response = client.post("/login/", json={"email": "THROTTLE@example.com", "password": "wrong"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert len(checked) == 1
+    assert login_throttle.stats()["rejected_by_email"] == 1
+
+
+def test_login_throttled_per_client_ip():
+    throttle = LoginThrottle(email_burst=10, email_per_minute=10, ip_burst=2, ip_per_minute=1)
+    throttle.check("a@example.com", "10.0.0.1")
+    throttle.check("b@example.com", "10.0.0.1")
+    with pytest.raises(LoginThrottledError) as exc_info:
+        throttle.check("c@example.com", "10.0.0.1")
+    assert exc_info.value.retry_after > 0
+    # A rejected attempt does not spend the email's tokens.
+    assert len(throttle.by_email) == 2
+    throttle.check("c@example.com", "10.0.0.2")
+    assert throttle.stats()["rejected_by_ip"] == 1
+
+
+def test_login_throttle_drops_refilled_buckets():
+    throttle = LoginThrottle(email_burst=2, email_per_minute=60, ip_burst=2, ip_per_minute=60)
+    throttle.check("a@example.com", "10.0.0.1")
+    assert throttle.stats()["tracked_emails"] == 1
+    for limiter in (throttle.by_email, throttle.by_ip):
+        limiter._buckets = OrderedDict(
+            (key, (tokens, last_seen - 5)) for key, (tokens, last_seen) in limiter._buckets.items()
+        )
+    assert throttle.sweep() == 2
+    assert throttle.stats()["tracked_emails"] == 0
+    assert throttle.stats()["tracked_ips"] == 0
+
+
+def test_login_throttle_evicts_the_least_recently_seen_bucket():
+    limiter = TokenBucketLimiter(capacity=2, refill_per_minute=1, max_keys=2)
+    limiter.consume("a", now=0)
+    limiter.consume("b", now=1)
+    limiter.consume("a", now=2)
+    limiter.consume("c", now=3)
+    assert list(limiter._buckets) == ["a", "c"]
+    assert limiter.evicted == 1
+    assert limiter.peek("b", now=3) == 2
+
+
+def test_login_throttle_keys_on_the_trusted_proxy_hop():
+    # The client wrote the first entry; the load balancer appended the address it saw.
+    assert client_address("6.6.6.6, 203.0.113.7", "6.6.6.6", trusted_hops=1) == "203.0.113.7"
+    assert client_address("6.6.6.6, 203.0.113.7, 10.0.0.2", "6.6.6.6", trusted_hops=2) == "203.0.113.7"
+    assert client_address(None, "10.0.0.9", trusted_hops=1) == "10.0.0.9"
+    assert client_address("6.6.6.6", "6.6.6.6", trusted_hops=0) == "6.6.6.6"
+
+
+def test_active_session_slides_forward_once_per_interval(client: TestClient, db_session):
+    token, _ = _create_user_and_login(client, email="sliding@example.com")
+    client.cookies.set("session_token", token)
+    assert client.get("/posts/recent").status_code == 200
+    assert session_renewer.pending() == 0
+
+    session = db_session.query(SessionModel).filter(SessionModel.session_token == token).one()
+    session.expires_at = datetime.now(timezone.utc) + timedelta(hours=2)
+    db_session.commit()
+    for _ in range(3):
+        session_cache.clear()
+        assert client.get("/posts/recent").status_code == 200
+    assert session_renewer.pending() == 1
+
+    assert session_renewer.flush() == 1
+    db_session.expire_all()
+    remaining = session.expires_at - datetime.now(timezone.utc)
+    assert remaining > timedelta(hours=SESSION_DURATION_HOURS) - timedelta(minutes=1)
+    session_cache.clear()
+    assert client.get("/posts/recent").status_code == 200
+    assert session_renewer.pending() == 0
+
+
+def test_renewer_flushes_in_batches_and_skips_expired(client: TestClient, db_session):
+    tokens = [_create_user_and_login(client, email=f"renew_{i}@example.com")[0] for i in range(5)]
+    sessions = db_session.query(SessionModel).order_by(SessionModel.id).all()
+    for session in sessions:
+        session.expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    sessions[0].expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    db_session.commit()
+
+    renewer = SessionRenewer(interval_seconds=3600, batch_size=2)
+    for session in sessions:
+        renewer.touch(session.session_token, session.expires_at)
+    assert renewer.pending() == len(tokens)
+
+    updates = []
+
+    def record_update(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE sessions"):
+            updates.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record_update)
+    try:
+        assert renewer.flush() == 4
+    finally:
+        event.remove(Engine, "before_cursor_execute", record_update)
+    assert len(updates) == 3
+    db_session.expire_all()
+    assert sessions[0].expires_at < datetime.now(timezone.utc)
+    assert renewer.stats()["total_extended"] == 4
+
+
+def _login(client: TestClient, email: str, password: str = "securepassword") -> str:
+    response = client.post("/login/", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return response.cookies.get("session_token")
+
+
+def _is_authenticated(client: TestClient, token: str) -> bool:
+    client.cookies.set("session_token", token)
+    return client.get("/posts/recent").status_code == 200
+
+
+def test_password_update_revokes_other_sessions(client: TestClient, db_session):
+    current_token, email = _create_user_and_login(client, email="revoke_update@example.com")
+    other_token = _login(client, email)
+    assert _is_authenticated(client, other_token)
+
+    client.cookies.set("session_token", current_token)
+    user_id = client.get("/users/").json()[0]["id"]
+    deletes = []
+
+    def record_delete(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("DELETE FROM sessions"):
+            deletes.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record_delete)
+    try:
+        response = client.put(
+            f"/users/{user_id}/update-password",
+            json={"old_password": "securepassword", "new_password": "newpassword"},
+        )
+    finally:
+        event.remove(Engine, "before_cursor_execute", record_delete)
+    assert response.status_code == 200
+    assert len(deletes) == 1
+
+    assert not _is_authenticated(client, other_token)
+    assert _is_authenticated(client, current_token)
+    assert db_session.query(RevokedToken).count() == 1
+
+
+def test_password_reset_revokes_all_sessions(client: TestClient, db_session):
+    first_token, email = _create_user_and_login(client, email="revoke_reset@example.com")
+    second_token = _login(client, email)
+    assert _is_authenticated(client, first_token)
+
+    client.cookies.clear()
+    response = client.post(
+        "/auth/password-reset",
+        json={"token": create_jwt(email, PASSWORD_RESET_TOKEN), "new_password": "resetpassword"},
+    )
+    assert response.status_code == 200
+
+    assert not _is_authenticated(client, first_token)
+    assert not _is_authenticated(client, second_token)
+    assert db_session.query(SessionModel).count() == 0
+    assert _login(client, email, password="resetpassword")
+
+
+def test_password_reset_rejects_session_tokens(client: TestClient):
+    token, email = _create_user_and_login(client, email="reset_session@example.com")
+    logged_out = _login(client, email)
+    assert client.post(f"/logout?session_token={logged_out}").status_code == 204
+
+    for session_token in (token, logged_out):
+        response = client.post(
+            "/auth/password-reset", json={"token": session_token, "new_password": "stolenpassword"}
+        )
+        assert response.status_code == 400
+    client.cookies.clear()
+    assert client.post("/login/", json={"email": email, "password": "stolenpassword"}).status_code != 200
+
+
+def test_password_reset_link_works_once(client: TestClient, db_session):
+    _, email = _create_user_and_login(client, email="reset_once@example.com")
+    reset_token = create_jwt(email, PASSWORD_RESET_TOKEN)
+
+    response = client.post("/auth/password-reset", json={"token": reset_token, "new_password": "resetpassword"})
+    assert response.status_code == 200
+    jti = decode_jwt(reset_token)["jti"]
+    assert db_session.get(RevokedToken, jti) is not None
+    assert token_denylist.is_revoked(jti)
+
+    # Replayed, and replayed on a worker whose denylist never heard of it.
+    token_denylist.clear()
+    response = client.post("/auth/password-reset", json={"token": reset_token, "new_password": "replayedpassword"})
+    assert response.status_code == 400
+    assert _login(client, email, password="resetpassword")
+
+
+def test_reset_tokens_are_not_sessions(client: TestClient):
+    _, email = _create_user_and_login(client, email="reset_as_session@example.com")
+    assert not _is_authenticated(client, create_jwt(email, PASSWORD_RESET_TOKEN))
@@ -16,6 +16,54 @@ def clear_env_vars():
         "BASE_URL",
         "DOCS_AUTH_USERNAME",
         "DOCS_AUTH_PASSWORD",
+        "DB_POOL_SIZE",
+        "DB_MAX_OVERFLOW",
+        "DB_POOL_TIMEOUT_SECONDS",
+        "DB_POOL_RECYCLE_SECONDS",
+        "DATABASE_REPLICA_URLS",
+        "DATABASE_REPLICA_POLICY",
+        "READ_YOUR_WRITES_SECONDS",
+        "DB_RETRY_ATTEMPTS",
+        "DB_RETRY_BACKOFF_SECONDS",
+        "DB_RETRY_MAX_BACKOFF_SECONDS",
+        "DB_RETRY_DEADLINE_SECONDS",
+        "DB_STATEMENT_TIMEOUT_READ_MS",
+        "DB_STATEMENT_TIMEOUT_WRITE_MS",
+        "DB_STATEMENT_TIMEOUT_EXPORT_MS",
+        "DB_QUERY_BUDGET_READ",
+        "DB_QUERY_BUDGET_WRITE",
+        "DB_QUERY_BUDGET_EXPORT",
+        "DB_QUERY_BUDGET_ACTION",
+        "SESSION_CACHE_TTL_SECONDS",
+        "SESSION_CACHE_MAX_ENTRIES",
+        "SESSION_VERIFICATION",
+        "REVOCATION_SYNC_SECONDS",
+        "SESSION_REAPER_INTERVAL_SECONDS",
+        "SESSION_REAPER_BATCH_SIZE",
+        "JOURNEY_FLUSH_SECONDS",
+        "JOURNEY_BATCH_SIZE",
+        "JOURNEY_MAX_PENDING",
+        "ACCOUNT_DELETION_INTERVAL_SECONDS",
+        "ACCOUNT_DELETION_BATCH_SIZE",
+        "ACCOUNT_DELETION_STALE_SECONDS",
+        "ACCOUNT_DELETION_MAX_ATTEMPTS",
+        "ASYNC_DATABASE_ENABLED",
+        "ASYNC_DATABASE_URL",
+        "SESSION_STORE",
+        "SESSION_STORE_URL",
+        "SESSION_RENEWAL_INTERVAL_SECONDS",
+        "SESSION_RENEWAL_FLUSH_SECONDS",
+        "SESSION_RENEWAL_BATCH_SIZE",
+        "PASSWORD_HASH_WORKERS",
+        "PASSWORD_HASH_QUEUE_SIZE",
+        "PASSWORD_HASHER",
+        "PASSWORD_HASH_COST",
+        "PASSWORD_HASH_TARGET_MS",
+        "LOGIN_EMAIL_BURST",
+        "LOGIN_EMAIL_PER_MINUTE",
+        "LOGIN_IP_BURST",
+        "LOGIN_IP_PER_MINUTE",
+        "LOGIN_TRUSTED_PROXY_HOPS",
     ]
     old_env = {var: os.environ.get(var) for var in env_vars}
     for var in env_vars:
@@ -36,10 +84,64 @@ def assert_default_settings(s: Settings):
     assert s.BASE_URL is None
     assert s.DOCS_AUTH_USERNAME is None
     assert s.DOCS_AUTH_PASSWORD is None
+    assert s.DB_POOL_SIZE == 10
+    assert s.DB_MAX_OVERFLOW == 20
+    assert s.DB_POOL_TIMEOUT_SECONDS == 30
+    assert s.DB_POOL_RECYCLE_SECONDS == 900
+    assert s.DATABASE_REPLICA_URLS == []
+    assert s.DATABASE_REPLICA_POLICY == "round_robin"
+    assert s.READ_YOUR_WRITES_SECONDS == 5
+    assert s.DB_RETRY_ATTEMPTS == 3
+    assert s.DB_RETRY_BACKOFF_SECONDS == 0.05
+    assert s.DB_RETRY_MAX_BACKOFF_SECONDS == 0.5
+    assert s.DB_RETRY_DEADLINE_SECONDS == 2
+    assert s.DB_STATEMENT_TIMEOUT_READ_MS == 5000
+    assert s.DB_STATEMENT_TIMEOUT_WRITE_MS == 10000
+    assert s.DB_STATEMENT_TIMEOUT_EXPORT_MS == 120000
+    assert s.DB_QUERY_BUDGET_READ == 100
+    assert s.DB_QUERY_BUDGET_WRITE == 50
+    assert s.DB_QUERY_BUDGET_EXPORT == 0
+    assert s.DB_QUERY_BUDGET_ACTION == "log"
+    assert s.SESSION_CACHE_TTL_SECONDS == 60
+    assert s.SESSION_CACHE_MAX_ENTRIES == 10000
+    assert s.SESSION_VERIFICATION == "database"
+    assert s.REVOCATION_SYNC_SECONDS == 30
+    assert s.SESSION_REAPER_INTERVAL_SECONDS == 3600
+    assert s.SESSION_REAPER_BATCH_SIZE == 1000
+    assert s.JOURNEY_FLUSH_SECONDS == 5
+    assert s.JOURNEY_BATCH_SIZE == 500
+    assert s.JOURNEY_MAX_PENDING == 10000
+    assert s.ACCOUNT_DELETION_INTERVAL_SECONDS == 60
+    assert s.ACCOUNT_DELETION_BATCH_SIZE == 500
+    assert s.ACCOUNT_DELETION_STALE_SECONDS == 600
+    assert s.ACCOUNT_DELETION_MAX_ATTEMPTS == 5
+    assert s.ASYNC_DATABASE_ENABLED is True
+    assert s.ASYNC_DATABASE_URL is None
+    assert s.SESSION_STORE == "database"
+    assert s.SESSION_STORE_URL is None
+    assert s.SESSION_RENEWAL_INTERVAL_SECONDS == 3600
+    assert s.SESSION_RENEWAL_FLUSH_SECONDS == 30
+    assert s.SESSION_RENEWAL_BATCH_SIZE == 500
+    assert s.PASSWORD_HASH_WORKERS == 2
+    assert s.PASSWORD_HASH_QUEUE_SIZE == 16
+    assert s.PASSWORD_HASHER == "bcrypt"
+    assert s.PASSWORD_HASH_COST == 0
+    assert s.PASSWORD_HASH_TARGET_MS == 250
+    assert s.LOGIN_EMAIL_BURST == 10
+    assert s.LOGIN_EMAIL_PER_MINUTE == 5
+    assert s.LOGIN_IP_BURST == 50
+    assert s.LOGIN_IP_PER_MINUTE == 30
+    assert s.LOGIN_TRUSTED_PROXY_HOPS == 1
     assert s.cors_origins == ["http://localhost:5173", "http://127.0.0.1:5173", "http://localhost:3001", "http://127.0.0.1:3001"]
 
 
 def test_settings_defaults_without_env_vars():
     """Test default settings when no environment variables are set."""
     s = Settings()
-    assert_default_settings(s)
\ No newline at end of file
+    assert_default_settings(s)
+
+
+def test_replica_urls_are_split_on_commas():
+    os.environ["DATABASE_REPLICA_URLS"] = "postgresql://r1/db, postgresql://r2/db,"
+    s = Settings()
+    assert s.DATABASE_REPLICA_URLS == ["postgresql://r1/db", "postgresql://r2/db"]
@@ -235,4 +235,13 @@ def test_comment_includes_upvote_count(client: TestClient, test_users: list[tupl
 
     assert response.status_code == 200
     assert len(comments) == 1
-    assert comments[0]["upvote_count"] == 2
\ No newline at end of file
+    assert comments[0]["upvote_count"] == 2
+
+def test_upvote_post_does_not_reread_the_new_row(client: TestClient, test_users, test_post, statements):
+    _, token2 = test_users[1]
+    with statements:
+        response = client.post(f"/post/{test_post.id}/upvote", cookies={"session_token": token2})
+    assert response.status_code == 201
+    # Existing-upvote check, the INSERT ... RETURNING id, and the new total.
+    assert statements.verbs() == ["SELECT", "INSERT upvotes", "SELECT"]
+    assert "RETURNING upvotes.id" in statements.statements[1]
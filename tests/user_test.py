@@ -1,4 +1,10 @@
+import threading
+import pytest
 from fastapi.testclient import TestClient
+from core.password_pool import password_pool
+from core.password_policy import PasswordPolicy, password_policy
+from models.user import User
+from utils.password_hashing import Argon2idHasher, BcryptHasher, PasswordHasher
 from schemas.user_schema import (
     UserLoginResponse,
     UserGetResponse,
@@ -157,7 +163,7 @@ def test_delete_existing_user(client: TestClient) -> None:
     assert response.status_code == 201
     user = response.json()
     response = client.delete(f"/users/{user['id']}")
-    assert response.status_code == 200
+    assert response.status_code == 202
     response = client.delete(f"/users/{user['id']}")
     assert response.status_code == 404
     assert response.json()["detail"] == "User does not exist."
@@ -179,6 +185,26 @@ def test_update_user(client: TestClient) -> None:
     assert updated_user.first_name == "UpdatedJohn"
 
 
+def test_user_writes_do_not_reread_the_row(client: TestClient, statements) -> None:
+    user_data = {
+        "email": "counted@example.com",
+        "first_name": "Count",
+        "last_name": "Ed",
+        "password": "securepassword123",
+    }
+    with statements:
+        response = client.post("/users/", json=user_data)
+    assert response.status_code == 201
+    # The duplicate-email check, then the INSERT that returns the id.
+    assert statements.verbs() == ["SELECT", "INSERT users"]
+
+    with statements:
+        response = client.put(f"/users/{response.json()['id']}", json={"first_name": "Recount"})
+    assert response.status_code == 200
+    assert response.json()["first_name"] == "Recount"
+    assert statements.verbs() == ["SELECT", "UPDATE users"]
+
+
 def test_update_user_email(client: TestClient) -> None:
     user_data = {
         "email": "update_email_test@example.com",
@@ -370,3 +396,82 @@ def test_clear_user_degrees(client: TestClient) -> None:
     
     updated_user = UserGetResponse.model_validate(response.json())
     assert updated_user.degrees is None or len(updated_user.degrees) == 0
+
+
+def test_login_fails_fast_when_password_pool_is_saturated(client: TestClient, monkeypatch) -> None:
+    user_data = {
+        "email": "saturated_pool@example.com",
+        "first_name": "Saturated",
+        "last_name": "Pool",
+        "password": "testpassword",
+    }
+    response = client.post("/users/", json=user_data)
+    assert response.status_code == 201
+
+    monkeypatch.setattr(password_pool, "_slots", threading.BoundedSemaphore(1))
+    assert password_pool._slots.acquire(blocking=False)
+    response = client.post("/login/", json={"email": user_data["email"], "password": "testpassword"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def _stored_password(db_session, email: str) -> str:
+    db_session.expire_all()
+    return db_session.query(User).filter(User.email == email).one().password
+
+
+def test_login_rehashes_password_under_new_cost(client: TestClient, db_session, monkeypatch) -> None:
+    email = "rehash_cost@example.com"
+    monkeypatch.setattr(password_policy, "current", BcryptHasher(4))
+    user_data = {"email": email, "first_name": "Re", "last_name": "Hash", "password": "testpassword"}
+    assert client.post("/users/", json=user_data).status_code == 201
+    assert _stored_password(db_session, email).startswith("$2b$04$")
+
+    monkeypatch.setattr(password_policy, "current", BcryptHasher(5))
+    response = client.post("/login/", json={"email": email, "password": "testpassword"})
+    assert response.status_code == 200
+    rehashed = _stored_password(db_session, email)
+    assert rehashed.startswith("$2b$05$")
+
+    response = client.post("/login/", json={"email": email, "password": "testpassword"})
+    assert response.status_code == 200
+    assert _stored_password(db_session, email) == rehashed
+
+
+def test_login_migrates_between_hashers(client: TestClient, db_session, monkeypatch) -> None:
+    pytest.importorskip("argon2")
+    email = "rehash_scheme@example.com"
+    monkeypatch.setattr(password_policy, "current", BcryptHasher(4))
+    user_data = {"email": email, "first_name": "Re", "last_name": "Hash", "password": "testpassword"}
+    assert client.post("/users/", json=user_data).status_code == 201
+
+    monkeypatch.setattr(password_policy, "current", Argon2idHasher(2))
+    assert client.post("/login/", json={"email": email, "password": "testpassword"}).status_code == 200
+    assert _stored_password(db_session, email).startswith("$argon2id$")
+    assert client.post("/login/", json={"email": email, "password": "wrong"}).status_code == 401
+
+    monkeypatch.setattr(password_policy, "current", BcryptHasher(4))
+    assert client.post("/login/", json={"email": email, "password": "testpassword"}).status_code == 200
+    assert _stored_password(db_session, email).startswith("$2b$04$")
+
+
+def test_password_policy_calibration() -> None:
+    pinned = PasswordPolicy("bcrypt", cost=13, target_ms=1)
+    assert pinned.calibrate().cost == 13
+
+    calibrated = PasswordPolicy("bcrypt", cost=0, target_ms=0)
+    assert calibrated.calibrate().cost == BcryptHasher.min_cost
+    assert calibrated.needs_rehash(BcryptHasher(4).hash("password"))
+    assert not calibrated.needs_rehash(calibrated.current.hash("password"))
+
+    with pytest.raises(ValueError):
+        PasswordPolicy("md5", cost=0, target_ms=250)
+
+
+def test_hasher_must_implement_the_interface() -> None:
+    class HalfHasher(PasswordHasher):
+        def hash(self, password: str) -> str:
+            return password
+
+    with pytest.raises(TypeError):
+        HalfHasher(1)
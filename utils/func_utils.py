@@ -1,35 +1,53 @@
 import hashlib
-import bcrypt
+import uuid
 import jwt
 import datetime
-from typing import Any
+from typing import Any, List
 from core.logging_config import LOGGER
 from utils.image_utils import crop_image_to_circle, decode_base64_image
 from core.settings import settings
+from core.password_pool import password_pool
+from core.password_policy import password_policy
 from clients.s3_client import S3Client
+from utils.password_hashing import hash_password, verify_password
 
 
 s3_client = S3Client()
 
 def get_password_hash(password: str) -> str:
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
-    return hashed.decode("utf-8")
+    return password_pool.run(hash_password, password_policy.current, password)
 
 
 def check_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+    return password_pool.run(verify_password, password_policy.hasher_for(hashed), password, hashed)
+
+
+def password_needs_rehash(hashed: str) -> bool:
+    return password_policy.needs_rehash(hashed)
 
 
 def hash_email(email: str) -> str:
     return hashlib.sha256(email.encode("utf-8")).hexdigest()
 
 
-def create_jwt(user_email: str) -> str:
+# The "purpose" claim keeps a token issued for one use from being accepted for another.
+SESSION_TOKEN = "session"
+PASSWORD_RESET_TOKEN = "password_reset"
+
+
+def create_jwt(
+    user_email: str,
+    purpose: str,
+    expires_in: datetime.timedelta = datetime.timedelta(hours=1),
+    **claims: Any,
+) -> str:
     time_zone = datetime.timezone(datetime.timedelta(hours=5))
     payload = {
+        **claims,
         "user_id": user_email,
-        "exp": datetime.datetime.now(tz=time_zone) + datetime.timedelta(hours=1),
+        "purpose": purpose,
+        "jti": uuid.uuid4().hex,
+        "exp": datetime.datetime.now(tz=time_zone) + expires_in,
     }
     token = jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
     return token
@@ -45,6 +63,17 @@ def decode_jwt(token: str) -> Any | None:
 
 def verify_jwt(token: str) -> Any | None:
     return decode_jwt(token)
+
+def decode_session_jwt(token: str) -> dict | None:
+    """Checks a session token's signature, expiry and purpose locally; None when a check fails."""
+    try:
+        claims = decode_jwt(token)
+    except ValueError:
+        return None
+    # Session tokens issued before the purpose claim have none.
+    if claims.get("purpose", SESSION_TOKEN) != SESSION_TOKEN:
+        return None
+    return claims
     
 def validate_resume_file(file_data: bytes, file_name: str, max_size: int = 10 * 1024 * 1024) -> str:
     if not file_data:
@@ -118,4 +147,11 @@ def upload_profile_picture_to_s3(base64_image: str, object_key: str) -> str:
         return f"https://{settings.BUCKET_NAME}.s3.us-east-1.amazonaws.com/{object_key}"
     except Exception as e:
         LOGGER.error(f"Error uploading file to key {object_key}: {e}")
-        raise ValueError("Error uploading file to S3 bucket")
\ No newline at end of file
+        raise ValueError("Error uploading file to S3 bucket")
+
+def delete_files_from_s3(urls: List[str]) -> int:
+    """Deletes the bucket objects behind the given URLs; returns how many there were."""
+    keys = sorted({key for key in map(s3_client.key_for_url, urls) if key})
+    if keys:
+        s3_client.delete_files(keys)
+    return len(keys)
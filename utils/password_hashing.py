@@ -0,0 +1,112 @@
+from abc import ABC, abstractmethod
+
+import bcrypt
+
+# Kept free of app imports: these run inside the password hashing worker processes.
+# Hashers only hold plain parameters so they pickle cheaply into the workers.
+
+
+class PasswordHasher(ABC):
+    """Interface every password hashing scheme implements. `cost` is the tunable work factor."""
+
+    name = ""
+    default_cost = 1
+    min_cost = 1
+    max_cost = 1
+
+    def __init__(self, cost: int):
+        self.cost = cost
+
+    def with_cost(self, cost: int) -> "PasswordHasher":
+        return type(self)(cost)
+
+    @abstractmethod
+    def identifies(self, hashed: str) -> bool:
+        ...
+
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        ...
+
+    @abstractmethod
+    def verify(self, password: str, hashed: str) -> bool:
+        ...
+
+    @abstractmethod
+    def needs_rehash(self, hashed: str) -> bool:
+        ...
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(cost={self.cost})"
+
+
+class BcryptHasher(PasswordHasher):
+    """bcrypt; cost is the log2 rounds stored in the hash prefix."""
+
+    name = "bcrypt"
+    default_cost = 12
+    min_cost = 10
+    max_cost = 16
+
+    def identifies(self, hashed: str) -> bool:
+        return hashed.startswith(("$2a$", "$2b$", "$2y$"))
+
+    def hash(self, password: str) -> str:
+        salt = bcrypt.gensalt(rounds=self.cost)
+        return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return int(hashed.split("$")[2]) != self.cost
+
+
+class Argon2idHasher(PasswordHasher):
+    """argon2id via argon2-cffi (optional dependency); cost is the time cost (passes)."""
+
+    name = "argon2id"
+    default_cost = 3
+    min_cost = 2
+    max_cost = 10
+    memory_cost_kib = 65536
+    parallelism = 4
+
+    def identifies(self, hashed: str) -> bool:
+        return hashed.startswith("$argon2id$")
+
+    def hash(self, password: str) -> str:
+        return self._argon2().hash(password)
+
+    def verify(self, password: str, hashed: str) -> bool:
+        from argon2.exceptions import VerificationError, InvalidHashError
+
+        try:
+            return self._argon2().verify(hashed, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return self._argon2().check_needs_rehash(hashed)
+
+    def _argon2(self):
+        try:
+            import argon2
+        except ImportError as e:
+            raise RuntimeError("argon2id password hashing requires the argon2-cffi package") from e
+        return argon2.PasswordHasher(
+            time_cost=self.cost,
+            memory_cost=self.memory_cost_kib,
+            parallelism=self.parallelism,
+        )
+
+
+HASHERS = {hasher.name: hasher for hasher in (BcryptHasher, Argon2idHasher)}
+
+
+def hash_password(hasher: PasswordHasher, password: str) -> str:
+    return hasher.hash(password)
+
+
+def verify_password(hasher: PasswordHasher, password: str, hashed: str) -> bool:
+    return hasher.verify(password, hashed)
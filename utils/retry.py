@@ -1,11 +1,130 @@
-from sqlalchemy.exc import OperationalError
-from tenacity import retry, stop_after_attempt, wait_exponential
-import tenacity
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
 
+from sqlalchemy.exc import DBAPIError, DisconnectionError
 
-def retry_on_db_error():
-    return retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=tenacity.retry_if_exception_type(OperationalError),
-    )
+from core.logging_config import LOGGER
+
+T = TypeVar("T")
+
+# SQLSTATEs meaning the connection was lost or refused: class 08 (connection exception) and
+# the server shutting down or starting up. The transaction on it never committed.
+CONNECTION_SQLSTATE_CLASS = "08"
+CONNECTION_SQLSTATES = {"57P01", "57P02", "57P03"}
+
+
+class Deadline:
+    """A point in time after which no further attempt or backoff should start."""
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+class RetryPolicy:
+    """
+    Up to attempts tries of a unit of work, waiting a random 0..min(max_delay, base_delay * 2^n)
+    seconds before retry n + 1 ("full jitter", so clients that failed together don't retry
+    together). Gives up early rather than sleep past the deadline.
+    """
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.05, max_delay: float = 0.5, deadline_seconds: float = 2.0):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline_seconds = deadline_seconds
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def next_delay(self, exc: BaseException, attempt: int, deadline: Deadline) -> Optional[float]:
+        """Seconds to wait before retrying after attempt (0-based) raised exc, or None to give up."""
+        if attempt + 1 >= self.attempts or not is_retryable(exc):
+            return None
+        delay = self.delay(attempt)
+        if delay >= deadline.remaining():
+            return None
+        return delay
+
+
+def mark_not_retryable(exc: BaseException) -> None:
+    """
+    Flags exc so is_retryable rejects it, e.g. for a failed COMMIT: it may have reached the
+    server, and replaying the work could apply it twice.
+    """
+    exc.not_retryable = True
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    True when exc, or an error it was raised while handling, is a lost or refused database
+    connection, so that nothing the failed attempt did was committed. Repositories and routes
+    re-raise database errors as ValueError/RuntimeError/HTTPException, so the chain is followed.
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if getattr(exc, "not_retryable", False):
+            return False
+        if isinstance(exc, DisconnectionError):
+            return True
+        if isinstance(exc, DBAPIError):
+            if exc.connection_invalidated:
+                return True
+            sqlstate = getattr(exc.orig, "pgcode", None) or getattr(exc.orig, "sqlstate", None)
+            return bool(sqlstate) and (
+                sqlstate.startswith(CONNECTION_SQLSTATE_CLASS) or sqlstate in CONNECTION_SQLSTATES
+            )
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def retry_call(
+    work: Callable[[], T],
+    policy: RetryPolicy,
+    deadline: Optional[Deadline] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> T:
+    """Runs work, running it again from the start while it fails on a retryable connection error."""
+    deadline = deadline or Deadline(policy.deadline_seconds)
+    attempt = 0
+    while True:
+        try:
+            return work()
+        except Exception as exc:
+            delay = policy.next_delay(exc, attempt, deadline)
+            if delay is None:
+                raise
+            LOGGER.warning(f"Retrying after database connection error (attempt {attempt + 1}): {exc}")
+        sleep(delay)
+        attempt += 1
+
+
+async def retry_call_async(
+    work: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    deadline: Optional[Deadline] = None,
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+) -> T:
+    """Async retry_call: awaits work() and sleeps without blocking the event loop."""
+    deadline = deadline or Deadline(policy.deadline_seconds)
+    attempt = 0
+    while True:
+        try:
+            return await work()
+        except Exception as exc:
+            delay = policy.next_delay(exc, attempt, deadline)
+            if delay is None:
+                raise
+            LOGGER.warning(f"Retrying after database connection error (attempt {attempt + 1}): {exc}")
+        await sleep(delay)
+        attempt += 1